@@ -0,0 +1,160 @@
+import random
+
+import numpy as np
+
+import cards
+import score_table
+
+# Vectorized scoring, for when there are thousands of hands to score at once (like every deal of every simulated
+# game) and going through Hand objects one at a time is too slow. Cards are given as their integer ids (Card.id, from
+# 0 to 51), and everything is done with whole-array NumPy operations using the tables in score_table - there's no
+# per-hand Python loop. NumPy is only needed for this module; the rest of the package doesn't use it.
+
+CATEGORIES = ('fifteens', 'pairs', 'flush', 'runs', 'nobs')
+
+_JACK_RANK_INDEX = cards.RANKS.index('J')
+_RANK_KEY_TERMS = np.array(score_table._RANK_KEY_TERMS, dtype=np.intp)
+_tables = None
+
+
+def _get_tables():
+    global _tables
+    if _tables is None:
+        _tables = tuple(np.frombuffer(table, dtype=np.uint8) for table in score_table.get_tables())
+    return _tables
+
+
+def to_ids(hands):
+    """Convert a sequence of hands (Hand instances or sequences of Cards) to an (N, cards per hand) array of card ids."""
+    return np.array([[card.id for card in hand] for hand in hands], dtype=np.intp)
+
+
+def rank_keys(ranks):
+    """Vectorized score_table.rank_key: takes an (N, 5) array of rank indexes and returns N table positions."""
+    sorted_ranks = np.sort(ranks, axis=1)
+    return _RANK_KEY_TERMS[np.arange(score_table.NUM_CARDS), sorted_ranks].sum(axis=1)
+
+
+def rank_histograms(ranks):
+    """Takes an (N, cards per hand) array of rank indexes and returns an (N, 13) array of the count of each rank."""
+    ranks = np.asarray(ranks, dtype=np.intp)
+    histograms = np.zeros((ranks.shape[0], len(cards.RANKS)), dtype=np.intp)
+    np.add.at(histograms, (np.arange(ranks.shape[0])[:, None], ranks), 1)
+    return histograms
+
+
+def score_runs(hands):
+    """
+    Vectorized run scoring, the same as Hand._score_all_straights, for an (N, cards per hand) array of card ids (any
+    number of cards - usually four plus the cut). Works on the rank histograms: for each length from longest down,
+    the product of the counts in every window of consecutive ranks is the number of different runs there, and a hand
+    scores the runs of the longest length that has any.
+    """
+    hands = np.asarray(hands, dtype=np.intp)
+    histograms = rank_histograms(hands // len(cards.SUITS))
+    num_ranks = histograms.shape[1]
+    runs = np.zeros(hands.shape[0], dtype=np.intp)
+    for length in range(min(hands.shape[1], num_ranks), 2, -1):
+        windows = np.ones((hands.shape[0], num_ranks - length + 1), dtype=np.intp)
+        for offset in range(length):
+            windows *= histograms[:, offset:offset + num_ranks - length + 1]
+        runs = np.where(runs == 0, length * windows.sum(axis=1), runs)
+    return runs
+
+
+def count_fifteens(hands):
+    """
+    Vectorized Hand.count_fifteens for an (N, cards per hand) array of card ids (any number of cards): the same
+    subset-sum counting, with an (N, 16) array of the number of combinations adding up to each total, updated for
+    every hand at once one card column at a time. Returns N counts (the fifteens score is twice this).
+    """
+    hands = np.asarray(hands, dtype=np.intp)
+    values = np.minimum(hands // len(cards.SUITS) + 1, 10)
+    ways = np.zeros((hands.shape[0], 16), dtype=np.intp)
+    ways[:, 0] = 1
+    for column in values.T:
+        updated = ways.copy()
+        for value in range(1, 11):
+            rows = column == value
+            updated[rows, value:] += ways[rows, :16 - value]
+        ways = updated
+    return ways[:, 15]
+
+
+def score_batch(hands, cuts=None, crib=False, breakdown=False):
+    """
+    Score many hands at once. 'hands' is an (N, 4) array of card ids with 'cuts' an array of N cut card ids, or an
+    (N, 5) array where the last column is the cut. Returns an array of N scores that match Hand.score, or, if breakdown
+    is True, a dict with an array for each category in CATEGORIES plus 'total'.
+    """
+    hands = np.asarray(hands, dtype=np.intp)
+    if cuts is None:
+        if hands.ndim != 2 or hands.shape[1] != 5:
+            raise ValueError(f'Expected an (N, 5) array of hand and cut card ids, got shape {hands.shape}')
+        hands, cuts = hands[:, :4], hands[:, 4]
+    else:
+        cuts = np.asarray(cuts, dtype=np.intp)
+        if hands.ndim != 2 or hands.shape[1] != 4 or cuts.shape != (hands.shape[0],):
+            raise ValueError(f'Expected an (N, 4) array of hand card ids and N cut card ids, got shapes {hands.shape} and {cuts.shape}')
+
+    num_suits = len(cards.SUITS)
+    hand_ranks, hand_suits = hands // num_suits, hands % num_suits
+    cut_ranks, cut_suits = cuts // num_suits, cuts % num_suits
+
+    fifteens_table, pairs_table, runs_table = _get_tables()
+    keys = rank_keys(np.column_stack((hand_ranks, cut_ranks)))
+    fifteens = fifteens_table[keys].astype(np.intp)
+    pairs = pairs_table[keys].astype(np.intp)
+    runs = runs_table[keys].astype(np.intp)
+
+    # flush: four hand cards of one suit score 4 (hand only) or 5 with a cut of the same suit
+    hand_is_flush = (hand_suits == hand_suits[:, :1]).all(axis=1)
+    cut_matches_flush = cut_suits == hand_suits[:, 0]
+    flush = np.where(hand_is_flush, np.where(cut_matches_flush, 5, 0 if crib else 4), 0)
+
+    # nobs: a jack in the hand with the same suit as the cut
+    nobs = ((hand_ranks == _JACK_RANK_INDEX) & (hand_suits == cut_suits[:, None])).any(axis=1).astype(np.intp)
+
+    total = fifteens + pairs + flush + runs + nobs
+    if not breakdown:
+        return total
+
+    return {'fifteens': fifteens, 'pairs': pairs, 'flush': flush, 'runs': runs, 'nobs': nobs, 'total': total}
+
+
+def shuffled_decks(num_decks, seed=None, num_cards=52):
+    """A (num_decks, num_cards) array where each row is a random permutation of 0 to num_cards - 1 (card ids, for 52)."""
+    generator = np.random.default_rng(seed)
+    return generator.permuted(np.tile(np.arange(num_cards, dtype=np.intp), (num_decks, 1)), axis=1)
+
+
+class PermutationShuffler:
+    """
+    A stand-in for the random module, for Game's rng (and so its players') in simulation workers: shuffles come from
+    permutation matrices that are generated batch_size at a time with NumPy (one for each length of list shuffled -
+    the deal shuffles 52 cards and the cut the 40 that are left), and everything else - sample, choice, and so on -
+    goes to a random.Random. Seeded, it's reproducible, though it doesn't give the same games as random.Random(seed).
+    """
+    def __init__(self, seed=None, batch_size=1024):
+        seeds = np.random.SeedSequence(seed)
+        numpy_seed, random_seed = seeds.spawn(2)
+        self._generator = np.random.default_rng(numpy_seed)
+        self._random = random.Random(int(random_seed.generate_state(1)[0]))
+        self.batch_size = batch_size
+        self._batches = {} # list length -> [permutations as a list of lists, position of the next one]
+
+    def _next_permutation(self, length):
+        batch = self._batches.get(length)
+        if batch is None or batch[1] == len(batch[0]):
+            permutations = self._generator.permuted(np.tile(np.arange(length), (self.batch_size, 1)), axis=1).tolist()
+            batch = self._batches[length] = [permutations, 0]
+        permutation = batch[0][batch[1]]
+        batch[1] += 1
+        return permutation
+
+    def shuffle(self, x):
+        items = list(x)
+        x[:] = [items[i] for i in self._next_permutation(len(items))]
+
+    def __getattr__(self, name):
+        return getattr(self._random, name)
@@ -0,0 +1,204 @@
+import argparse
+import collections
+import functools
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+import cards
+import game
+
+# Performance benchmarks for the scoring code, the deck, and whole games, so I can tell whether a change made things
+# faster or slower. Each benchmark runs a fixed, seeded workload - the same hands, pegging sequences, and games every
+# time - as a number of samples, each running every operation in the workload once. Each operation (one hand scored, one
+# game played) is timed on its own, so the reported p50/p90/p99 latencies are percentiles over individual operations,
+# alongside operations per second. Results can be saved as a JSON baseline and later runs compared against it, flagging
+# anything that got slower by more than a tolerance.
+#
+# python benchmark.py --save       # run everything and save the baseline - again whenever a benchmark is added or a
+#                                  # change is meant to change performance, so the baseline covers it at its new speed
+# python benchmark.py              # run everything and compare against the baseline (exits with 1 on a regression)
+
+BASELINE_PATH = Path(__file__).parent / 'benchmark_baseline.json'
+DEFAULT_TOLERANCE = 0.15 # timings on a busy machine wander by ~10%, so only flag slowdowns bigger than this
+
+BenchmarkResult = collections.namedtuple('BenchmarkResult', ['name', 'ops', 'ops_per_second', 'p50_us', 'p90_us', 'p99_us'])
+Regression = collections.namedtuple('Regression', ['name', 'baseline_ops_per_second', 'ops_per_second', 'change'])
+
+
+def _hand_corpus(num_hands, seed):
+    # (four card Hand, cut card) pairs
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(num_hands):
+        hand_cards = rng.sample(cards.CARDS, 5)
+        corpus.append((cards.Hand(sorted(hand_cards[:4])), hand_cards[4]))
+    return corpus
+
+
+def _pegging_corpus(num_sequences, seed):
+    # Hands holding the cards played since the count was reset, from one card up to the most that fit under 31
+    rng = random.Random(seed)
+    corpus = []
+    while len(corpus) < num_sequences:
+        deck = list(cards.CARDS)
+        rng.shuffle(deck)
+        sequence, total = [], 0
+        for card in deck:
+            if total + card.value > 31:
+                break
+            sequence.append(card)
+            total += card.value
+            corpus.append(cards.Hand(list(sequence)))
+    return corpus[:num_sequences]
+
+
+# Each benchmark function takes a seed and returns a list of operations - functions taking no arguments - that make
+# up one sample.
+
+def _bench_hand_score(seed):
+    return [functools.partial(hand.score, cut_card, print_output=False) for hand, cut_card in _hand_corpus(200, seed)]
+
+
+def _bench_score_pegging(seed):
+    return [functools.partial(hand.score_pegging, print_output=False) for hand in _pegging_corpus(500, seed)]
+
+
+def _bench_combinations(seed):
+    # a new Hand each time, since a Hand keeps its combinations and would otherwise only be enumerated once
+    return [functools.partial(lambda hand_cards, cut_card: cards.Hand(hand_cards).combinations(cut_card), list(hand), cut_card)
+            for hand, cut_card in _hand_corpus(500, seed)]
+
+
+def _bench_deck(seed):
+    rng = random.Random(seed)
+    return [lambda: rng.shuffle(cards.Deck())] * 1000
+
+
+def _bench_deal(seed):
+    # what Game does each deal with its one Deck: reset, shuffle, two six card hands, and the cut
+    rng = random.Random(seed)
+    deck = cards.Deck()
+    def deal():
+        deck.reset()
+        deck.shuffle(rng)
+        deck.draw_hand(6, sort=True)
+        deck.draw_hand(6, sort=True)
+        deck.shuffle(rng)
+        deck.draw_hand(1)
+    return [deal] * 1000
+
+
+def _bench_game(seed):
+    rng = random.Random(seed)
+    def play_game():
+        game.Game(game.RandomPlayer('Player 1'), game.RandomPlayer('Player 2'), verbose=False, rng=rng).play()
+    return [play_game] * 5
+
+
+BENCHMARKS = {
+    'hand_score': _bench_hand_score,
+    'score_pegging': _bench_score_pegging,
+    'combinations': _bench_combinations,
+    'deck_shuffle': _bench_deck,
+    'deal': _bench_deal,
+    'game': _bench_game,
+}
+
+
+def _percentile(sorted_values, fraction):
+    # nearest-rank percentile
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def run_benchmark(name, samples=20, seed=0):
+    """
+    Runs one of BENCHMARKS (a warm-up sample and then 'samples' timed ones), timing each operation separately, and
+    returns a BenchmarkResult.
+    """
+    if name not in BENCHMARKS:
+        raise ValueError(f"Unknown benchmark '{name}', expected one of {list(BENCHMARKS)}")
+    operations = BENCHMARKS[name](seed)
+
+    for operation in operations: # warm up - fills caches and lazily loaded tables
+        operation()
+    clock = time.perf_counter_ns
+    latencies = [] # nanoseconds per operation
+    for _ in range(samples):
+        for operation in operations:
+            start = clock()
+            operation()
+            latencies.append(clock() - start)
+    latencies.sort()
+
+    ops_per_second = len(latencies) / (sum(latencies) / 1e9)
+    return BenchmarkResult(name, len(latencies), ops_per_second, _percentile(latencies, 0.5) / 1000,
+                           _percentile(latencies, 0.9) / 1000, _percentile(latencies, 0.99) / 1000)
+
+
+def run(names=None, samples=20, seed=0):
+    """Runs the named benchmarks (default: all of them) and returns a dict mapping each name to its BenchmarkResult."""
+    return {name: run_benchmark(name, samples, seed) for name in (names or BENCHMARKS)}
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, 'w') as f:
+        json.dump({name: result._asdict() for name, result in results.items()}, f, indent=2)
+
+
+def load_baseline(path=BASELINE_PATH):
+    with open(path) as f:
+        return {name: BenchmarkResult(**fields) for name, fields in json.load(f).items()}
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Returns a Regression for each benchmark in both results and baseline whose ops per second dropped by more than
+    'tolerance' (a fraction of the baseline).
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        baseline_ops_per_second = baseline[name].ops_per_second
+        change = result.ops_per_second / baseline_ops_per_second - 1
+        if change < -tolerance:
+            regressions.append(Regression(name, baseline_ops_per_second, result.ops_per_second, change))
+    return regressions
+
+
+def format_results(results, baseline=None):
+    lines = [f'{"benchmark":<15}{"ops/sec":>14}{"p50 us":>11}{"p90 us":>11}{"p99 us":>11}' + ('   vs baseline' if baseline else '')]
+    for name, result in results.items():
+        line = f'{name:<15}{result.ops_per_second:>14,.0f}{result.p50_us:>11.2f}{result.p90_us:>11.2f}{result.p99_us:>11.2f}'
+        if baseline and name in baseline:
+            line += f'{result.ops_per_second / baseline[name].ops_per_second - 1:>+14.1%}'
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark scoring, the deck, and whole games.')
+    parser.add_argument('--samples', type=int, default=20, help='timed samples per benchmark')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='save the results as the new baseline rather than comparing')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='slowdown (as a fraction) that counts as a regression')
+    parser.add_argument('benchmarks', nargs='*', help=f'benchmarks to run (default: all of {list(BENCHMARKS)})')
+    args = parser.parse_args()
+
+    results = run(args.benchmarks, samples=args.samples)
+    if args.save:
+        print(format_results(results))
+        save_baseline(results, args.baseline)
+        print(f'Saved baseline to {args.baseline}')
+    else:
+        baseline = load_baseline(args.baseline) if args.baseline.exists() else None
+        print(format_results(results, baseline))
+        regressions = find_regressions(results, baseline, args.tolerance) if baseline else []
+        for regression in regressions:
+            print(f'REGRESSION: {regression.name} is {-regression.change:.1%} slower ({regression.baseline_ops_per_second:,.0f} -> {regression.ops_per_second:,.0f} ops/sec)')
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,68 @@
+import cards
+
+# Canonical forms of hands under suit permutation. Swapping the suits around - every heart becomes a club and every
+# club a heart, say - changes no score: fifteens, pairs, and runs only see ranks, and flushes and nobs only care
+# whether cards share a suit, not which suit it is. So anything keyed on a hand's cards (a cache of scores, a table of
+# discard values) only needs one entry per canonical form, which is up to 4! = 24 times fewer entries.
+#
+# The key is a single int. Each suit gets a bit field holding a 13 bit mask of the ranks it has in the hand, one for
+# the cut card (if the cut is that suit), and one for any dead cards (cards known to be out of play, which change what
+# can still be cut). Sorting the four fields puts the suits in a canonical order, since suits with the same field are
+# interchangeable, and the sorted fields and the crib flag are packed together. Card order doesn't matter because the
+# masks don't have an order, and building the key is a few bit operations per card and a sort of four ints, so it's
+# cheap enough for a cache lookup in the scoring hot path.
+
+_NUM_RANKS = len(cards.RANKS)
+_NUM_SUITS = len(cards.SUITS)
+_HAND_SHIFT = 0
+_CUT_SHIFT = _NUM_RANKS
+_DEAD_SHIFT = 2 * _NUM_RANKS
+_FIELD_BITS = 3 * _NUM_RANKS
+_FIELD_MASK = (1 << _FIELD_BITS) - 1
+
+# bit for each card (by id) in its suit's field, for the hand, the cut, and the dead cards
+_HAND_BITS = tuple(1 << (_HAND_SHIFT + card.rank_index) for card in cards.CARDS)
+_CUT_BITS = tuple(1 << (_CUT_SHIFT + card.rank_index) for card in cards.CARDS)
+_DEAD_BITS = tuple(1 << (_DEAD_SHIFT + card.rank_index) for card in cards.CARDS)
+
+
+def canonical_key(hand_cards, cut_card=None, crib=False, dead_cards=()):
+    """
+    Return an int that's the same for any two hands (with their cut, crib flag, and dead cards) that only differ by
+    which suit is which, or by the order of the cards, and different for any two that don't.
+    """
+    fields = [0] * _NUM_SUITS
+    for card in hand_cards:
+        fields[card.suit_index] |= _HAND_BITS[card.id]
+    if cut_card is not None:
+        fields[cut_card.suit_index] |= _CUT_BITS[cut_card.id]
+    for card in dead_cards:
+        fields[card.suit_index] |= _DEAD_BITS[card.id]
+    f0, f1, f2, f3 = sorted(fields)
+    return ((((f3 << _FIELD_BITS | f2) << _FIELD_BITS | f1) << _FIELD_BITS | f0) << 1) | bool(crib)
+
+
+def from_key(key):
+    """
+    Return a representative (hand cards, cut card or None, crib, dead cards) for a key from canonical_key - the hand
+    and dead cards sorted, and the suits given out in the order of cards.SUITS.
+    """
+    crib = bool(key & 1)
+    key >>= 1
+    hand_cards, cut_card, dead_cards = [], None, []
+    for suit_index in range(_NUM_SUITS):
+        field = (key >> ((_NUM_SUITS - 1 - suit_index) * _FIELD_BITS)) & _FIELD_MASK
+        for rank_index in range(_NUM_RANKS):
+            card = cards.CARDS[rank_index * _NUM_SUITS + suit_index]
+            if field >> (_HAND_SHIFT + rank_index) & 1:
+                hand_cards.append(card)
+            if field >> (_CUT_SHIFT + rank_index) & 1:
+                cut_card = card
+            if field >> (_DEAD_SHIFT + rank_index) & 1:
+                dead_cards.append(card)
+    return sorted(hand_cards), cut_card, crib, sorted(dead_cards)
+
+
+def canonicalize(hand_cards, cut_card=None, crib=False, dead_cards=()):
+    """Return the representative from from_key for the hand's canonical form."""
+    return from_key(canonical_key(hand_cards, cut_card, crib, dead_cards))
@@ -1,35 +1,86 @@
+import collections
 import itertools
-import copy
+import math
 
 # I based some of the cards impl off of ideas and code in the O'Reilly "Fluent Python" book.
 RANKS = list('A23456789TJQK')
 SUITS = list('SHDC')
 
+ScoreBreakdown = collections.namedtuple('ScoreBreakdown', ['fifteens', 'pairs', 'flush', 'runs', 'nobs', 'total'])
+
+# an optional score_cache.ScoreCache that Hand.score_breakdown (and so Hand.score) and Hand.score_pegging go through,
+# set with set_score_cache - when it's None, scoring is done from scratch every time
+_score_cache = None
+
+
+def set_score_cache(cache):
+    """Puts cache (a score_cache.ScoreCache, or None for no cache) in front of Hand scoring. Returns the previous one."""
+    global _score_cache
+    previous, _score_cache = _score_cache, cache
+    return previous
+
 
 class Deck:
+    # One Deck can be reused for every deal: reset() puts the same list of cards back in order in place, and drawing
+    # just moves a position forward through the list rather than deleting cards from its front. Indexing, len, and
+    # random.shuffle see only the cards that haven't been drawn yet.
 
     def __init__(self):
-        self._cards = [Card(rank, suit) for suit in SUITS
-                                        for rank in RANKS]
+        self._cards = list(_DECK_ORDER)
+        self._position = 0 # cards before this have been drawn
+
+    def reset(self):
+        """Puts all 52 cards back, in the same order as a new Deck."""
+        self._cards[:] = _DECK_ORDER
+        self._position = 0
+
+    def shuffle(self, rng):
+        """
+        Shuffles the cards that haven't been drawn, with rng's shuffle (rng can be the random module, a random.Random,
+        or anything else with a shuffle method, like batch.PermutationShuffler). Gives the same order as
+        rng.shuffle(deck), but shuffles a plain list, which is quicker than going through __getitem__/__setitem__.
+        """
+        if self._position == 0:
+            rng.shuffle(self._cards)
+        else:
+            remaining = self._cards[self._position:]
+            rng.shuffle(remaining)
+            self._cards[self._position:] = remaining
 
     def __len__(self):
-        return len(self._cards)
+        return len(self._cards) - self._position
+
+    def _offset(self, key):
+        # turns an index or slice into the remaining cards into one into self._cards
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            return slice(start + self._position, stop + self._position, step)
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('Deck index out of range')
+        return key + self._position
 
     def __getitem__(self, position):
-        return self._cards[position]
+        if self._position == 0: # nothing drawn, so no offset - the common case, when random.shuffle is called on a Deck
+            return self._cards[position]
+        return self._cards[self._offset(position)]
 
     # to support random.shuffle
     def __setitem__(self, key, value):
         # key is the index position in the deck, value is the Card instance
-        self._cards[key] = value
+        if self._position == 0:
+            self._cards[key] = value
+        else:
+            self._cards[self._offset(key)] = value
 
     def draw_hand(self, size, sort=False):
-        hand_cards = self._cards[:size]
+        hand_cards = self._cards[self._position:self._position + size]
 
         if sort:
-            hand_cards = sorted(hand_cards)
+            hand_cards.sort()
 
-        del self._cards[:size]
+        self._position += len(hand_cards)
         # TODO should handle case when deck is empty - won't (ever?) happen in cribbage so I won't worry about it now (or maybe calling code should handle?)
         return Hand(hand_cards)
 
@@ -40,6 +91,7 @@ class Hand:
             cards = []
 
         self._cards = cards
+        self._combinations = None # (cards with the cut, {size: combinations}) from the last combinations() call
 
     def __len__(self):
         return len(self._cards)
@@ -47,6 +99,13 @@ class Hand:
     def __getitem__(self, position):
         return self._cards[position]
 
+    # without these, iterating and 'in' would go through __getitem__ one index at a time
+    def __iter__(self):
+        return iter(self._cards)
+
+    def __contains__(self, card):
+        return card in self._cards
+
     # to support random.shuffle
     def __setitem__(self, key, value):
         # key is the index position in the hand, value is the Card instance
@@ -61,7 +120,8 @@ class Hand:
         return repr(self._cards) # just print the representation of the internal array
 
     def copy(self):
-        return copy.deepcopy(self)
+        # cards are immutable and shared, so copying the list is enough
+        return Hand(list(self._cards))
 
     @staticmethod
     def from_specs(specs):
@@ -70,40 +130,139 @@ class Hand:
     def remove(self, card):
         self._cards.remove(card)
 
-    def score(self, cut_card=None, crib=False):
-        points = 0
-        
-        points += Hand._print_scoring('Fifteens', Hand._score_with_combinations(Hand._score_15, self.combinations(cut_card)))
-        points += Hand._print_scoring('Pairs', Hand._score_with_combinations(Hand._score_pair, self.combinations(cut_card)))
-        points += Hand._print_scoring('Flush', Hand._score_with_combinations(lambda c: Hand._score_flush(c, cut_card, crib), self.combinations()))
-        points += Hand._print_scoring('Runs', Hand._score_all_straights(self._cards, cut_card))
-        points += Hand._print_scoring('Nobs', Hand._score_nobs(self._cards, cut_card))
+    def score(self, cut_card=None, crib=False, print_output=True):
+        breakdown = self.score_breakdown(cut_card, crib)
+        if print_output:
+            for desc, points in zip(('Fifteens', 'Pairs', 'Flush', 'Runs', 'Nobs'), breakdown):
+                Hand._print_scoring(desc, points)
+
+        return breakdown.total
+
+    def score_breakdown(self, cut_card=None, crib=False):
+        """
+        Scores the hand (plus cut_card, if there is one) without printing anything, and returns a ScoreBreakdown with
+        the points for each category and the total. Everything comes from one pass over the cards - counts of each rank
+        and suit, and the fifteens counts - rather than from lists of combinations.
+        """
+        if _score_cache is not None:
+            return _score_cache.score_breakdown(self, cut_card, crib)
+        return self._score_breakdown(cut_card, crib)
+
+    def _score_breakdown(self, cut_card, crib):
+        rank_counts = [0] * len(RANKS)
+        suit_counts = [0] * len(SUITS) # hand cards only, for the flush
+        ways = [1] + [0] * 15 # for fifteens, see _count_fifteens
+        nobs = 0
+        for card in self._cards:
+            rank_counts[card.rank_index] += 1
+            suit_counts[card.suit_index] += 1
+            value = card.value
+            for total in range(15, value - 1, -1):
+                ways[total] += ways[total - value]
+            if cut_card and card.rank == 'J' and card.suit == cut_card.suit:
+                nobs = 1
+        if cut_card:
+            rank_counts[cut_card.rank_index] += 1
+            value = cut_card.value
+            ways[15] += ways[15 - value]
 
-        return points
+        fifteens = 2 * ways[15]
+        pairs = sum(count * (count - 1) for count in rank_counts) # 2 points for each of the count choose 2 pairs
+        flush = Hand._score_flush_from_suit_counts(suit_counts, cut_card, crib)
+        runs = Hand._score_straights_from_rank_counts(rank_counts)
+        return ScoreBreakdown(fifteens, pairs, flush, runs, nobs, fifteens + pairs + flush + runs + nobs)
+
+    @staticmethod
+    def _score_flush_from_suit_counts(suit_counts, cut_card, crib):
+        # the same as scoring _score_flush on every combination of the hand cards (so it matches for hands bigger than
+        # four cards too): each combination of four or more cards of one suit scores 4, or 5 with the cut's suit - in
+        # the crib only the latter
+        score = 0
+        for suit_index, count in enumerate(suit_counts):
+            if count < 4:
+                continue
+            if cut_card and cut_card.suit_index == suit_index:
+                points = 5
+            else:
+                points = 0 if crib else 4
+            score += points * sum(math.comb(count, size) for size in range(4, count + 1))
+        return score
 
     @staticmethod
-    def _print_scoring(desc, score):
-        if score > 0:
+    def _print_scoring(desc, score, print_output=True):
+        if print_output and score > 0:
             print(f'- {desc} score(s) {score}.') 
         return score
 
-    def score_pegging(self):
+    def score_pegging(self, print_output=True):
+        if _score_cache is not None:
+            fifteen, pairs, straight = _score_cache.score_pegging_parts(self)
+        else:
+            fifteen, pairs, straight = self._score_pegging_parts()
         points = 0
 
-        points += Hand._print_scoring('Fifteen', Hand._score_15(self._cards))
-        points += Hand._print_scoring('Pair(s)', Hand._score_pegging_pairs(self._cards))
-        points += Hand._print_scoring('Straight', Hand._score_pegging_straights(self._cards))
+        points += Hand._print_scoring('Fifteen', fifteen, print_output)
+        points += Hand._print_scoring('Pair(s)', pairs, print_output)
+        points += Hand._print_scoring('Straight', straight, print_output)
 
         return points
 
-    def combinations(self, cut_card=None):
-        """Return a list of tuples, one for each combination of the four (or five, with cut) cards."""
-        cards = Hand._add_to_list_if_not_none(self._cards, cut_card)
-        combinations_not_flattened = []
-        for i in range(1, len(cards) + 1): # we want combinations with 1 to n cards
-            combinations_not_flattened.append(itertools.combinations(cards, i))
+    def _score_pegging_parts(self):
+        # (fifteen, pairs, straight) points for the last card played
+        return Hand._score_15(self._cards), Hand._score_pegging_pairs(self._cards), Hand._score_pegging_straights(self._cards)
+
+    def count_fifteens(self, cut_card=None):
+        """
+        Returns the number of different combinations of the cards (plus cut_card, if there is one) that add up to 15,
+        for any number of cards.
+        """
+        return Hand._count_fifteens(Hand._add_to_list_if_not_none(self._cards, cut_card))
+
+    @staticmethod
+    def _count_fifteens(cards):
+        # subset-sum counting rather than trying every combination: ways[total] is how many combinations of the cards
+        # seen so far add up to total, and each card adds its value to every combination before it (going down from
+        # 15 so a card isn't used twice) - 16 additions per card instead of 2^n combinations
+        ways = [1] + [0] * 15
+        for card in cards:
+            value = card.value
+            for total in range(15, value - 1, -1):
+                ways[total] += ways[total - value]
+        return ways[15]
+
+    def combinations(self, cut_card=None, size=None):
+        """
+        Return a tuple of tuples, one for each combination of the cards (plus cut_card, if there is one) - every
+        combination from 1 card up, or only those with 'size' cards. Each size is only enumerated the first time it's
+        asked for, and is kept and reused as long as the hand's cards and cut are the same.
+        """
+        cards = tuple(self._cards) if cut_card is None else (*self._cards, cut_card)
+        cached = self._combinations
+        if cached is not None and cached[0] == cards:
+            combinations = cached[1].get(size)
+            if combinations is not None:
+                return combinations
+        else:
+            cached = self._combinations = (cards, {})
 
-        return list(itertools.chain(*combinations_not_flattened)) # go ahead and convert to list now, so at least len works w/o further code
+        if size is not None:
+            combinations = tuple(itertools.combinations(cards, size))
+        else:
+            # all of them, smallest first, which is the same order iter_combinations gives
+            combinations = tuple(itertools.chain.from_iterable(itertools.combinations(cards, i) for i in range(1, len(cards) + 1)))
+        cached[1][size] = combinations
+        return combinations
+
+    def iter_combinations(self, cut_card=None, sizes=None):
+        """
+        Yield the combinations of the cards (plus cut_card, if there is one) one at a time, without building or
+        keeping a list of them - every size from 1 card up, or just the sizes in 'sizes'.
+        """
+        cards = Hand._add_to_list_if_not_none(self._cards, cut_card)
+        if sizes is None:
+            sizes = range(1, len(cards) + 1)
+        for size in sizes:
+            yield from itertools.combinations(cards, size)
 
     @staticmethod
     def _score_with_combinations(score_func, combinations):
@@ -174,25 +333,31 @@ class Hand:
 
     @staticmethod
     def _score_all_straights(cards, cut_card):
-        # can't use each indiv combination by itself because we only score the largest straight - i.e., a straight of three
-        # scores 3, but ONLY if there's no straight of four or five; at the same time we DO want to use the combinations so
-        # we can handle multiple straights from  duplicate cards - like AS, 2S, 3S and AS, 2H, 3S
-        # so we'll figure out the longest straight using _all_ the cards and score only straights of that length
-        
-        # straight scoring needs sorted - Hand doesn't require this for now (at least), so we'll sort here
-        all_cards = sorted(Hand._add_to_list_if_not_none(cards, cut_card))
-
-        length_of_longest_straight = Hand._get_length_of_longest_straight(all_cards)
-
-        score = 0
-        if length_of_longest_straight >= 3:
-            # TODO if/as I move scoring routines to instance methods I won't need to recreate a Hand instance here
-            right_size_combos = [combo for combo in Hand(all_cards).combinations() if len(combo) == length_of_longest_straight]
-
-            for combo in right_size_combos:
-                if Hand._get_length_of_longest_straight(combo) == length_of_longest_straight:
-                    score += length_of_longest_straight
+        # we only score the longest straight - a straight of three scores 3, but ONLY if there's no straight of four or
+        # five - and each combination of cards that makes it scores, so duplicate cards give multiple straights (like
+        # AS, 2S, 3S and AS, 2H, 3S). Rather than trying every combination, count the cards of each rank: the longest
+        # span of consecutive ranks that all have cards is the straight, and the number of different straights is the
+        # product of the counts in the span
+        rank_counts = [0] * len(RANKS)
+        for card in Hand._add_to_list_if_not_none(cards, cut_card):
+            rank_counts[card.rank_index] += 1
+        return Hand._score_straights_from_rank_counts(rank_counts)
 
+    @staticmethod
+    def _score_straights_from_rank_counts(rank_counts):
+        longest, score = 0, 0
+        length, combinations = 0, 1
+        for count in itertools.chain(rank_counts, [0]): # the extra zero ends a straight that runs up to the king
+            if count:
+                length += 1
+                combinations *= count
+                continue
+            if length >= 3:
+                if length > longest:
+                    longest, score = length, length * combinations
+                elif length == longest:
+                    score += length * combinations
+            length, combinations = 0, 1
         return score
 
     @staticmethod
@@ -257,28 +422,63 @@ class Hand:
 
 
 class Card:
-
-    def __init__(self, rank, suit):
-        self.rank = rank
-        self.suit = suit
+    # There are only 52 cards, so rather than allocating a new object every time we need one (every deal used to create a
+    # whole new deck), I create each card once, when this module is imported, and hand out the shared instances - Card(),
+    # Card.from_spec, Card.from_id, and Deck all return them. Each card carries an id from 0 to 51 (rank_index * 4 +
+    # suit_index, so ids sort the same way cards do) and has its value, rank_index, and suit_index computed up front,
+    # so equality, hashing, and ordering are all integer operations. Since they're shared, cards are immutable.
+    __slots__ = ('rank', 'suit', 'id', 'value', 'rank_index', 'suit_index')
+
+    def __new__(cls, rank, suit):
+        try:
+            return _CARDS_BY_SPEC[rank + suit]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid card: rank '{rank}', suit '{suit}'") from None
+
+    @classmethod
+    def _create(cls, rank, suit):
+        # only used to build the 52 shared instances, below
+        card = object.__new__(cls)
+        rank_index, suit_index = RANKS.index(rank), SUITS.index(suit)
+        for name, value in (('rank', rank), ('suit', suit), ('id', rank_index * len(SUITS) + suit_index),
+                            ('value', min(rank_index + 1, 10)), ('rank_index', rank_index), ('suit_index', suit_index)):
+            object.__setattr__(card, name, value)
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Card is immutable, can't set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Card is immutable, can't delete '{name}'")
+
+    # the shared instances survive copying and pickling (the latter matters for multiprocessing)
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Card, (self.rank, self.suit))
 
     def __eq__(self, other):
-        return (self.rank, self.suit) == (other.rank, other.suit)
+        if isinstance(other, Card):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self):
+        return self.id
 
     def __lt__(self, other):
-        return (self.rank_index, self.suit_index) < (other.rank_index, other.suit_index)  
+        if isinstance(other, Card):
+            return self.id < other.id
+        return NotImplemented
 
     def __repr__(self):
         return f'{self.rank}{self.suit}'
 
     def __str__(self):
-        suit_char_to_symbol = {
-            'S': '\u2660',
-            'H': '\u2665',
-            'D': '\u2666',
-            'C': '\u2663'
-        }
-        return f'{self.rank}{suit_char_to_symbol[self.suit]}'
+        return f'{self.rank}{SUIT_SYMBOLS[self.suit]}'
 
     # __add__ should return the same type - i.e., a Card - which doesn't make sense because you can't have cards
     # with ranks of, say, 18 - instead of doing it this way, I'll just manually sum values when I need to 
@@ -288,23 +488,30 @@ class Card:
     @staticmethod
     def from_spec(spec):
         # 'spec' is a two character string where the rank is the first char and suit the second (S, H, D, or C)
-        return Card(spec[0], spec[1])
-
-    @property
-    def value(self):
-        if self.rank == 'A':
-            return 1
-        elif self.rank in list('TJQK'):
-            return 10
-        elif int(self.rank) >= 2 and int(self.rank) <= 9:
-            return int(self.rank)
-        else:
-            raise ValueError(f"Invalid rank: '{self.rank}'")
+        try:
+            return _CARDS_BY_SPEC[spec]
+        except KeyError:
+            return Card(spec[0], spec[1])
+
+    @staticmethod
+    def from_id(card_id):
+        return CARDS[card_id]
+
+
+SUIT_SYMBOLS = {
+    'S': '\u2660',
+    'H': '\u2665',
+    'D': '\u2666',
+    'C': '\u2663'
+}
+
+# the 52 shared Card instances, in id order (by rank, then suit)
+CARDS = tuple(Card._create(rank, suit) for rank in RANKS for suit in SUITS)
+_CARDS_BY_SPEC = {repr(card): card for card in CARDS}
+# the order in which a new, unshuffled Deck holds the cards (by suit, then rank)
+_DECK_ORDER = tuple(_CARDS_BY_SPEC[rank + suit] for suit in SUITS for rank in RANKS)
 
-    @property
-    def rank_index(self):
-        return RANKS.index(self.rank)
 
-    @property
-    def suit_index(self):
-        return SUITS.index(self.suit)
+def card_for_spec(spec):
+    """The shared Card for a spec like '5H', or None if it isn't one - a dict lookup, for parsing lots of cards."""
+    return _CARDS_BY_SPEC.get(spec)
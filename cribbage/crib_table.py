@@ -0,0 +1,136 @@
+import array
+import itertools
+import random
+import sys
+from pathlib import Path
+
+import cards
+import score_table
+import tablefile
+
+# Expected crib points for each pair of cards we might discard, averaged over the two cards the opponent discards and
+# the cut, assuming we know nothing about the other cards (so the opponent's discards are any two of the 50 cards we
+# can't see, and the cut is any of the 48 after that). Suits only matter for flushes and nobs, where all that matters
+# is whether the two discards share a suit, so the 1,326 possible pairs collapse to 169 canonical forms: the two ranks
+# plus whether the pair is suited.
+#
+# To rebuild the table file, run 'python crib_table.py' from this directory - it's exhaustive (every opponent
+# discard and cut), using the same scoring as score_table. 'python crib_table.py --check' compares each entry with a
+# Monte Carlo estimate that uses Hand.score(crib=True) directly. The file is a tablefile of floats.
+
+_NUM_RANKS = len(cards.RANKS)
+TABLE_SIZE = _NUM_RANKS * _NUM_RANKS * 2
+TABLE_PATH = Path(__file__).parent / 'tables' / 'crib_table.bin'
+TABLE_VERSION = 1
+
+_JACK_RANK_INDEX = cards.RANKS.index('J')
+_table = None
+
+
+def pair_key(card_one, card_two):
+    """Return the table position for a discarded pair of cards - the same for every pair with the same canonical form."""
+    low, high = sorted((card_one.rank_index, card_two.rank_index))
+    return (low * _NUM_RANKS + high) * 2 + (card_one.suit_index == card_two.suit_index)
+
+
+def canonical_pairs():
+    """Yield a representative (card, card) discard for each of the 169 canonical forms."""
+    for low, high in itertools.combinations_with_replacement(range(_NUM_RANKS), 2):
+        yield cards.Card(cards.RANKS[low], 'S'), cards.Card(cards.RANKS[high], 'H')
+        if low != high:
+            yield cards.Card(cards.RANKS[low], 'S'), cards.Card(cards.RANKS[high], 'S')
+
+
+def exact_crib_value(discards):
+    """The exact expected crib score with the given two discards, over every opponent discard and cut."""
+    fifteens, pairs, runs = score_table.get_tables()
+    num_suits = len(cards.SUITS)
+    remaining = [card for card in cards.CARDS if card not in discards]
+
+    # the rank-only points, summed over every possible cut, only depend on the crib's four ranks
+    rank_points_by_crib_ranks = {}
+
+    total = 0
+    for opponent_discards in itertools.combinations(remaining, 2):
+        crib_cards = (*discards, *opponent_discards)
+
+        crib_ranks = tuple(sorted(card.rank_index for card in crib_cards))
+        rank_points = rank_points_by_crib_ranks.get(crib_ranks)
+        if rank_points is None:
+            rank_points = 0
+            for cut_rank in range(_NUM_RANKS):
+                key = score_table.rank_key(crib_ranks + (cut_rank,))
+                rank_points += (num_suits - crib_ranks.count(cut_rank)) * (fifteens[key] + pairs[key] + runs[key])
+            rank_points_by_crib_ranks[crib_ranks] = rank_points
+        total += rank_points
+
+        # a crib flush needs the cut to match too, and there are 13 - 4 cards of that suit left; nobs is a jack in
+        # the crib with any of the remaining cards of its suit cut
+        suits = [card.suit_index for card in crib_cards]
+        if suits.count(suits[0]) == 4:
+            total += 5 * (_NUM_RANKS - 4)
+        for card in crib_cards:
+            if card.rank_index == _JACK_RANK_INDEX:
+                total += _NUM_RANKS - suits.count(card.suit_index)
+
+    num_cuts = len(remaining) - 2
+    return total / (len(remaining) * (len(remaining) - 1) // 2 * num_cuts)
+
+
+def monte_carlo_crib_value(discards, num_samples, rng=random):
+    """Estimates the expected crib score with the given two discards by dealing random opponent discards and cuts."""
+    remaining = [card for card in cards.CARDS if card not in discards]
+    total = 0
+    for _ in range(num_samples):
+        opponent_one, opponent_two, cut_card = rng.sample(remaining, 3)
+        total += cards.Hand([*discards, opponent_one, opponent_two]).score(cut_card, crib=True, print_output=False)
+    return total / num_samples
+
+
+def build_table():
+    table = [0.0] * TABLE_SIZE
+    for discards in canonical_pairs():
+        table[pair_key(*discards)] = exact_crib_value(discards)
+    return table
+
+
+def write_table(table, path=TABLE_PATH):
+    tablefile.write(path, array.array('f', table), 'f', TABLE_VERSION)
+
+
+def read_table(path=TABLE_PATH):
+    return tablefile.open_table(path, 'f', TABLE_VERSION, TABLE_SIZE, rebuild_command='python crib_table.py')
+
+
+def get_table():
+    """Return the crib table (indexed by pair_key), reading it from disk the first time it's needed."""
+    global _table
+    if _table is None:
+        _table = read_table()
+    return _table
+
+
+def expected_crib_points(card_one, card_two):
+    """Expected points in a crib that includes these two discards."""
+    return get_table()[pair_key(card_one, card_two)]
+
+
+def check_table(num_samples=20000, seed=0):
+    """
+    Compares every entry in the crib table with a Monte Carlo estimate from Hand.score(crib=True). Returns a list of
+    (discards, table value, estimate) for each canonical pair.
+    """
+    rng = random.Random(seed)
+    return [(discards, expected_crib_points(*discards), monte_carlo_crib_value(discards, num_samples, rng))
+            for discards in canonical_pairs()]
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv[1:]:
+        results = check_table()
+        for discards, table_value, estimate in results:
+            print(f'{discards}: table {table_value:.3f}, Monte Carlo {estimate:.3f}')
+        print(f'Largest difference: {max(abs(t - e) for _, t, e in results):.3f}')
+    else:
+        write_table(build_table())
+        print(f'Wrote {TABLE_PATH}')
@@ -0,0 +1,96 @@
+import collections
+
+import canonical
+import cards
+import discard
+
+# The distribution of a kept four card hand's score over every card that might be cut, for bots (and analysis) that
+# want more than the mean discard.evaluate_discards gives them - how likely a hand is to reach some score, say, or its
+# best case. The cuts are every card that isn't in the hand and isn't known to be elsewhere: the 'dead' cards, like
+# our discards (which leaves the usual 46 cuts), cards seen during pegging, or an opponent's revealed hand.
+#
+# The scores are the same as Hand.score's, but found the way discard.py finds them: the rank-only points come from
+# the score table once per cut rank, and flush and nobs are added per cut. Results are remembered by the hand's
+# canonical form (canonical.py) - since swapping suits around (in the hand and the dead cards together) doesn't
+# change any score - so every suit-equivalent query after the first is a dict lookup.
+
+MAX_CACHE_SIZE = 200000 # distributions remembered before the cache is cleared and starts again
+
+_JACK_RANK_INDEX = cards.RANKS.index('J')
+_cache = {}
+
+
+class CutDistribution(collections.namedtuple('CutDistribution', ['histogram', 'num_cuts', 'mean', 'min', 'max'])):
+    """
+    A kept hand's score over the possible cuts. histogram[points] is the number of cuts that give the hand that many
+    points (it's as long as max + 1); mean, min, and max are of the score over the num_cuts cuts.
+    """
+    __slots__ = ()
+
+    def probability(self, points):
+        """Probability the cut gives the hand exactly this many points."""
+        return self.histogram[points] / self.num_cuts if 0 <= points < len(self.histogram) else 0.0
+
+    def probability_at_least(self, points):
+        """Probability the cut gives the hand this many points or more."""
+        return sum(self.histogram[max(points, 0):]) / self.num_cuts
+
+    @property
+    def variance(self):
+        return sum(count * (points - self.mean) ** 2 for points, count in enumerate(self.histogram)) / self.num_cuts
+
+
+def canonical_key(hand_cards, dead_cards=()):
+    """The same key for any two (hand, dead cards) that only differ by which suit is which (see canonical.py)."""
+    return canonical.canonical_key(hand_cards, dead_cards=dead_cards)
+
+
+def cut_distribution(hand_cards, dead_cards=(), crib=False):
+    """
+    Returns the CutDistribution of the score of hand_cards (four cards) over every cut that isn't in the hand or
+    dead_cards. crib scores the cards as a crib, where only a five card flush counts.
+    """
+    hand_cards = tuple(hand_cards)
+    if len(hand_cards) != 4:
+        raise ValueError(f'Expected four cards, got {len(hand_cards)}: {list(hand_cards)}')
+    dead_cards = set(dead_cards)
+    if dead_cards.intersection(hand_cards):
+        raise ValueError(f'Dead cards {sorted(dead_cards.intersection(hand_cards))} are in the hand')
+
+    key = (canonical_key(hand_cards, dead_cards), crib)
+    distribution = _cache.get(key)
+    if distribution is None:
+        if len(_cache) >= MAX_CACHE_SIZE:
+            _cache.clear()
+        distribution = _cache[key] = _compute(hand_cards, dead_cards, crib)
+    return distribution
+
+
+def _compute(hand_cards, dead_cards, crib):
+    rank_points = discard.hand_points_by_cut_rank(tuple(sorted(card.rank_index for card in hand_cards)))
+
+    flush_suit = hand_cards[0].suit_index if all(card.suit_index == hand_cards[0].suit_index for card in hand_cards) else None
+    nobs_suits = {card.suit_index for card in hand_cards if card.rank_index == _JACK_RANK_INDEX}
+
+    counts = collections.Counter()
+    for cut_card in cards.CARDS:
+        if cut_card in dead_cards or cut_card in hand_cards:
+            continue
+        points = rank_points[cut_card.rank_index]
+        if flush_suit is not None:
+            points += 5 if cut_card.suit_index == flush_suit else (0 if crib else 4)
+        if cut_card.suit_index in nobs_suits:
+            points += 1
+        counts[points] += 1
+
+    num_cuts = sum(counts.values())
+    if num_cuts == 0:
+        raise ValueError('Every card is in the hand or dead, so there is nothing left to cut')
+    max_points = max(counts)
+    histogram = tuple(counts[points] for points in range(max_points + 1))
+    mean = sum(points * count for points, count in counts.items()) / num_cuts
+    return CutDistribution(histogram, num_cuts, mean, min(counts), max_points)
+
+
+def clear_cache():
+    _cache.clear()
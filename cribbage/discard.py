@@ -0,0 +1,105 @@
+import collections
+import itertools
+import operator
+
+import cards
+import crib_table
+import score_table
+
+# Evaluates every way to discard two cards from a six card hand, against every possible cut. For each of the 15
+# discards, it's the four kept cards plus each of the 46 cards we can't see that might be cut. Calling Hand.score for
+# all 690 of those is far too slow to do on every deal of a simulation, so instead: the rank-only points (fifteens,
+# pairs, runs) for a kept hand only depend on the rank of the cut, so they're looked up once per rank (13 lookups, not
+# 46), and the only points that depend on the cut's suit (flush and nobs) are worked out once per suit. The crib
+# side comes from the precomputed table in crib_table, which already averages over the opponent's discards and the cut.
+
+DiscardOption = collections.namedtuple('DiscardOption', ['discards', 'keep', 'hand_mean', 'crib_mean', 'mean', 'variance'])
+DiscardOption.__doc__ = """
+One way to discard two cards. hand_mean is the expected score of the kept cards over the possible cuts; crib_mean is
+the expected score of a crib with these discards in it (positive when it's our crib, negative when it's the
+opponent's); mean is their sum, and variance is the variance of the kept cards' score over the cuts.
+"""
+
+_NUM_RANKS = len(cards.RANKS)
+_JACK_RANK_INDEX = cards.RANKS.index('J')
+_hand_points_by_cut_rank = {}
+
+
+def hand_points_by_cut_rank(keep_ranks):
+    """
+    The rank-only points (fifteens, pairs, runs) for four kept cards, given as a sorted tuple of rank indexes, with a
+    cut of each of the 13 ranks. There are only 1820 possible sets of four ranks, so these are remembered once looked
+    up - the list returned is shared, so don't change it.
+    """
+    try:
+        return _hand_points_by_cut_rank[keep_ranks]
+    except KeyError:
+        fifteens, pairs, runs = score_table.get_tables()
+        points = []
+        for cut_rank in range(_NUM_RANKS):
+            key = score_table.rank_key(keep_ranks + (cut_rank,))
+            points.append(fifteens[key] + pairs[key] + runs[key])
+        _hand_points_by_cut_rank[keep_ranks] = points
+        return points
+
+
+def evaluate_discards(hand_cards, crib=False):
+    """
+    Returns a DiscardOption for each of the 15 ways to discard two of the six cards in hand_cards, best (highest mean)
+    first. 'crib' says whether the discards go to our own crib, like Player.crib.
+    """
+    hand_cards = list(hand_cards)
+    if len(hand_cards) != 6:
+        raise ValueError(f'Expected six cards, got {len(hand_cards)}: {hand_cards}')
+
+    crib_sign = 1 if crib else -1
+
+    # how many unseen cards (possible cuts) there are of each rank and of each suit
+    cuts_by_rank, cuts_by_suit = [len(cards.SUITS)] * _NUM_RANKS, [_NUM_RANKS] * len(cards.SUITS)
+    for card in hand_cards:
+        cuts_by_rank[card.rank_index] -= 1
+        cuts_by_suit[card.suit_index] -= 1
+    num_cuts = sum(cuts_by_rank)
+
+    options = []
+    for i, j in itertools.combinations(range(6), 2):
+        # by position, so the kept cards don't need any Card comparisons
+        discards = (hand_cards[i], hand_cards[j])
+        keep = [card for n, card in enumerate(hand_cards) if n != i and n != j]
+        hand_by_rank = hand_points_by_cut_rank(tuple(sorted(card.rank_index for card in keep)))
+
+        # flush and nobs, for each suit the cut could have
+        flush_suit = keep[0].suit_index
+        if keep[1].suit_index == flush_suit and keep[2].suit_index == flush_suit and keep[3].suit_index == flush_suit:
+            hand_by_suit = [4, 4, 4, 4]
+            hand_by_suit[flush_suit] = 5
+        else:
+            hand_by_suit = [0, 0, 0, 0]
+        for card in keep:
+            if card.rank_index == _JACK_RANK_INDEX:
+                hand_by_suit[card.suit_index] += 1
+
+        # every cut's points are (a part that depends on its rank) + (a part that depends on its suit), so the totals
+        # over the unseen cuts come from the per-rank and per-suit counts, rather than a loop over all 46 cuts; for
+        # the squares, the cross term is summed over the whole deck and then the six cards we hold are taken back out
+        hand_total = _dot(cuts_by_rank, hand_by_rank) + _dot(cuts_by_suit, hand_by_suit)
+        cross = sum(hand_by_rank) * sum(hand_by_suit) - sum(hand_by_rank[c.rank_index] * hand_by_suit[c.suit_index] for c in hand_cards)
+        hand_squares = (_dot(cuts_by_rank, map(operator.mul, hand_by_rank, hand_by_rank))
+                        + _dot(cuts_by_suit, map(operator.mul, hand_by_suit, hand_by_suit)) + 2 * cross)
+
+        hand_mean = hand_total / num_cuts
+        crib_mean = crib_sign * crib_table.expected_crib_points(*discards)
+        options.append(DiscardOption(list(discards), keep, hand_mean, crib_mean, hand_mean + crib_mean,
+                                     hand_squares / num_cuts - hand_mean * hand_mean))
+
+    options.sort(key=lambda option: option.mean, reverse=True)
+    return options
+
+
+def _dot(counts, values):
+    return sum(map(operator.mul, counts, values))
+
+
+def best_discard(hand_cards, crib=False):
+    """Returns the DiscardOption with the highest expected value - see evaluate_discards."""
+    return evaluate_discards(hand_cards, crib)[0]
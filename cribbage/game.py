@@ -1,5 +1,10 @@
 import cards
+import collections
+import discard
+import gamelog
+import pegging
 import random   
+import score_table
 
 SCORE_TO_WIN = 120
 
@@ -11,6 +16,15 @@ class WinningScoreException(Exception):
     """
     pass
 
+GameResult = collections.namedtuple('GameResult', ['winner', 'scores', 'points', 'deals'])
+GameResult.__doc__ = """
+What Game.play returns: winner is 0 if player_one won and 1 if player_two won, scores is the final (player_one,
+player_two) scores, points is a matching pair of dicts with each player's points by category (see POINT_CATEGORIES),
+and deals is the number of deals it took.
+"""
+
+POINT_CATEGORIES = ('pegging', 'last card', 'hand', 'crib')
+
 def print_with_separating_line(str=None, line_before=False, line_after=True):
     if line_before:
         print('----')
@@ -20,16 +34,40 @@ def print_with_separating_line(str=None, line_before=False, line_after=True):
         print('----')
 
 class Game:
-    def __init__(self, player_one=None, player_two=None, score_to_win=SCORE_TO_WIN):
+    def __init__(self, player_one=None, player_two=None, score_to_win=SCORE_TO_WIN, verbose=True, rng=None, recorder=None,
+                 metrics=None, score_with_hand=False):
+        """
+        With verbose=False the game runs headless, for simulations: nothing is printed (or even formatted) by the game
+        or its players. 'rng' is the random number generator (anything with the same methods as the random module, like
+        a seeded random.Random) used for shuffling - and by the players, if it's given - so games can be reproduced.
+        'recorder' is an optional gamelog.GameRecorder that's told about every deal, discard, cut, play, and score.
+        'metrics' is an optional metrics.Metrics that times each phase of each deal and counts plays, goes, and retries.
+        score_with_hand=True scores hands, cribs, and pegging with Hand.score_breakdown and Hand.score_pegging rather
+        than the precomputed table and PeggingState - slower, but it's what replay uses to check the scoring code itself.
+        """
         self.player_one = player_one if player_one else Player('Player 1', score_to_win=score_to_win)
         self.player_two = player_two if player_two else Player('Player 2', score_to_win=score_to_win)
 
         self.set_player_crib_status(self.player_one, self.player_two)
 
+        self.verbose = verbose
+        self.rng = rng if rng else random
+        for player in (self.player_one, self.player_two):
+            player.score_to_win = score_to_win
+            player.verbose = verbose
+            player.metrics = metrics
+            if rng:
+                player.rng = rng
+
         self.deck = cards.Deck()
         self.crib = None
         self.cut_card = None
         self.score_to_win = score_to_win
+        self.deals = 0
+        self.points = ({category: 0 for category in POINT_CATEGORIES}, {category: 0 for category in POINT_CATEGORIES})
+        self.recorder = recorder
+        self.metrics = metrics
+        self.score_with_hand = score_with_hand
 
     def status(self):
         return 'Game status\n{0}\n{1}\nCrib: {2}\nCut card: {3}'.format(self.player_one.status(), self.player_two.status(), self.crib, self.cut_card)
@@ -37,7 +75,7 @@ class Game:
 
     def cut_cards(self):
         # shuffles deck as a side-effect
-        random.shuffle(self.deck)
+        self.deck.shuffle(self.rng)
         self.cut_card = self.deck.draw_hand(1)[0] # indexer to return the Card, not the Hand containing the Card
 
     def set_player_crib_status(self, crib_player, non_crib_player):
@@ -68,19 +106,43 @@ class Game:
         else:
             return curr_player
 
+    def _player_index(self, player):
+        return 0 if player is self.player_one else 1
+
+    def add_points(self, player, category, points):
+        # all scoring goes through here so we can keep track of where each player's points came from - the points are
+        # recorded before updating the score because the update raises WinningScoreException when the player wins
+        self.points[self._player_index(player)][category] += points
+        player.score += points
+
     def update_player_score(self, player, crib=False, print_output=False):
         # score cards, update score, and return True if score is => the winning threshold and False otherwise
-        if not crib:
-            if print_output:
+        print_output = print_output and self.verbose
+        metrics = self.metrics
+        if metrics is not None:
+            phase_start = metrics.start()
+        hand = self.crib if crib else player.hand
+        if print_output:
+            if not crib:
                 print(f'{player.status()}, cut: {self.cut_card}')
-            score = player.hand.score(cut_card=self.cut_card)
-        else:
-            if print_output:
+            else:
                 print(f'Crib: {self.crib}, cut: {self.cut_card}')
-            score = self.crib.score(cut_card=self.cut_card, crib=True)
 
-        print(f'Total score: {score}')
-        player.score += score
+        if self.score_with_hand and not self.verbose:
+            score = hand.score_breakdown(self.cut_card, crib).total
+        elif not self.verbose and self.cut_card and len(hand) == 4:
+            # headless, so we don't need Hand.score's description of each category and can use the precomputed table
+            score = score_table.score(hand, self.cut_card, crib=crib)
+        else:
+            score = hand.score(cut_card=self.cut_card, crib=crib, print_output=self.verbose)
+
+        if self.verbose:
+            print(f'Total score: {score}')
+        if metrics is not None:
+            metrics.stop('crib scoring' if crib else 'hand scoring', phase_start)
+        if self.recorder is not None:
+            self.recorder.record(gamelog.CRIB if crib else gamelog.HAND, self._player_index(player), points=score)
+        self.add_points(player, 'crib' if crib else 'hand', score)
 
         if player.score >= self.score_to_win:
             return True
@@ -89,104 +151,207 @@ class Game:
 
 
     def play(self):
+        """Plays deals until someone wins, and returns a GameResult."""
 
         # TODO draw for first player
 
+        self._start_game()
+
         # one iteration per hand/peg/score 
         try:
             # Note that I test individual parts of this loop, but the loop still has some logic which I don't currently test
             # TODO probably best to extract the logic so I can test it in test_game.py  
             while True:
-                print_with_separating_line()
-                print_with_separating_line(f"New deal. {self.crib_player.name}'s crib.")
-
-                self.deck = cards.Deck()
-                random.shuffle(self.deck)
-
-                self.crib_player.hand = self.deck.draw_hand(6, sort=True)
-                self.non_crib_player.hand = self.deck.draw_hand(6, sort=True)
-
-                print_with_separating_line(self.status())
+                self._deal()
 
+                phase_start = self._start_phase()
                 crib_player_crib_cards = self.crib_player.get_crib_cards()
                 non_crib_player_crib_cards = self.non_crib_player.get_crib_cards()
-                self.crib = cards.Hand(sorted(crib_player_crib_cards + non_crib_player_crib_cards))
+                self._make_crib(crib_player_crib_cards, non_crib_player_crib_cards, phase_start)
 
-                self.cut_cards()
-                print_with_separating_line(self.status())
-
-                print_with_separating_line('The play')
+                self._cut()
+                phase_start = self._start_phase()
                 self.do_play_loop()
-                
-                print_with_separating_line('Score hands and crib')
-                # TODO update name to show that we score the hand/crib and then update score - maybe 'score_cards_and_update_player_score'
-                self.update_player_score(self.non_crib_player, print_output=True)
-                self.update_player_score(self.crib_player, print_output=True)
-                self.update_player_score(self.crib_player, crib=True, print_output=True)
-
-                print_with_separating_line(self.status(), line_before=True)
+                self._stop_phase('pegging', phase_start)
 
+                self._score_hands_and_crib()
                 self.swap_crib_player()
         except WinningScoreException as e:
-            print_with_separating_line('GAME OVER', line_before=True, line_after=False)
+            if self.verbose:
+                print_with_separating_line('GAME OVER', line_before=True, line_after=False)
+                print_with_separating_line(self.status())
+
+        return self._finish_game()
+
+    # the steps of play, split out so AsyncGame (in server.py) can run the same game with players it has to wait on
+
+    def _start_phase(self):
+        return self.metrics.start() if self.metrics is not None else None
+
+    def _stop_phase(self, phase, phase_start):
+        if self.metrics is not None:
+            self.metrics.stop(phase, phase_start)
+
+    def _start_game(self):
+        if self.recorder is not None:
+            self.recorder.start(self)
+        if self.metrics is not None:
+            self.metrics.count('games')
+
+    def _finish_game(self):
+        result = self.result()
+        if self.recorder is not None:
+            self.recorder.finish(result)
+        return result
+
+    def _deal(self):
+        self.deals += 1
+        if self.metrics is not None:
+            self.metrics.count('deals')
+        phase_start = self._start_phase()
+        if self.verbose:
+            print_with_separating_line()
+            print_with_separating_line(f"New deal. {self.crib_player.name}'s crib.")
+
+        self.deck.reset() # the same Deck for every deal
+        self.deck.shuffle(self.rng)
+
+        self.crib_player.hand = self.deck.draw_hand(6, sort=True)
+        self.non_crib_player.hand = self.deck.draw_hand(6, sort=True)
+        self.player_one.cut_card = self.player_two.cut_card = None
+        if self.recorder is not None:
+            self.recorder.record(gamelog.DEAL, self._player_index(self.crib_player), [*self.player_one.hand, *self.player_two.hand])
+        self._stop_phase('deal', phase_start)
+
+        if self.verbose:
+            print_with_separating_line(self.status())
+
+    def _make_crib(self, crib_player_crib_cards, non_crib_player_crib_cards, phase_start):
+        self.crib = cards.Hand(sorted(crib_player_crib_cards + non_crib_player_crib_cards))
+        if self.recorder is not None:
+            self.recorder.record(gamelog.DISCARD, self._player_index(self.crib_player), crib_player_crib_cards)
+            self.recorder.record(gamelog.DISCARD, self._player_index(self.non_crib_player), non_crib_player_crib_cards)
+        self._stop_phase('discard', phase_start)
+
+    def _cut(self):
+        phase_start = self._start_phase()
+        self.cut_cards()
+        self.player_one.cut_card = self.player_two.cut_card = self.cut_card
+        if self.recorder is not None:
+            self.recorder.record(gamelog.CUT, self._player_index(self.crib_player), [self.cut_card])
+        self._stop_phase('cut', phase_start)
+        if self.verbose:
             print_with_separating_line(self.status())
+            print_with_separating_line('The play')
+
+    def _score_hands_and_crib(self):
+        if self.verbose:
+            print_with_separating_line('Score hands and crib')
+        # TODO update name to show that we score the hand/crib and then update score - maybe 'score_cards_and_update_player_score'
+        self.update_player_score(self.non_crib_player, print_output=True)
+        self.update_player_score(self.crib_player, print_output=True)
+        self.update_player_score(self.crib_player, crib=True, print_output=True)
+
+        if self.verbose:
+            print_with_separating_line(self.status(), line_before=True)
+
+    def result(self):
+        scores = (self.player_one.score, self.player_two.score)
+        winner = 0 if scores[0] >= scores[1] else 1
+        return GameResult(winner, scores, self.points, self.deals)
 
     def do_play_loop(self):
         """Implements 'the play' - pegging, one card at a time, until both players have used all of their cards."""
         # init
         curr_play_cards, used_player_cards = [], [] 
-        self.player_one.reset_eligible_play_cards()
-        self.player_two.reset_eligible_play_cards()
-        curr_play_player = self.non_crib_player # non-crib player always starts
+        pegging_state = pegging.PeggingState() # the count and what's needed to score each card, for this trip to 31
+        curr_play_player = self._start_play()
 
         while (len(self.player_one.remaining_cards_for_the_play) > 0) or (len(self.player_two.remaining_cards_for_the_play) > 0):
             # outer loop, one iteration per trip to 31
-            self.player_one.said_go, self.player_two.said_go = False, False
             used_player_cards += used_player_cards + curr_play_cards
             curr_play_cards = []
-            print('Count is now at zero')
+            self._start_trip_to_31(pegging_state)
 
             while True: 
                 # inner loop for particular 0-31 iteration, exits via break so while True
-                self.get_and_score_one_play_card(curr_play_player, curr_play_cards, used_player_cards)
-                played_card_total_value = cards.Hand.get_value_total(curr_play_cards)
-
-                if (played_card_total_value == 31) or (self.player_one.said_go and self.player_two.said_go):
-                    # done with this iteration
-                    if played_card_total_value != 31:
-                        last_play_score = 1
-                    else: # got to 31
-                        last_play_score = 2 
-                    
-                    print(f'{curr_play_player.name} played the last card for a total of {played_card_total_value}, scoring {last_play_score}')
-                    curr_play_player.score += last_play_score
-                    print_with_separating_line(self.status(), line_before=True)
-                    curr_play_player = self._get_other_player(curr_play_player) # set curr player to opposite of player that last played a card (hopefully this is always the same as the player who first said go?)
+                self.get_and_score_one_play_card(curr_play_player, curr_play_cards, used_player_cards, pegging_state)
+                curr_play_player, trip_over = self._after_play_card(curr_play_player, pegging_state)
+                if trip_over:
                     break
-                else:
-                    # still going with this 0-31 trip
-                    curr_play_player = self._get_next_player_for_play(curr_play_player)
 
+    def _start_play(self):
+        # returns the player who plays first
+        self.player_one.reset_eligible_play_cards()
+        self.player_two.reset_eligible_play_cards()
+        return self.non_crib_player # non-crib player always starts
 
-    def get_and_score_one_play_card(self, player, curr_play_cards, all_play_cards):
+    def _start_trip_to_31(self, pegging_state):
+        self.player_one.said_go, self.player_two.said_go = False, False
+        pegging_state.reset()
+        if self.verbose:
+            print('Count is now at zero')
+
+    def _after_play_card(self, curr_play_player, pegging_state):
+        # scores the last card if this trip to 31 is over; returns the next player and whether the trip is over
+        played_card_total_value = pegging_state.count
+
+        if (played_card_total_value == 31) or (self.player_one.said_go and self.player_two.said_go):
+            # done with this iteration
+            if played_card_total_value != 31:
+                last_play_score = 1
+            else: # got to 31
+                last_play_score = 2 
+            
+            if self.verbose:
+                print(f'{curr_play_player.name} played the last card for a total of {played_card_total_value}, scoring {last_play_score}')
+            if self.recorder is not None:
+                self.recorder.record(gamelog.LAST_CARD, self._player_index(curr_play_player), points=last_play_score)
+            self.add_points(curr_play_player, 'last card', last_play_score)
+            if self.verbose:
+                print_with_separating_line(self.status(), line_before=True)
+            return self._get_other_player(curr_play_player), True # set curr player to opposite of player that last played a card (hopefully this is always the same as the player who first said go?)
+        else:
+            # still going with this 0-31 trip
+            return self._get_next_player_for_play(curr_play_player), False
+
+    def get_and_score_one_play_card(self, player, curr_play_cards, all_play_cards, pegging_state=None):
+        # pegging_state is the pegging.PeggingState for curr_play_cards, which do_play_loop keeps up to date as cards
+        # are played; without one, it's built from curr_play_cards
+        if pegging_state is None:
+            pegging_state = pegging.PeggingState(curr_play_cards)
         curr_play_card = player.get_play_card(curr_play_cards, all_play_cards)
-        
+        self._score_play_card(player, curr_play_card, curr_play_cards, pegging_state)
+
+    def _score_play_card(self, player, curr_play_card, curr_play_cards, pegging_state):
         if curr_play_card:
             curr_play_cards.append(curr_play_card) # curr_play_cards is passed by ref, so this appends to the master list, as desired
-            curr_play_total = cards.Hand.get_value_total(curr_play_cards) 
-            print(f'{player.name} played {curr_play_card} for {curr_play_total}')
-            score_from_card = cards.Hand(curr_play_cards).score_pegging()
-            player.score += score_from_card
-            if score_from_card > 0:
+            score_from_card = pegging_state.play(curr_play_card)
+            if self.score_with_hand:
+                score_from_card = cards.Hand(curr_play_cards).score_pegging(print_output=False)
+            if self.verbose:
+                print(f'{player.name} played {curr_play_card} for {pegging_state.count}')
+                cards.Hand(curr_play_cards).score_pegging() # just to print how the points were scored
+            if self.recorder is not None:
+                self.recorder.record(gamelog.PLAY, self._player_index(player), [curr_play_card], score_from_card)
+            if self.metrics is not None:
+                self.metrics.count('plays')
+            self.add_points(player, 'pegging', score_from_card)
+            if self.verbose and score_from_card > 0:
                 print(f'{player.name} scored {score_from_card}, now at {player.score}')
         else:
             # got None, which is a go (or no cards at all in hand, currently also None/go - I could update to return diff values if needed)
-            print(f'{player.name} said go (or had no cards at all to play)')
+            if self.verbose:
+                print(f'{player.name} said go (or had no cards at all to play)')
+            if self.recorder is not None:
+                self.recorder.record(gamelog.GO, self._player_index(player))
+            if self.metrics is not None:
+                self.metrics.count('goes')
             player.said_go = True        
 
 
 class Player:
-    def __init__(self, name=None, crib=False, input_func=input, score_to_win=SCORE_TO_WIN):
+    def __init__(self, name=None, crib=False, input_func=input, score_to_win=SCORE_TO_WIN, verbose=True, rng=random):
         if name:
             self.name = name
         else:
@@ -199,6 +364,18 @@ class Player:
         self.input_func = input_func
         self.remaining_cards_for_the_play = [] # currently set by reset_eligible_play_cards
         self.said_go = False
+        self.cut_card = None # Game sets this after the cut, since both players can see it
+        self.verbose = verbose # Game sets this, rng, metrics, and score_to_win to match its own
+        self.rng = rng
+        self.metrics = None
+
+    @property
+    def score_to_win(self):
+        return self._score_to_win
+
+    @score_to_win.setter
+    def score_to_win(self, value):
+        self._score_to_win = value
 
     @property 
     def score(self):
@@ -222,17 +399,33 @@ class Player:
         # keep trying until we get a card that's in the remaining cards AND that's a value that'll fit into 31
         while True:
             crib_cards = self.get_candidate_crib_cards()
+            if self._accept_crib_cards(crib_cards):
+                return crib_cards
+
+    def _accept_crib_cards(self, crib_cards):
+        # validates chosen crib cards, removing them from the hand if they're ok - returns whether they were
+        if self.verbose:
             print(f'Selected crib cards: {crib_cards}')
 
-            if not all([c in self.hand for c in crib_cards]):
-                # one or more specified cards aren't in the hand - print message and loop
-                print(f'{self.name} specified at least one card not in hand: {crib_cards} not in {self.hand}')
-            else:
-                for card in crib_cards:
-                    self.hand.remove(card)
-                break
+        if len(crib_cards) != 2 or crib_cards[0] == crib_cards[1]:
+            # the same card twice would pass the check below and then fail the second remove, leaving the hand half changed
+            self._reject_choice(lambda: f'{self.name} must specify two different cards, not {crib_cards}', 'invalid crib cards')
+            return False
+        if not all([c in self.hand for c in crib_cards]):
+            # one or more specified cards aren't in the hand - print message and loop
+            self._reject_choice(lambda: f'{self.name} specified at least one card not in hand: {crib_cards} not in {self.hand}', 'invalid crib cards')
+            return False
 
-        return crib_cards
+        for card in crib_cards:
+            self.hand.remove(card)
+        return True
+
+    def _reject_choice(self, describe, counter):
+        # describe is a function returning the message, so headless games never format it
+        if self.verbose:
+            print(describe())
+        if self.metrics is not None:
+            self.metrics.count(counter)
 
     def get_candidate_crib_cards(self):
         # base class just returns the first two cards; subclasses can do things differently (like use UI)
@@ -245,32 +438,32 @@ class Player:
         can override.
         """        
         curr_play_total = cards.Hand.get_value_total(curr_play_cards)
-        max_value_of_ok_card = 31 - curr_play_total
-
-        if len(self.remaining_cards_for_the_play) == 0:
-            candidate_play_card = None
-            msg = 'has no cards'
-        elif (curr_play_total + min([c.value for c in self.remaining_cards_for_the_play])) > 31:
-            # smallest card would still make the total > 31, so say go
-            candidate_play_card = None
-            msg = 'says go'
-        else: 
-            # keep trying until we get a card that's in the remaining cards AND that's a value that'll fit into 31
-            while True: 
-                candidate_play_card = self.get_candidate_play_card(curr_play_cards, all_play_cards)
-
-                if not candidate_play_card in self.remaining_cards_for_the_play:
-                    print(f"{self.name} specified a card, {candidate_play_card}, that's not in the remaining eligible cards: {self.remaining_cards_for_the_play}")
-                elif candidate_play_card.value > max_value_of_ok_card:
-                    print(f"{self.name} specified a card, {candidate_play_card}, that would add to more than 31 (current total: {curr_play_total})")
-                else:
-                    self.remaining_cards_for_the_play.remove(candidate_play_card)
-                    msg = f'selects {candidate_play_card} for the play'
-                    break
 
-        # more info than needed for general play, but keep as comment for possible debugging
-        #print(f'{self.name} {msg}')
-        return candidate_play_card
+        if self._must_say_go(curr_play_total):
+            return None
+
+        # keep trying until we get a card that's in the remaining cards AND that's a value that'll fit into 31
+        while True: 
+            candidate_play_card = self.get_candidate_play_card(curr_play_cards, all_play_cards)
+            if self._accept_play_card(candidate_play_card, curr_play_total):
+                return candidate_play_card
+
+    def _must_say_go(self, curr_play_total):
+        # no cards left, or the smallest card would still make the total > 31
+        return (len(self.remaining_cards_for_the_play) == 0 or
+                (curr_play_total + min(c.value for c in self.remaining_cards_for_the_play)) > 31)
+
+    def _accept_play_card(self, candidate_play_card, curr_play_total):
+        # validates a chosen play card, removing it from the remaining cards if it's ok - returns whether it was
+        if not candidate_play_card in self.remaining_cards_for_the_play:
+            self._reject_choice(lambda: f"{self.name} specified a card, {candidate_play_card}, that's not in the remaining eligible cards: {self.remaining_cards_for_the_play}", 'invalid play cards')
+            return False
+        if candidate_play_card.value > 31 - curr_play_total:
+            self._reject_choice(lambda: f"{self.name} specified a card, {candidate_play_card}, that would add to more than 31 (current total: {curr_play_total})", 'invalid play cards')
+            return False
+
+        self.remaining_cards_for_the_play.remove(candidate_play_card)
+        return True
 
     def get_candidate_play_card(self, curr_play_cards, all_play_cards):
         # base class just returns the first card; subclasses can do things differently (like use UI)
@@ -288,23 +481,64 @@ class UIPlayer(Player):
         print(self.status())
         crib_card_specs_as_str = self.input_func('Enter crib cards, comma separated: ')
         crib_card_specs = [s.strip() for s in crib_card_specs_as_str.split(',')] # split on comma, strip whitespace
-        crib_cards = [cards.Card.from_spec(crib_card_specs[0]), cards.Card.from_spec(crib_card_specs[1])]
+        crib_cards = [UIPlayer._card_from_spec(crib_card_specs[0]), UIPlayer._card_from_spec(crib_card_specs[1])]
         return crib_cards
 
     def get_candidate_play_card(self, curr_play_cards, all_play_cards):
         # TODO add status print for play info - likely curr, all, and eligible?
         # TODO move/implement that the status print in get_play_card so only have to implement it once?
         play_card_spec_as_str = self.input_func(f'Enter play card (available: {self.remaining_cards_for_the_play}): ')
-        return cards.Card.from_spec(play_card_spec_as_str)
+        return UIPlayer._card_from_spec(play_card_spec_as_str)
+
+    @staticmethod
+    def _card_from_spec(spec):
+        # from_spec raises for something that isn't a card, like a typo - return None instead so the validation in
+        # get_crib_cards/get_play_card reports it as not being in the hand and asks again
+        try:
+            return cards.Card.from_spec(spec)
+        except (ValueError, IndexError):
+            return None
 
 class RandomPlayer(Player):
     # pick cards at random whenever asked
     def get_candidate_crib_cards(self):
-        print(self.status())
-        return random.sample(list(self.hand), 2) # sample requires a sequence, so use list to get one 
+        if self.verbose:
+            print(self.status())
+        return self.rng.sample(list(self.hand), 2) # sample requires a sequence, so use list to get one 
+
+    def get_candidate_play_card(self, curr_play_cards, all_play_cards):
+        return self.rng.choice(self.remaining_cards_for_the_play)
+
+class DiscardAdvisorPlayer(RandomPlayer):
+    # discards whichever two cards give the best expected hand plus crib points over all possible cuts (see
+    # discard.evaluate_discards), and for now plays cards the same way as RandomPlayer
+    def get_candidate_crib_cards(self):
+        if self.verbose:
+            print(self.status())
+        return discard.best_discard(self.hand, crib=self.crib).discards
+
+class ExpectimaxPlayer(DiscardAdvisorPlayer):
+    # discards like DiscardAdvisorPlayer, and picks pegging cards by searching ahead (see pegging.PeggingEngine)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pegging_engine = pegging.PeggingEngine()
+        self._discards = () # this deal's crib cards, which the opponent can't be holding (and nor can the cut card)
+
+    def get_candidate_crib_cards(self):
+        crib_cards = super().get_candidate_crib_cards()
+        self._discards = tuple(crib_cards)
+        return crib_cards
 
     def get_candidate_play_card(self, curr_play_cards, all_play_cards):
-        return random.choice(self.remaining_cards_for_the_play)
+        my_cards = set(self.hand)
+        played_cards = set(all_play_cards) | set(curr_play_cards)
+        known_cards = my_cards | played_cards | set(self._discards) | {self.cut_card}
+        unseen_cards = [card for card in cards.CARDS if card not in known_cards]
+        opponent_card_count = len(self.hand) - sum(1 for card in played_cards if card not in my_cards)
+        # if we played the last card and it's our turn again, the opponent said go
+        opponent_said_go = len(curr_play_cards) > 0 and curr_play_cards[-1] in my_cards
+        return self.pegging_engine.choose(self.remaining_cards_for_the_play, curr_play_cards, unseen_cards,
+                                          opponent_card_count, opponent_said_go)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,146 @@
+import collections
+import gzip
+import struct
+
+import cards
+
+# A compact binary format for keeping every simulated game. Game calls a GameRecorder (if it's given one) at each
+# step - the deal, discards, cut, each pegging play or go, and the hand and crib scores - and the recorder turns the
+# game into a GameRecord when it ends, handing it to a GameLogWriter if it has one.
+#
+# A log file starts with a header: the magic bytes b'CRIBLOG', then a format version byte. After that each game is a
+# frame: a four byte (little-endian) length, then the game: score to win, winner, and the two final scores (all
+# two byte unsigned ints except the winner, which is one byte), the number of events (two bytes), and the events.
+# Each event is its kind and player index (one byte each), then the cards for that kind of event (one byte per card,
+# its Card.id) and then, for kinds that score, the points (one byte). Compressed logs are the same bytes, gzipped.
+#
+# read_games streams the records back one game at a time, so it can go through a multi-GB log without loading it
+# (read_frames does the same without decoding, for handing games to other processes).
+
+MAGIC = b'CRIBLOG'
+VERSION = 1
+
+# event kinds - for DEAL the player is the crib player, and the cards are player one's six cards then player two's;
+# for CUT the player is the crib player
+DEAL, DISCARD, CUT, PLAY, GO, LAST_CARD, HAND, CRIB = range(1, 9)
+KIND_NAMES = {DEAL: 'deal', DISCARD: 'discard', CUT: 'cut', PLAY: 'play', GO: 'go', LAST_CARD: 'last card', HAND: 'hand', CRIB: 'crib'}
+# number of cards and whether there are points, for each kind
+_LAYOUT = {DEAL: (12, False), DISCARD: (2, False), CUT: (1, False), PLAY: (1, True), GO: (0, False),
+           LAST_CARD: (0, True), HAND: (0, True), CRIB: (0, True)}
+
+_GAME_HEADER = struct.Struct('<HBHHH')
+_FRAME_LENGTH = struct.Struct('<I')
+
+Event = collections.namedtuple('Event', ['kind', 'player', 'cards', 'points'])
+GameRecord = collections.namedtuple('GameRecord', ['score_to_win', 'winner', 'scores', 'events'])
+
+
+class GameRecorder:
+    def __init__(self, writer=None):
+        self.writer = writer
+        self.events = []
+        self.score_to_win = None
+
+    def start(self, game):
+        self.events = []
+        self.score_to_win = game.score_to_win
+
+    def record(self, kind, player, cards=(), points=0):
+        self.events.append(Event(kind, player, tuple(cards), points))
+
+    def finish(self, result):
+        """Called by Game with its GameResult when the game's over; returns the GameRecord (and writes it, if there's a writer)."""
+        game_record = GameRecord(self.score_to_win, result.winner, result.scores, self.events)
+        if self.writer is not None:
+            self.writer.write(game_record)
+        return game_record
+
+
+def encode(game_record):
+    """The bytes for one game (a frame, without the length)."""
+    data = bytearray(_GAME_HEADER.pack(game_record.score_to_win, game_record.winner, *game_record.scores, len(game_record.events)))
+    for event in game_record.events:
+        num_cards, has_points = _LAYOUT[event.kind]
+        if len(event.cards) != num_cards:
+            raise ValueError(f'A {KIND_NAMES[event.kind]} event needs {num_cards} cards, got {event.cards}')
+        data.append(event.kind)
+        data.append(event.player)
+        data.extend(card.id for card in event.cards)
+        if has_points:
+            data.append(event.points)
+    return bytes(data)
+
+
+def decode(data):
+    score_to_win, winner, score_one, score_two, num_events = _GAME_HEADER.unpack_from(data)
+    position = _GAME_HEADER.size
+    events = []
+    for _ in range(num_events):
+        kind, player = data[position], data[position + 1]
+        num_cards, has_points = _LAYOUT[kind]
+        position += 2
+        event_cards = tuple(cards.CARDS[card_id] for card_id in data[position:position + num_cards])
+        position += num_cards
+        points = 0
+        if has_points:
+            points = data[position]
+            position += 1
+        events.append(Event(kind, player, event_cards, points))
+    return GameRecord(score_to_win, winner, (score_one, score_two), events)
+
+
+class GameLogWriter:
+    def __init__(self, path, compress=True):
+        self._file = gzip.open(path, 'wb') if compress else open(path, 'wb')
+        self._file.write(MAGIC + bytes([VERSION]))
+
+    def write(self, game_record):
+        data = encode(game_record)
+        self._file.write(_FRAME_LENGTH.pack(len(data)))
+        self._file.write(data)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _open_log(path):
+    # compressed or not is detected from the gzip magic number, so readers don't have to know
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == b'\x1f\x8b'
+    return gzip.open(path, 'rb') if compressed else open(path, 'rb')
+
+
+def read_frames(path):
+    """Yields the bytes of each game in the log at path (for decode), in order, reading one frame at a time."""
+    with _open_log(path) as f:
+        header = f.read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"'{path}' isn't a game log")
+        if len(header) <= len(MAGIC):
+            raise ValueError(f"'{path}' ends before its version")
+        if header[len(MAGIC)] != VERSION:
+            raise ValueError(f"'{path}' is game log version {header[len(MAGIC)]}, expected {VERSION}")
+
+        while True:
+            length_bytes = f.read(_FRAME_LENGTH.size)
+            if not length_bytes:
+                return
+            data = b''
+            if len(length_bytes) == _FRAME_LENGTH.size:
+                (length,) = _FRAME_LENGTH.unpack(length_bytes)
+                data = f.read(length)
+            if len(length_bytes) != _FRAME_LENGTH.size or len(data) != length:
+                raise ValueError(f"'{path}' ends partway through a game")
+            yield data
+
+
+def read_games(path):
+    """Yields each GameRecord in the log at path, in order, reading one frame at a time."""
+    for data in read_frames(path):
+        yield decode(data)
@@ -0,0 +1,61 @@
+import time
+
+# Timers and counters for finding where the time goes in simulations. Game takes an optional Metrics (and hands it to
+# its players); when there isn't one, everything below is skipped behind an 'is not None' check, so turning metrics
+# off costs a comparison per phase. A Metrics keeps adding up across every game it's given to, and snapshot() turns
+# it into a plain dict (easy to print, compare, or dump as JSON).
+#
+# Timers use the monotonic, high resolution perf_counter_ns clock and are started and stopped explicitly rather than
+# with a context manager, which keeps the overhead when metrics are on to a couple of function calls:
+#
+#     start = metrics.start()
+#     ...
+#     metrics.stop('deal', start)
+
+# phases Game times, in the order they happen each deal
+PHASES = ('deal', 'discard', 'cut', 'pegging', 'hand scoring', 'crib scoring')
+
+
+class Metrics:
+    def __init__(self):
+        self.timers = {} # name -> [calls, total nanoseconds]
+        self.counters = {}
+
+    @staticmethod
+    def start():
+        return time.perf_counter_ns()
+
+    def stop(self, name, start):
+        """Adds the time since start (from start()) to the named timer."""
+        elapsed = time.perf_counter_ns() - start
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, elapsed]
+        else:
+            timer[0] += 1
+            timer[1] += elapsed
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        self.timers.clear()
+        self.counters.clear()
+
+    def snapshot(self):
+        """
+        Returns {'timers': {name: {'calls', 'total_s', 'mean_us'}}, 'counters': {name: count}} - a copy, so it doesn't
+        change as more games are played.
+        """
+        timers = {name: {'calls': calls, 'total_s': total / 1e9, 'mean_us': total / calls / 1000}
+                  for name, (calls, total) in self.timers.items()}
+        return {'timers': timers, 'counters': dict(self.counters)}
+
+    def format(self):
+        lines = []
+        total = sum(total for _, total in self.timers.values()) or 1
+        for name, (calls, phase_total) in sorted(self.timers.items(), key=lambda item: -item[1][1]):
+            lines.append(f'{name:<18}{calls:>10} calls{phase_total / 1e9:>10.3f} s{phase_total / calls / 1000:>10.1f} us/call{phase_total / total:>8.1%}')
+        for name, count in sorted(self.counters.items()):
+            lines.append(f'{name:<18}{count:>10}')
+        return '\n'.join(lines)
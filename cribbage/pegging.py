@@ -0,0 +1,262 @@
+import math
+
+import cards
+
+# A search engine for choosing pegging ('the play') cards. It follows the same rules as Game.do_play_loop - whose turn
+# it is, goes, the point for the last card, resetting at 31 - and scores plays the same way Hand.score_pegging does.
+#
+# We know our own cards but not the opponent's, so it's an expectimax search: at our turns we take the best card, and at
+# the opponent's turns we average over the cards they might play, treating every card we haven't seen as equally likely
+# to be in their hand - so they say go with the probability that none of their cards fit under 31, and otherwise play
+# any of the unseen cards that fit. That makes every opponent turn a chance node, where alpha-beta pruning doesn't
+# apply, so the search is kept fast instead by iterative deepening under a budget of evaluated states (deterministic,
+# unlike a time limit, so seeded simulations stay reproducible) and by a transposition table that's shared between the
+# iterations and between decisions. Suits don't matter in pegging, so states are keyed canonically on ranks: the count,
+# the ranks played since the count was last reset, our remaining ranks (sorted), how many of each rank we haven't seen,
+# how many cards the opponent holds, whose turn it is, and who has said go.
+#
+# Values are our points minus the opponent's points from here to the end of the play (or the depth limit).
+
+_NUM_RANKS = len(cards.RANKS)
+_VALUES = [min(rank_index + 1, 10) for rank_index in range(_NUM_RANKS)]
+_PAIR_POINTS = (0, 0, 2, 6, 12) # by number of cards of the same rank at the end of the sequence
+
+
+def peg_points(ranks, count):
+    """
+    Points for the last card in 'ranks' (the rank indexes played since the count was reset), where count is the total
+    including that card - the same as Hand(...).score_pegging(), but on ranks.
+    """
+    points = 2 if count == 15 else 0
+
+    last_rank = ranks[-1]
+    same_rank = 1
+    for rank_index in reversed(ranks[:-1]):
+        if rank_index != last_rank:
+            break
+        same_rank += 1
+    points += _PAIR_POINTS[same_rank]
+
+    # like Hand._score_pegging_straights, start with the last three cards and keep adding cards while they're a run
+    run = 0
+    for num_cards in range(3, len(ranks) + 1):
+        last_cards = ranks[-num_cards:]
+        if len(set(last_cards)) == num_cards and max(last_cards) - min(last_cards) == num_cards - 1:
+            run = num_cards
+        else:
+            break
+
+    return points + run
+
+
+class PeggingState:
+    """
+    The cards played since the count was last reset, kept so each new card is scored in constant time: the running
+    count, how many cards at the end share the last card's rank, and the ranks played (runs are at most seven cards
+    long under 31, so looking for one checks a bounded window of ranks, tracked as a bitmask). Scores exactly the same
+    way Hand.score_pegging does, including looking for runs from the last three cards up and stopping at the first
+    length that isn't one.
+    """
+    __slots__ = ('count', 'ranks', 'same_rank')
+
+    def __init__(self, played_cards=()):
+        self.reset()
+        for card in played_cards:
+            self.play(card)
+
+    def reset(self):
+        self.count = 0
+        self.ranks = []
+        self.same_rank = 0
+
+    def fits(self, card):
+        return self.count + card.value <= 31
+
+    def play(self, card):
+        """Adds card to the play and returns the points it scores (fifteen, pairs, and runs - not the last card or 31)."""
+        ranks = self.ranks
+        rank_index = card.rank_index
+        self.same_rank = self.same_rank + 1 if ranks and ranks[-1] == rank_index else 1
+        ranks.append(rank_index)
+        self.count += card.value
+
+        points = 2 if self.count == 15 else 0
+        points += _PAIR_POINTS[self.same_rank]
+
+        if self.same_rank == 1 and len(ranks) >= 3:
+            # walk back from the last card, adding one card at a time - a repeated rank means no longer run is possible
+            seen = 1 << rank_index
+            low = high = rank_index
+            run = 0
+            for num_cards in range(2, len(ranks) + 1):
+                previous_rank = ranks[-num_cards]
+                if seen >> previous_rank & 1:
+                    break
+                seen |= 1 << previous_rank
+                if previous_rank < low:
+                    low = previous_rank
+                elif previous_rank > high:
+                    high = previous_rank
+                if num_cards >= 3:
+                    if high - low != num_cards - 1:
+                        break
+                    run = num_cards
+            points += run
+
+        return points
+
+
+class PeggingEngine:
+    def __init__(self, max_depth=16, max_nodes=200, max_table_size=500000):
+        """
+        max_depth is the most plays and goes to look ahead (16 covers any play to the end); max_nodes is the budget of
+        evaluated states per decision - the search goes one level deeper only while the next level is expected to fit
+        in the budget. The default keeps decisions to a few milliseconds.
+        """
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.max_table_size = max_table_size
+        self.table = {}
+        self.nodes = 0 # states evaluated (not found in the table), for tuning
+        self.depth_reached = 0 # depth of the last completed search
+        self.value = 0.0 # expected points ahead by the end of the play for the last card chosen
+        self._hit_depth_limit = False
+
+    def choose(self, my_cards, curr_play_cards, unseen_cards, opponent_card_count, opponent_said_go=False):
+        """
+        Returns the card from my_cards to play next. curr_play_cards are the cards played since the count was reset,
+        unseen_cards are the cards that might be in the opponent's hand, and opponent_card_count is how many cards they
+        still hold. At least one of my_cards has to fit under 31 (like Player.get_candidate_play_card).
+        """
+        count = sum(card.value for card in curr_play_cards)
+        ranks = tuple(card.rank_index for card in curr_play_cards)
+        mine = tuple(sorted(card.rank_index for card in my_cards))
+        unseen = [0] * _NUM_RANKS
+        for card in unseen_cards:
+            unseen[card.rank_index] += 1
+
+        if len(self.table) > self.max_table_size:
+            self.table.clear()
+
+        unseen = tuple(unseen)
+        start_nodes = self.nodes
+        for depth in range(1, self.max_depth + 1):
+            iteration_start_nodes = self.nodes
+            self._hit_depth_limit = False
+            best_rank, best_value = None, -math.inf
+            for rank_index in sorted(set(mine)):
+                value = self._play_value(count, ranks, mine, unseen, opponent_card_count, True, False, opponent_said_go, rank_index, depth)
+                if value is not None and value > best_value:
+                    best_rank, best_value = rank_index, value
+
+            if best_rank is None:
+                raise ValueError(f'None of {my_cards} can be played with the count at {count}')
+
+            self.depth_reached = depth
+            self.value = best_value
+            if not self._hit_depth_limit:
+                break # searched all the way to the end of the play
+            # going one deeper costs at least a few times this iteration (table hits make the shallow ones cheaper)
+            iteration_nodes = self.nodes - iteration_start_nodes
+            if (self.nodes - start_nodes) + 4 * iteration_nodes > self.max_nodes:
+                break
+
+        return next(card for card in my_cards if card.rank_index == best_rank)
+
+    def _play_value(self, count, ranks, mine, unseen, opp_n, my_turn, my_go, opp_go, rank_index, depth):
+        # value of the player whose turn it is playing a card of rank_index (None if it doesn't fit)
+        count += _VALUES[rank_index]
+        if count > 31:
+            return None
+        ranks = ranks + (rank_index,)
+        points = peg_points(ranks, count)
+
+        if my_turn:
+            removed = mine.index(rank_index)
+            mine = mine[:removed] + mine[removed + 1:]
+        else:
+            unseen = unseen[:rank_index] + (unseen[rank_index] - 1,) + unseen[rank_index + 1:]
+            opp_n -= 1
+
+        if count == 31:
+            points += 2
+            value = self._value(0, (), mine, unseen, opp_n, not my_turn, False, False, depth - 1)
+        else:
+            # the other player is next, unless they've already said go
+            other_go = opp_go if my_turn else my_go
+            next_my_turn = my_turn if other_go else not my_turn
+            value = self._value(count, ranks, mine, unseen, opp_n, next_my_turn, my_go, opp_go, depth - 1)
+
+        return (points if my_turn else -points) + value
+
+    def _go_value(self, count, ranks, mine, unseen, opp_n, my_turn, my_go, opp_go, depth):
+        # the player whose turn it is says go
+        if my_turn:
+            my_go = True
+        else:
+            opp_go = True
+
+        if my_go and opp_go:
+            # both said go, so whoever said go last played the last card (like Game, which gives them the point)
+            return (1 if my_turn else -1) + self._value(0, (), mine, unseen, opp_n, not my_turn, False, False, depth - 1)
+
+        return self._value(count, ranks, mine, unseen, opp_n, not my_turn, my_go, opp_go, depth - 1)
+
+    def _value(self, count, ranks, mine, unseen, opp_n, my_turn, my_go, opp_go, depth):
+        if count == 0 and not mine and opp_n == 0:
+            return 0 # the play is over
+        if depth <= 0:
+            self._hit_depth_limit = True
+            return 0
+
+        key = (count, ranks, mine, unseen, opp_n, my_turn, my_go, opp_go)
+        stored = self.table.get(key)
+        if stored is not None:
+            stored_depth, stored_value, truncated = stored
+            # an exact value is good at any depth; one from a search cut off by the depth limit only stands in for a
+            # search at most as deep, and is still cut off, so the caller knows to look deeper
+            if not truncated:
+                return stored_value
+            if stored_depth >= depth:
+                self._hit_depth_limit = True
+                return stored_value
+        self.nodes += 1
+        outer_hit_depth_limit = self._hit_depth_limit
+        self._hit_depth_limit = False
+
+        if my_turn:
+            value = None
+            for rank_index in set(mine):
+                play_value = self._play_value(count, ranks, mine, unseen, opp_n, my_turn, my_go, opp_go, rank_index, depth)
+                if play_value is not None and (value is None or play_value > value):
+                    value = play_value
+            if value is None:
+                value = self._go_value(count, ranks, mine, unseen, opp_n, my_turn, my_go, opp_go, depth)
+        else:
+            value = self._opponent_value(count, ranks, mine, unseen, opp_n, my_go, opp_go, depth)
+
+        truncated = self._hit_depth_limit
+        self._hit_depth_limit = outer_hit_depth_limit or truncated
+        self.table[key] = (depth, value, truncated)
+        return value
+
+    def _opponent_value(self, count, ranks, mine, unseen, opp_n, my_go, opp_go, depth):
+        if opp_n == 0:
+            return self._go_value(count, ranks, mine, unseen, opp_n, False, my_go, opp_go, depth)
+
+        total_unseen = sum(unseen)
+        playable = [rank_index for rank_index in range(_NUM_RANKS) if unseen[rank_index] and _VALUES[rank_index] <= 31 - count]
+        playable_cards = sum(unseen[rank_index] for rank_index in playable)
+
+        # chance the opponent's opp_n cards, drawn from the unseen cards, include nothing that fits
+        go_probability = math.comb(total_unseen - playable_cards, opp_n) / math.comb(total_unseen, opp_n) if total_unseen >= opp_n else 1.0
+
+        value = 0.0
+        if go_probability > 0:
+            value += go_probability * self._go_value(count, ranks, mine, unseen, opp_n, False, my_go, opp_go, depth)
+        if go_probability < 1:
+            for rank_index in playable:
+                probability = (1 - go_probability) * unseen[rank_index] / playable_cards
+                value += probability * self._play_value(count, ranks, mine, unseen, opp_n, False, my_go, opp_go, rank_index, depth)
+
+        return value
@@ -0,0 +1,157 @@
+import collections
+import contextlib
+import sys
+
+import game
+import gamelog
+import workers
+
+# Replays recorded games (see gamelog) through Game, to re-check them after a change to the scoring code. The deck is
+# stacked so each deal and cut come out the way they were recorded, ReplayPlayers make the recorded discards and
+# plays, and every event the replayed game records - including every score, freshly worked out by the current code -
+# is compared with the log as it happens, stopping at the first difference. The replayed game scores everything with
+# Hand.score_breakdown and Hand.score_pegging (Game's score_with_hand), not the precomputed score table or
+# PeggingState, so a change to Hand's scoring shows up even though the table file hasn't been rebuilt.
+
+Divergence = collections.namedtuple('Divergence', ['game', 'event', 'expected', 'actual'])
+Divergence.__doc__ = """
+Where a replayed game first differed from its log: the game's position in the log, the event's position in the game
+(None for a difference in the final result), and the logged and replayed events (or results).
+"""
+
+
+class ReplayDivergence(Exception):
+    """Raised during a replay when the replayed game stops matching the recorded one."""
+    def __init__(self, event_index, expected, actual):
+        super().__init__(f'Event {event_index}: expected {expected}, got {actual}')
+        self.event_index = event_index
+        self.expected = expected
+        self.actual = actual
+
+
+class ReplayPlayer(game.Player):
+    # makes the recorded decisions, in order - decisions is a list of (event index, DISCARD or PLAY event)
+    def __init__(self, name, decisions, **kwargs):
+        super().__init__(name, **kwargs)
+        self._decisions = iter(decisions)
+
+    def _next_decision(self, kind):
+        event_index, event = next(self._decisions, (None, None))
+        if event is None or event.kind != kind:
+            raise ReplayDivergence(event_index, event, f'{self.name} asked for a {gamelog.KIND_NAMES[kind]}')
+        return event
+
+    def get_candidate_crib_cards(self):
+        return list(self._next_decision(gamelog.DISCARD).cards)
+
+    def get_candidate_play_card(self, curr_play_cards, all_play_cards):
+        return self._next_decision(gamelog.PLAY).cards[0]
+
+
+class _StackedShuffle:
+    # stands in for the random module as Game's rng: each 'shuffle' puts the recorded cards on top of the deck - for a
+    # deal, the crib player's six cards and then the other player's, and for a cut, the cut card
+    def __init__(self, events):
+        self._tops = []
+        for event in events:
+            if event.kind == gamelog.DEAL:
+                player_one_cards, player_two_cards = event.cards[:6], event.cards[6:]
+                self._tops.append(player_one_cards + player_two_cards if event.player == 0 else player_two_cards + player_one_cards)
+            elif event.kind == gamelog.CUT:
+                self._tops.append(event.cards)
+        self._tops = iter(self._tops)
+
+    def shuffle(self, deck):
+        top = next(self._tops, None)
+        if top is None:
+            raise ReplayDivergence(None, None, 'a deal or cut that was not recorded')
+        deck[:] = list(top) + [card for card in deck if card not in top]
+
+
+class _CheckingRecorder(gamelog.GameRecorder):
+    # compares each event with the logged one as it's recorded
+    def __init__(self, logged_events):
+        super().__init__()
+        self._logged_events = logged_events
+
+    def record(self, kind, player, cards=(), points=0):
+        event = gamelog.Event(kind, player, tuple(cards), points)
+        event_index = len(self.events)
+        expected = self._logged_events[event_index] if event_index < len(self._logged_events) else None
+        if event != expected:
+            raise ReplayDivergence(event_index, expected, event)
+        self.events.append(event)
+
+
+def replay(game_record):
+    """
+    Replays one recorded game, raising ReplayDivergence at the first event (or the final result) that doesn't match
+    the record. Returns the replayed GameResult.
+    """
+    events = game_record.events
+    decisions = ([], [])
+    for event_index, event in enumerate(events):
+        if event.kind in (gamelog.DISCARD, gamelog.PLAY):
+            decisions[event.player].append((event_index, event))
+
+    player_one = ReplayPlayer('Player 1', decisions[0], score_to_win=game_record.score_to_win)
+    player_two = ReplayPlayer('Player 2', decisions[1], score_to_win=game_record.score_to_win)
+    recorder = _CheckingRecorder(events)
+    replay_game = game.Game(player_one, player_two, score_to_win=game_record.score_to_win, verbose=False,
+                            rng=_StackedShuffle(events), recorder=recorder, score_with_hand=True)
+    if events and events[0].kind == gamelog.DEAL and events[0].player == 1:
+        replay_game.swap_crib_player()
+
+    result = replay_game.play()
+
+    if len(recorder.events) != len(events):
+        raise ReplayDivergence(len(recorder.events), events[len(recorder.events)], 'the end of the game')
+    if (result.winner, result.scores) != (game_record.winner, tuple(game_record.scores)):
+        raise ReplayDivergence(None, (game_record.winner, tuple(game_record.scores)), (result.winner, result.scores))
+    return result
+
+
+def find_divergence(game_record, game_index=0):
+    """Replays a game and returns a Divergence if it doesn't match its record, or None if it does."""
+    try:
+        replay(game_record)
+    except ReplayDivergence as e:
+        return Divergence(game_index, e.event_index, e.expected, e.actual)
+    return None
+
+
+def _verify_batch(batch):
+    # runs in a worker process: (index of the batch's first game, encoded games) -> first Divergence or None
+    first_game_index, frames = batch
+    for game_index, data in enumerate(frames, first_game_index):
+        divergence = find_divergence(gamelog.decode(data), game_index)
+        if divergence is not None:
+            return divergence
+    return None
+
+
+def verify_log(path, processes=None, batch_size=1000, max_pending_batches=None):
+    """
+    Replays every game in the log at path across a pool of processes (defaults to one per CPU; 0 replays in this
+    process) and returns the first Divergence in the log, or None if every game matches. Games are streamed from the
+    log in batches, with at most max_pending_batches (default: two per process) in flight, so memory stays flat, and
+    nothing more is started once a divergence turns up.
+    """
+    results = workers.run_batches(_verify_batch, gamelog.read_frames(path), (), processes, batch_size, max_pending_batches)
+    with contextlib.closing(results): # closing it early terminates the pool
+        for divergence in results:
+            if divergence is not None:
+                return divergence
+    return None
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print('Usage: python replay.py <game log>')
+        sys.exit(2)
+    divergence = verify_log(sys.argv[1])
+    if divergence is None:
+        print('Every game matches')
+    else:
+        print(f'Game {divergence.game} diverges at event {divergence.event}: expected {divergence.expected}, got {divergence.actual}')
+        sys.exit(1)
@@ -0,0 +1,79 @@
+import collections
+
+import canonical
+
+# A bounded, least recently used cache of hand and pegging scores, for when the same hands get scored again and again
+# - a bot trying a kept hand with each of the 46 possible cuts, or hands that come around again over many deals - and
+# the score tables don't cover what's being scored (hands of other sizes, cribs scored through Hand, pegging, or
+# variants). It's optional: cards.set_score_cache(ScoreCache(...)) puts one in front of Hand.score_breakdown (and so
+# Hand.score) and Hand.score_pegging, and cards.set_score_cache(None) takes it away again.
+#
+# Hand scores are keyed by canonical.canonical_key of the cards, cut, and crib flag, so hands that only differ by
+# suits or card order share an entry. Pegging scores only depend on the ranks of the cards played since the count was
+# reset, in the order they were played, so they're keyed by that tuple of ranks. Both kinds share the one size limit.
+#
+#     cache = score_cache.ScoreCache(max_size=50000)
+#     cards.set_score_cache(cache)
+#     ...
+#     print(cache.stats())
+
+DEFAULT_MAX_SIZE = 100000
+
+CacheStats = collections.namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'size', 'max_size', 'hit_rate'])
+
+
+class ScoreCache:
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError(f'The cache needs room for at least one entry, got max_size {max_size}')
+        self.max_size = max_size
+        self._entries = collections.OrderedDict() # least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def score_breakdown(self, hand, cut_card=None, crib=False):
+        """The hand's ScoreBreakdown, from the cache if a hand of the same canonical form has been scored."""
+        key = canonical.canonical_key(hand, cut_card, crib)
+        breakdown = self._get(key)
+        if breakdown is None:
+            breakdown = hand._score_breakdown(cut_card, crib)
+            self._put(key, breakdown)
+        return breakdown
+
+    def score_pegging_parts(self, hand):
+        """The (fifteen, pairs, straight) points for the last card in hand, which holds the cards played this count."""
+        key = tuple(card.rank_index for card in hand)
+        parts = self._get(key)
+        if parts is None:
+            parts = hand._score_pegging_parts()
+            self._put(key, parts)
+        return parts
+
+    def _get(self, key):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def _put(self, key, value):
+        self._entries[key] = value
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Empties the cache and resets the counters."""
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return CacheStats(self.hits, self.misses, self.evictions, len(self._entries), self.max_size,
+                          self.hits / lookups if lookups else 0.0)
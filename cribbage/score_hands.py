@@ -0,0 +1,156 @@
+import argparse
+import array
+import collections
+import sys
+
+import cards
+import score_table
+import tablefile
+import workers
+
+# Scores files of hands, one per line, like the ones other systems hand us:
+#
+#   5H 5S 5C JD / 5D        four (or any number of) cards, a slash, and the cut
+#   2C 3C 4C 5C             no slash, no cut
+#
+# Blank lines and lines starting with '#' are skipped. Input is streamed from a file or stdin in batches of lines, and
+# the batches are scored across a pool of processes with only a few in flight at a time (see workers), so memory stays
+# the same however big the input is. Results come out in input order, either as CSV (line number, hand, cut, score) or
+# as a tablefile of unsigned ints, one score per scored line (SCORES_VERSION, type code 'I'). Hands can have any number
+# of cards, and their scores grow fast - 40 cards can score over ten million - so a short wouldn't do, but even the
+# whole deck (872,562,670) fits in 32 bits.
+#
+# Cards are looked up by spec with cards.card_for_spec (the 52 entry table Card.from_spec uses), and four card hands
+# with a cut are scored with score_table (the same scores as Hand.score), anything else with Hand.score_breakdown.
+#
+# python score_hands.py hands.txt > scores.csv
+# python score_hands.py --format binary --output scores.bin --crib < cribs.txt
+
+SCORES_VERSION = 2 # 1 held unsigned shorts
+SCORES_TYPECODE = 'I'
+FORMATS = ('csv', 'binary')
+DEFAULT_BATCH_SIZE = 20000
+
+ScoredHand = collections.namedtuple('ScoredHand', ['line', 'hand_cards', 'cut_card', 'score'])
+
+
+def parse_line(line):
+    """Return (hand cards, cut card or None) for a line like '5H 5S 5C JD / 5D'. Raises ValueError for a bad line."""
+    hand_part, slash, cut_part = line.partition('/')
+    hand_specs = hand_part.split()
+    hand_cards = [cards.card_for_spec(spec) for spec in hand_specs]
+    if None in hand_cards:
+        raise ValueError(f"Invalid card '{hand_specs[hand_cards.index(None)]}'")
+    if not hand_cards:
+        raise ValueError('No cards in the hand')
+    cut_card = None
+    if slash:
+        cut_specs = cut_part.split()
+        if len(cut_specs) != 1:
+            raise ValueError(f'Expected one cut card after the slash, got {len(cut_specs)}')
+        cut_card = cards.card_for_spec(cut_specs[0])
+        if cut_card is None:
+            raise ValueError(f"Invalid card '{cut_specs[0]}'")
+    if len(set(hand_cards)) != len(hand_cards) or cut_card in hand_cards:
+        raise ValueError('The same card is in the line twice')
+    return hand_cards, cut_card
+
+
+def score(hand_cards, cut_card=None, crib=False):
+    if cut_card is not None and len(hand_cards) == 4:
+        return score_table.score(hand_cards, cut_card, crib)
+    return cards.Hand(hand_cards).score_breakdown(cut_card, crib).total
+
+
+def _score_batch(batch, crib):
+    # returns the ScoredHands for a batch of (first line number, lines)
+    first_line, lines = batch
+    scored = []
+    for line_number, line in enumerate(lines, first_line):
+        stripped = line.strip()
+        if not stripped or stripped[0] == '#':
+            continue
+        try:
+            hand_cards, cut_card = parse_line(stripped)
+        except ValueError as e:
+            raise ValueError(f'Line {line_number}: {e}') from None
+        scored.append(ScoredHand(line_number, hand_cards, cut_card, score(hand_cards, cut_card, crib)))
+    return scored
+
+
+def _format_batch(batch, crib, output_format):
+    # what the output file gets for a batch: CSV text or packed scores
+    scored = _score_batch(batch, crib)
+    if output_format == 'csv':
+        return ''.join(f"{hand.line},{' '.join(map(repr, hand.hand_cards))},{'' if hand.cut_card is None else repr(hand.cut_card)},{hand.score}\n"
+                       for hand in scored)
+    return array.array(SCORES_TYPECODE, [hand.score for hand in scored])
+
+
+def score_lines(lines, crib=False, processes=0, batch_size=DEFAULT_BATCH_SIZE, max_pending_batches=None):
+    """
+    Yields a ScoredHand for each hand in lines (any iterable of lines, like an open file), in order. processes is
+    the number of worker processes (0, the default, scores in this process; None is one per CPU). Raises ValueError,
+    naming the line, for the first line that isn't a valid hand.
+    """
+    for scored in workers.run_batches(_score_batch, lines, (crib,), processes, batch_size, max_pending_batches,
+                                      first_index=1):
+        yield from scored
+
+
+def score_file(lines, output, output_format='csv', crib=False, processes=None, batch_size=DEFAULT_BATCH_SIZE,
+               max_pending_batches=None):
+    """
+    Scores every hand in lines and writes the results to output - a text stream for 'csv', or a path for 'binary'
+    (a tablefile, which needs a seekable file). Returns the number of hands scored.
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f"Unknown format '{output_format}', expected one of {FORMATS}")
+    chunks = workers.run_batches(_format_batch, lines, (crib, output_format), processes, batch_size, max_pending_batches,
+                                 first_index=1)
+    num_hands = 0
+    if output_format == 'csv':
+        output.write('line,hand,cut,score\n')
+        for chunk in chunks:
+            output.write(chunk)
+            num_hands += chunk.count('\n')
+    else:
+        with tablefile.TableWriter(output, SCORES_TYPECODE, SCORES_VERSION) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+                num_hands += len(chunk)
+    return num_hands
+
+
+def read_scores(path):
+    """Return the scores in a binary output file, as a read-only memoryview."""
+    return tablefile.open_table(path, SCORES_TYPECODE, SCORES_VERSION)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Score a file of hands, one per line, like '5H 5S 5C JD / 5D'.")
+    parser.add_argument('input', nargs='?', default='-', help='file of hands (default: stdin)')
+    parser.add_argument('--output', '-o', help='output file (default: stdout, for CSV only)')
+    parser.add_argument('--format', choices=FORMATS, default='csv', help='CSV, or a tablefile of scores')
+    parser.add_argument('--crib', action='store_true', help='score the hands as cribs')
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (default: one per CPU; 0 for none)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='lines per batch')
+    args = parser.parse_args()
+    if args.format == 'binary' and args.output is None:
+        parser.error('--format binary needs --output, since the file has to be seekable')
+
+    input_file = sys.stdin if args.input == '-' else open(args.input)
+    output = args.output
+    if args.format == 'csv':
+        output = sys.stdout if args.output is None else open(args.output, 'w')
+    try:
+        num_hands = score_file(input_file, output, args.format, args.crib, args.processes, args.batch_size)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if args.format == 'csv' and output is not sys.stdout:
+            output.close()
+    print(f'Scored {num_hands} hands', file=sys.stderr)
@@ -0,0 +1,162 @@
+import itertools
+import math
+import random
+import sys
+from pathlib import Path
+
+import cards
+import tablefile
+
+# Precomputed scores for every four card hand plus cut, so simulations don't have to redo the combinatorics in
+# Hand.score for every hand. Fifteens, pairs, and runs only depend on the ranks of the five cards - not their suits
+# and not which of them is the cut - so instead of one entry per hand x cut (~13M entries for the hand and again for
+# the crib) I store one entry per multiset of five ranks, and add the flush and nobs points, which are the only
+# parts that care about suits and the cut, in constant time at lookup.
+#
+# To rebuild the table file from the current Hand.score code, run 'python score_table.py' from this directory, and
+# to check the shipped table against Hand.score, run 'python score_table.py --check'. The file is in tablefile's
+# format, the three tables one after the other, and is memory mapped the first time it's needed rather than read.
+
+NUM_CARDS = 5
+# 'stars and bars': the number of multisets of five ranks taken from 13 is C(13 + 5 - 1, 5) = 6188
+TABLE_SIZE = math.comb(len(cards.RANKS) + NUM_CARDS - 1, NUM_CARDS)
+CATEGORIES = ('Fifteens', 'Pairs', 'Runs')
+TABLE_PATH = Path(__file__).parent / 'tables' / 'score_table.bin'
+TABLE_VERSION = 1 # bump when the scoring in the tables changes
+
+# _RANK_KEY_TERMS[i][r] is C(r + i, i + 1), the contribution of the i-th smallest rank index r to the multiset's
+# position in the table (this is the combinatorial number system, after turning the sorted ranks r0 <= ... <= r4 into
+# the strictly increasing r0 + 0 < ... < r4 + 4)
+_RANK_KEY_TERMS = [[math.comb(r + i, i + 1) for r in range(len(cards.RANKS))] for i in range(NUM_CARDS)]
+
+_tables = None
+
+
+def rank_key(rank_indexes):
+    """Return the table position (0 to TABLE_SIZE - 1) for five rank indexes, in any order."""
+    r0, r1, r2, r3, r4 = sorted(rank_indexes)
+    t = _RANK_KEY_TERMS
+    return t[0][r0] + t[1][r1] + t[2][r2] + t[3][r3] + t[4][r4]
+
+
+def rank_multisets():
+    """Yield every multiset of five rank indexes, as sorted tuples, that can occur with one deck (so no five of a kind)."""
+    for ranks in itertools.combinations_with_replacement(range(len(cards.RANKS)), NUM_CARDS):
+        if ranks[0] != ranks[-1]:
+            yield ranks
+
+
+def _cards_for_ranks(ranks):
+    # any cards with the given ranks work for the rank-only categories - I give repeated ranks different suits so the
+    # cards are distinct, like they'd be when drawn from a real deck
+    seen = {}
+    hand_cards = []
+    for rank_index in ranks:
+        suit_index = seen.get(rank_index, 0)
+        seen[rank_index] = suit_index + 1
+        hand_cards.append(cards.Card(cards.RANKS[rank_index], cards.SUITS[suit_index]))
+    return hand_cards
+
+
+def build_tables():
+    """
+    Builds the fifteens, pairs, and runs tables using the same routines Hand.score uses, and returns them as a tuple
+    of bytearrays (one per category in CATEGORIES, each TABLE_SIZE long, indexed by rank_key).
+    """
+    tables = tuple(bytearray(TABLE_SIZE) for _ in CATEGORIES)
+    fifteens, pairs, runs = tables
+
+    for ranks in rank_multisets():
+        hand_cards = _cards_for_ranks(ranks)
+        key = rank_key(ranks)
+        fifteens[key] = 2 * cards.Hand._count_fifteens(hand_cards)
+        pairs[key] = cards.Hand._score_with_combinations(cards.Hand._score_pair, cards.Hand(hand_cards).combinations(size=2))
+        runs[key] = cards.Hand._score_all_straights(hand_cards, None)
+
+    return tables
+
+
+def write_tables(tables, path=TABLE_PATH):
+    tablefile.write(path, b''.join(tables), 'B', TABLE_VERSION)
+
+
+def read_tables(path=TABLE_PATH):
+    """Map the table file and return the (fifteens, pairs, runs) tables, as read-only memoryviews of it."""
+    data = tablefile.open_table(path, 'B', TABLE_VERSION, TABLE_SIZE * len(CATEGORIES), rebuild_command='python score_table.py')
+    return tuple(data[i * TABLE_SIZE:(i + 1) * TABLE_SIZE] for i in range(len(CATEGORIES)))
+
+
+def get_tables():
+    """Return the (fifteens, pairs, runs) tables, reading them from disk the first time they're needed."""
+    global _tables
+    if _tables is None:
+        _tables = read_tables()
+    return _tables
+
+
+def score(hand_cards, cut_card, crib=False):
+    """
+    Table-based equivalent of Hand(hand_cards).score(cut_card, crib) for a four card hand and a cut card - same
+    result, but without any combinations or printing.
+    """
+    fifteens, pairs, runs = get_tables()
+    c0, c1, c2, c3 = hand_cards
+    key = rank_key((c0.rank_index, c1.rank_index, c2.rank_index, c3.rank_index, cut_card.rank_index))
+
+    return fifteens[key] + pairs[key] + runs[key] + _score_flush(hand_cards, cut_card, crib) + _score_nobs(hand_cards, cut_card)
+
+
+def _score_flush(hand_cards, cut_card, crib):
+    suit = hand_cards[0].suit
+    if hand_cards[1].suit != suit or hand_cards[2].suit != suit or hand_cards[3].suit != suit:
+        return 0
+    if cut_card.suit == suit:
+        return 5
+    return 0 if crib else 4
+
+
+def _score_nobs(hand_cards, cut_card):
+    for card in hand_cards:
+        if card.rank == 'J' and card.suit == cut_card.suit:
+            return 1
+    return 0
+
+
+def check_tables(num_random_hands=10000, seed=0):
+    """
+    Compares the table-based score with Hand.score, for hands and cribs, using one hand for every possible set of five
+    ranks plus num_random_hands randomly dealt hands. Returns a list of (hand, cut, crib, expected, actual) mismatches.
+    """
+    rng = random.Random(seed)
+    samples = []
+    for ranks in rank_multisets():
+        five_cards = _cards_for_ranks(ranks)
+        rng.shuffle(five_cards)
+        samples.append(five_cards)
+
+    deck = list(cards.Deck())
+    for _ in range(num_random_hands):
+        samples.append(rng.sample(deck, NUM_CARDS))
+
+    mismatches = []
+    for five_cards in samples:
+        hand_cards, cut_card = five_cards[:4], five_cards[4]
+        for crib in (False, True):
+            expected = cards.Hand(list(hand_cards)).score(cut_card, crib=crib, print_output=False)
+            actual = score(hand_cards, cut_card, crib=crib)
+            if expected != actual:
+                mismatches.append((hand_cards, cut_card, crib, expected, actual))
+
+    return mismatches
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv[1:]:
+        mismatches = check_tables()
+        for hand_cards, cut_card, crib, expected, actual in mismatches[:20]:
+            print(f'Mismatch: hand {hand_cards}, cut {cut_card}, crib {crib}: Hand.score {expected}, table {actual}')
+        print(f'{len(mismatches)} mismatch(es)')
+        sys.exit(1 if mismatches else 0)
+    else:
+        write_tables(build_tables())
+        print(f'Wrote {TABLE_PATH}')
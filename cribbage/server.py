@@ -0,0 +1,306 @@
+import argparse
+import asyncio
+import random
+
+import cards
+import game
+import gamelog
+import pegging
+
+# Runs lots of games at once - people (or programs) connecting over TCP or a Unix socket, each playing a bot at their
+# own table - in one process, on one asyncio event loop, rather than one blocking UIPlayer per process or a thread per
+# table. AsyncGame is Game with an async play: it goes through the same steps (Game's _deal, _make_crib, and so on),
+# but awaits the players' decisions, so while one table waits for its player to send a card, the others keep going.
+#
+# The protocol is lines of text, with cards as specs like '5H'. The server tells the client what happens at its table:
+#
+#   DEAL <you|opponent> <your six cards>     a new deal - whose crib it is, and your cards
+#   CUT <card>
+#   PLAY <you|opponent> <card> <points>
+#   GO <you|opponent>
+#   LAST <you|opponent> <points>             the point(s) for the last card, or 31
+#   HAND <you|opponent> <points>
+#   CRIB <you|opponent> <points>
+#   RESULT <WIN|LOSS> <your score> <opponent's score>    the game's over; the server then closes the connection
+#
+# and asks for decisions, which the client answers with one line:
+#
+#   CHOOSE DISCARD                           answer with two cards, comma separated (like UIPlayer): '5H, 6S'
+#   CHOOSE PLAY <count> <your cards left>    answer with one card that fits under 31
+#   INVALID <reason>                         the last answer wasn't allowed - the CHOOSE comes again
+
+DEFAULT_OPPONENT = game.DiscardAdvisorPlayer
+
+
+class AsyncPlayer(game.Player):
+    """
+    A Player whose decisions can be awaited. get_crib_cards_async and get_play_card_async do the same validation as
+    get_crib_cards and get_play_card but await get_candidate_crib_cards_async and get_candidate_play_card_async, which
+    subclasses override to wait on something, like a client; by default they use the ordinary, synchronous
+    get_candidate_ methods, so mixing in any Player strategy (see async_player_class) gives a bot.
+    """
+    async def get_crib_cards_async(self):
+        while True:
+            crib_cards = await self.get_candidate_crib_cards_async()
+            if self._accept_crib_cards(crib_cards):
+                return crib_cards
+
+    async def get_play_card_async(self, curr_play_cards, all_play_cards):
+        curr_play_total = cards.Hand.get_value_total(curr_play_cards)
+        if self._must_say_go(curr_play_total):
+            return None
+        while True:
+            candidate_play_card = await self.get_candidate_play_card_async(curr_play_cards, all_play_cards)
+            if self._accept_play_card(candidate_play_card, curr_play_total):
+                return candidate_play_card
+
+    async def get_candidate_crib_cards_async(self):
+        return self.get_candidate_crib_cards()
+
+    async def get_candidate_play_card_async(self, curr_play_cards, all_play_cards):
+        return self.get_candidate_play_card(curr_play_cards, all_play_cards)
+
+
+def async_player_class(player_class):
+    """An AsyncPlayer subclass that decides like player_class (a Player subclass, like game.RandomPlayer)."""
+    return type(f'Async{player_class.__name__}', (AsyncPlayer, player_class), {})
+
+
+class AsyncGame(game.Game):
+    """A Game between two AsyncPlayers, played with 'await game.play()'. Headless, unless verbose is given."""
+    def __init__(self, player_one, player_two, verbose=False, **kwargs):
+        super().__init__(player_one, player_two, verbose=verbose, **kwargs)
+
+    async def play(self):
+        self._start_game()
+        try:
+            while True:
+                self._deal()
+
+                phase_start = self._start_phase()
+                crib_player_crib_cards = await self.crib_player.get_crib_cards_async()
+                non_crib_player_crib_cards = await self.non_crib_player.get_crib_cards_async()
+                self._make_crib(crib_player_crib_cards, non_crib_player_crib_cards, phase_start)
+
+                self._cut()
+                phase_start = self._start_phase()
+                await self.do_play_loop()
+                self._stop_phase('pegging', phase_start)
+
+                self._score_hands_and_crib()
+                self.swap_crib_player()
+                await asyncio.sleep(0) # between deals, let other tables run even if both players here are bots
+        except game.WinningScoreException:
+            pass
+
+        return self._finish_game()
+
+    async def do_play_loop(self):
+        # the same as Game.do_play_loop, awaiting each card
+        curr_play_cards, used_player_cards = [], []
+        pegging_state = pegging.PeggingState()
+        curr_play_player = self._start_play()
+
+        while self.player_one.remaining_cards_for_the_play or self.player_two.remaining_cards_for_the_play:
+            used_player_cards += used_player_cards + curr_play_cards
+            curr_play_cards = []
+            self._start_trip_to_31(pegging_state)
+
+            while True:
+                curr_play_card = await curr_play_player.get_play_card_async(curr_play_cards, used_player_cards)
+                self._score_play_card(curr_play_player, curr_play_card, curr_play_cards, pegging_state)
+                curr_play_player, trip_over = self._after_play_card(curr_play_player, pegging_state)
+                if trip_over:
+                    break
+
+
+class RemotePlayer(AsyncPlayer):
+    """A player on the other end of a connection, speaking the protocol at the top of this module."""
+    def __init__(self, name, reader, writer, **kwargs):
+        super().__init__(name, **kwargs)
+        self.reader = reader
+        self.writer = writer
+
+    def send(self, line):
+        # writes are buffered; they're flushed when we next wait for an answer (or when the connection's closed)
+        self.writer.write(f'{line}\n'.encode())
+
+    async def _ask(self, line):
+        self.send(line)
+        await self.writer.drain()
+        answer = await self.reader.readline()
+        if not answer:
+            raise ConnectionError(f'{self.name} disconnected')
+        return answer.decode().strip()
+
+    async def get_candidate_crib_cards_async(self):
+        specs = [spec.strip() for spec in (await self._ask('CHOOSE DISCARD')).split(',')]
+        specs += [''] * (2 - len(specs)) # too few cards fails validation below, like an invalid card
+        return [cards.card_for_spec(spec) for spec in specs[:2]]
+
+    async def get_candidate_play_card_async(self, curr_play_cards, all_play_cards):
+        count = cards.Hand.get_value_total(curr_play_cards)
+        remaining = ' '.join(repr(card) for card in self.remaining_cards_for_the_play)
+        return cards.card_for_spec(await self._ask(f'CHOOSE PLAY {count} {remaining}'))
+
+    def _reject_choice(self, describe, counter):
+        super()._reject_choice(describe, counter)
+        self.send(f'INVALID {describe()}')
+
+
+class _TableRecorder(gamelog.GameRecorder):
+    # tells the remote player what happens at their table, using the same calls Game makes to record a game
+    def __init__(self, remote_player_index, remote_player):
+        super().__init__()
+        self.remote_player_index = remote_player_index
+        self.remote_player = remote_player
+
+    def record(self, kind, player, cards=(), points=0):
+        who = 'you' if player == self.remote_player_index else 'opponent'
+        specs = ' '.join(repr(card) for card in cards)
+        if kind == gamelog.DEAL:
+            mine = cards[:6] if self.remote_player_index == 0 else cards[6:]
+            self.remote_player.send(f"DEAL {who} {' '.join(repr(card) for card in mine)}")
+        elif kind == gamelog.CUT:
+            self.remote_player.send(f'CUT {specs}')
+        elif kind == gamelog.PLAY:
+            self.remote_player.send(f'PLAY {who} {specs} {points}')
+        elif kind == gamelog.GO:
+            self.remote_player.send(f'GO {who}')
+        elif kind in (gamelog.LAST_CARD, gamelog.HAND, gamelog.CRIB):
+            name = {gamelog.LAST_CARD: 'LAST', gamelog.HAND: 'HAND', gamelog.CRIB: 'CRIB'}[kind]
+            self.remote_player.send(f'{name} {who} {points}')
+
+    def finish(self, result):
+        mine, theirs = result.scores[self.remote_player_index], result.scores[1 - self.remote_player_index]
+        self.remote_player.send(f"RESULT {'WIN' if result.winner == self.remote_player_index else 'LOSS'} {mine} {theirs}")
+        return None
+
+
+class TableServer:
+    """
+    Serves one game per connection, against a bot (a new opponent_class player - any Player subclass), all on the
+    running event loop. The client and bot alternate having the first crib from one table to the next.
+    """
+    def __init__(self, opponent_class=DEFAULT_OPPONENT, score_to_win=game.SCORE_TO_WIN, seed=None, metrics=None):
+        self.opponent_class = async_player_class(opponent_class)
+        self.score_to_win = score_to_win
+        self.rng = random.Random(seed)
+        self.metrics = metrics
+        self.tables_started = 0
+        self.tables_in_progress = 0
+        self.results = [] # (client won, client score, bot score), for each finished table
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=0, path=None, backlog=1024):
+        """Starts listening, on a Unix socket at path if there is one, or else TCP (port 0 picks a free port)."""
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self.handle_connection, path=path, backlog=backlog)
+        else:
+            self._server = await asyncio.start_server(self.handle_connection, host, port, backlog=backlog)
+        return self._server
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def handle_connection(self, reader, writer):
+        table_number = self.tables_started
+        self.tables_started += 1
+        self.tables_in_progress += 1
+        remote = RemotePlayer('Client', reader, writer, score_to_win=self.score_to_win)
+        bot = self.opponent_class('Bot', score_to_win=self.score_to_win)
+        remote_index = table_number % 2 # whoever's player one has the first crib
+        players = (remote, bot) if remote_index == 0 else (bot, remote)
+        table = AsyncGame(*players, score_to_win=self.score_to_win, rng=self.rng,
+                          recorder=_TableRecorder(remote_index, remote), metrics=self.metrics)
+        try:
+            result = await table.play()
+            self.results.append((result.winner == remote_index, result.scores[remote_index], result.scores[1 - remote_index]))
+        except ConnectionError:
+            pass # the client left - nothing to do but close the table
+        finally:
+            self.tables_in_progress -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def play_client(host='127.0.0.1', port=None, path=None, player_class=game.RandomPlayer, rng=None):
+    """
+    A test client: connects to a TableServer, plays one game choosing cards like player_class would (it keeps track
+    of its hand from what the server says), and returns (won, my score, opponent's score).
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    chooser = player_class('Client', verbose=False, rng=rng or random)
+    curr_play_cards = [] # since the count was last reset
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError('The server closed the connection before the game was over')
+            message, *fields = line.decode().split()
+            if message == 'DEAL':
+                chooser.crib = fields[0] == 'you'
+                chooser.hand = cards.Hand.from_specs(fields[1:])
+            elif message == 'CHOOSE' and fields[0] == 'DISCARD':
+                crib_cards = chooser.get_crib_cards()
+                writer.write(f"{', '.join(repr(card) for card in crib_cards)}\n".encode())
+            elif message == 'CHOOSE' and fields[0] == 'PLAY':
+                chooser.remaining_cards_for_the_play = [cards.Card.from_spec(spec) for spec in fields[2:]]
+                play_card = chooser.get_play_card(curr_play_cards, [])
+                writer.write(f'{play_card!r}\n'.encode())
+            elif message == 'PLAY':
+                curr_play_cards.append(cards.Card.from_spec(fields[1]))
+            elif message == 'LAST':
+                curr_play_cards = []
+            elif message == 'RESULT':
+                return fields[0] == 'WIN', int(fields[1]), int(fields[2])
+    finally:
+        writer.close()
+
+
+async def _load_test(num_tables, path=None, seed=0):
+    # a server and num_tables clients, all at once, on this event loop
+    server = TableServer(seed=seed)
+    await server.start(path=path)
+    port = None if path else server.port
+    rng = random.Random(seed)
+    results = await asyncio.gather(*(play_client(port=port, path=path, rng=random.Random(rng.getrandbits(64)))
+                                     for _ in range(num_tables)))
+    await server.close()
+    return results
+
+
+if __name__ == '__main__':
+    import time
+
+    parser = argparse.ArgumentParser(description='Serve cribbage tables, or check a server with lots of test clients.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--unix', metavar='PATH', help='listen on a Unix socket at PATH rather than TCP')
+    parser.add_argument('--load-test', type=int, metavar='TABLES', help='play this many concurrent test clients against an in-process server and exit')
+    args = parser.parse_args()
+
+    if args.load_test:
+        start = time.perf_counter()
+        results = asyncio.run(_load_test(args.load_test, path=args.unix))
+        elapsed = time.perf_counter() - start
+        print(f'{len(results)} concurrent tables finished in {elapsed:.1f} s; clients won {sum(won for won, _, _ in results)}')
+    else:
+        async def serve_forever():
+            server = TableServer()
+            listener = await server.start(args.host, args.port, args.unix)
+            print(f'Serving on {args.unix or f"{args.host}:{server.port}"}')
+            async with listener:
+                await listener.serve_forever()
+        asyncio.run(serve_forever())
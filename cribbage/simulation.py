@@ -0,0 +1,65 @@
+import random
+
+import game
+
+# Runs lots of headless games, for comparing strategies and collecting statistics.
+#
+# How fast: on one core, about 250 games a second for RandomPlayer against DiscardAdvisorPlayer (what running this
+# file plays) and about 450 for two RandomPlayers - not the tens of thousands a second I was originally after. Nothing
+# is printed or formatted, and scoring is already table lookups (see 'python simulation.py --metrics'), so what's left
+# is the game itself: a game is about 10 deals and 150 plays, each play going through a handful of Player and Game
+# methods, plus two shuffles a deal, and in plain Python that adds up to a few milliseconds. Getting to tens of
+# thousands would mean playing whole games as arrays (batch.py does that for scoring only) rather than through Game,
+# so for bulk numbers, run simulations in parallel (tournament.py) instead.
+
+
+def simulate(n_games, player_factories, seed=None, score_to_win=game.SCORE_TO_WIN, recorder=None, metrics=None, rng=None):
+    """
+    Plays n_games headless games and returns a list of their GameResults. player_factories is a pair of callables (like
+    Player subclasses) that are called with a name to create fresh players for each game - results refer to them as
+    player 0 and player 1, in that order. The players alternate having the first crib, and with a seed the games are
+    reproducible. Every game is recorded with 'recorder' (a gamelog.GameRecorder), and measured with 'metrics' (a
+    metrics.Metrics), if there are ones. 'rng' replaces the random.Random(seed) the games use, for something like a
+    batch.PermutationShuffler.
+    """
+    factory_one, factory_two = player_factories
+    rng = rng if rng is not None else random.Random(seed)
+    results = []
+
+    for game_number in range(n_games):
+        player_one = factory_one('Player 1')
+        player_two = factory_two('Player 2')
+        sim_game = game.Game(player_one, player_two, score_to_win=score_to_win, verbose=False, rng=rng, recorder=recorder,
+                             metrics=metrics)
+        if game_number % 2 == 1:
+            sim_game.swap_crib_player()
+        results.append(sim_game.play())
+
+    return results
+
+
+def summarize(results):
+    """Returns a dict with the number of games, wins for each player, and average deals per game."""
+    wins = [0, 0]
+    deals = 0
+    for result in results:
+        wins[result.winner] += 1
+        deals += result.deals
+    return {'games': len(results), 'wins': tuple(wins), 'average deals': deals / len(results) if results else 0}
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    import metrics
+
+    num_games = 2000
+    game_metrics = metrics.Metrics() if '--metrics' in sys.argv[1:] else None
+    start = time.perf_counter()
+    results = simulate(num_games, (game.RandomPlayer, game.DiscardAdvisorPlayer), seed=1, metrics=game_metrics)
+    elapsed = time.perf_counter() - start
+    print(summarize(results))
+    print(f'{num_games / elapsed:.0f} games per second')
+    if game_metrics is not None:
+        print(game_metrics.format())
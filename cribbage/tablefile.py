@@ -0,0 +1,126 @@
+import array
+import mmap
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+# The file format for the precomputed tables in tables/ (score_table, crib_table, win_table). Each file is a 32 byte
+# header followed by the table's values, little-endian, packed like an array.array of the header's type code:
+#
+#   magic 'CRIBTBL\0' | format version (u16) | table version (u16) | payload bytes (u64) | CRC-32 of payload (u32) |
+#   type code (1 byte) | 7 bytes padding
+#
+# The table version is the table module's own, bumped whenever what's in the table changes, so an out of date file
+# is caught at load instead of giving wrong answers. open_table maps the file read-only with mmap rather than reading
+# it, so the values aren't copied into each process: every process (forked tournament or replay workers included)
+# shares the same pages through the OS page cache, and NumPy can wrap them with np.frombuffer without a copy either.
+
+MAGIC = b'CRIBTBL\0'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<8sHHQIc7x')
+HEADER_SIZE = _HEADER.size
+
+
+class TableFileError(ValueError):
+    pass
+
+
+def write(path, values, typecode, version):
+    """
+    Writes values (an array.array, or any bytes-like object of already packed little-endian values) as a table file
+    with the given type code and table version.
+    """
+    with TableWriter(path, typecode, version) as writer:
+        writer.write(values)
+
+
+class TableWriter:
+    """
+    Writes a table file a chunk of values at a time, for tables that are produced as a stream (and may not fit in
+    memory). The header's size and checksum are filled in by close(), so the file has to be seekable.
+    """
+    def __init__(self, path, typecode, version):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.typecode = typecode
+        self.version = version
+        self.size = 0
+        self._checksum = 0
+        self._file = open(path, 'wb')
+        self._file.write(bytes(HEADER_SIZE)) # a placeholder until close()
+
+    def write(self, values):
+        """Appends values (an array.array of the writer's type code, or already packed little-endian bytes)."""
+        if sys.byteorder != 'little' and isinstance(values, array.array) and values.itemsize != 1:
+            values = array.array(self.typecode, values)
+            values.byteswap()
+        payload = memoryview(values).cast('B')
+        self._file.write(payload)
+        self.size += len(payload)
+        self._checksum = zlib.crc32(payload, self._checksum)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, self.version, self.size, self._checksum, self.typecode.encode()))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close() # leave the header blank, so a half written file can't be opened as a table
+
+
+def open_table(path, typecode, version, length=None, verify=True, rebuild_command=None):
+    """
+    Maps the table file at path and returns its values as a read-only memoryview with the given type code (or a
+    copy, on a big-endian machine). Raises TableFileError if the file isn't a table file, has a different type code,
+    version, or number of values (when length is given) than expected, or - when verify is set - fails its checksum;
+    the message says to run rebuild_command, if there is one.
+    """
+    try:
+        return _open_table(path, typecode, version, length, verify)
+    except TableFileError as e:
+        if rebuild_command is None:
+            raise
+        raise TableFileError(f"{e}; rebuild it with '{rebuild_command}'") from None
+
+
+def _open_table(path, typecode, version, length, verify):
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # an empty file can't be mapped
+            raise TableFileError(f"Table file '{path}' is empty")
+
+    data = memoryview(mapped)
+    if len(data) < HEADER_SIZE or bytes(data[:len(MAGIC)]) != MAGIC:
+        raise TableFileError(f"'{path}' isn't a table file")
+    magic, format_version, file_version, payload_size, checksum, file_typecode = _HEADER.unpack(data[:HEADER_SIZE])
+    file_typecode = file_typecode.decode()
+    if format_version != FORMAT_VERSION:
+        raise TableFileError(f"Table file '{path}' has format version {format_version}, expected {FORMAT_VERSION}")
+    if file_version != version:
+        raise TableFileError(f"Table file '{path}' has version {file_version}, expected {version}")
+    if file_typecode != typecode:
+        raise TableFileError(f"Table file '{path}' holds '{file_typecode}' values, expected '{typecode}'")
+    payload = data[HEADER_SIZE:]
+    if len(payload) != payload_size:
+        raise TableFileError(f"Table file '{path}' has {len(payload)} bytes of values, expected {payload_size} (truncated?)")
+    if verify and zlib.crc32(payload) != checksum:
+        raise TableFileError(f"Table file '{path}' fails its checksum")
+
+    values = payload.cast(typecode)
+    if length is not None and len(values) != length:
+        raise TableFileError(f"Table file '{path}' has {len(values)} values, expected {length}")
+    if sys.byteorder != 'little' and values.itemsize != 1:
+        swapped = array.array(typecode, values)
+        swapped.byteswap()
+        return memoryview(swapped)
+    return values
@@ -0,0 +1,163 @@
+import itertools
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import batch
+import cards
+import game
+
+
+def _ids(specs):
+    return [cards.Card.from_spec(spec).id for spec in specs]
+
+
+class TestScoreBatch:
+    def test_batch_scores_hands_with_separate_cuts(self):
+        hands = [_ids(['5H', '5S', '5C', 'JD']), _ids(['2S', '4C', '6D', '8H'])]
+        cuts = _ids(['5D', 'KH'])
+        assert batch.score_batch(hands, cuts).tolist() == [29, 0]
+
+    def test_batch_scores_five_card_rows_with_cut_last(self):
+        hands = [_ids(['AS', '2S', '6S', 'KS', 'QD'])]
+        assert batch.score_batch(hands).tolist() == [4]
+        assert batch.score_batch(hands, crib=True).tolist() == [0]
+
+    def test_batch_breakdown_splits_categories(self):
+        hands = [_ids(['5H', '5S', '5C', 'JD', '5D'])]
+        result = batch.score_batch(hands, breakdown=True)
+        assert result['fifteens'].tolist() == [16]
+        assert result['pairs'].tolist() == [12]
+        assert result['flush'].tolist() == [0]
+        assert result['runs'].tolist() == [0]
+        assert result['nobs'].tolist() == [1]
+        assert result['total'].tolist() == [29]
+
+    def test_batch_rejects_wrong_shapes(self):
+        with pytest.raises(ValueError):
+            batch.score_batch([[0, 1, 2]])
+        with pytest.raises(ValueError):
+            batch.score_batch([[0, 1, 2, 3]], [4, 5])
+
+    def test_batch_matches_hand_score_breakdown_across_every_hand_and_cut(self):
+        # every four card hand with every cut, checked against Hand.score_breakdown - not score_table, whose tables
+        # batch shares. Scoring 13 million hands through Hand would take minutes, but fifteens, pairs, and runs only
+        # depend on the five ranks, and flush and nobs only on the suits and which cards are jacks, so Hand scores one
+        # hand for each set of ranks and one for each pattern of suits and jacks, and every row is checked against those
+        rank_of = np.array([card.rank_index for card in cards.CARDS], dtype=np.intp)
+        suit_of = np.array([card.suit_index for card in cards.CARDS], dtype=np.intp)
+        jack = cards.RANKS.index('J')
+        num_ranks, num_suits = len(cards.RANKS), len(cards.SUITS)
+
+        card_for = {(c.rank_index, c.suit_index): c for c in cards.CARDS}
+
+        # five sorted ranks, as a base 13 number -> Hand's fifteens, pairs, and runs
+        rank_codes = num_ranks ** np.arange(5)
+        rank_expected = np.full((3, num_ranks ** 5), -1, dtype=np.intp)
+        for ranks in itertools.combinations_with_replacement(range(num_ranks), 5):
+            if max(ranks.count(rank_index) for rank_index in ranks) > num_suits:
+                continue
+            five_cards = [card_for[rank_index, ranks[:n].count(rank_index)] for n, rank_index in enumerate(ranks)]
+            breakdown = cards.Hand(five_cards[:4]).score_breakdown(five_cards[4])
+            rank_expected[:, int(np.dot(ranks, rank_codes))] = (breakdown.fifteens, breakdown.pairs, breakdown.runs)
+
+        # the suit of each card (hand then cut) and which of them are jacks -> Hand's flush and nobs, with the other
+        # cards given ranks that can't be jacks or collide
+        suit_codes = num_suits ** np.arange(5)
+        jack_codes = 2 ** np.arange(5) * num_suits ** 5
+        other_ranks = [0, 2, 4, 6, 8]
+        suit_expected = {crib: np.full(num_suits ** 5 * 2 ** 5, -1, dtype=np.intp) for crib in (False, True)}
+        for suits in itertools.product(range(num_suits), repeat=5):
+            for jacks in itertools.product((False, True), repeat=5):
+                five_cards = [card_for[jack if is_jack else other_ranks[n], suit] for n, (suit, is_jack) in enumerate(zip(suits, jacks))]
+                if len(set(five_cards)) < 5:
+                    continue # the same jack twice
+                code = int(np.dot(suits, suit_codes) + np.dot(jacks, jack_codes))
+                for crib in (False, True):
+                    breakdown = cards.Hand(five_cards[:4]).score_breakdown(five_cards[4], crib)
+                    suit_expected[crib][code] = breakdown.flush * 2 + breakdown.nobs # nobs is 0 or 1
+
+        all_hands = np.array(list(itertools.combinations(range(52), 4)), dtype=np.intp)
+        num_rows = 0
+        for cut_id in range(52):
+            hands = all_hands[~(all_hands == cut_id).any(axis=1)]
+            cuts = np.full(len(hands), cut_id, dtype=np.intp)
+            five_cards = np.column_stack((hands, cuts))
+            ranks = rank_of[five_cards]
+            rank_code = np.sort(ranks, axis=1) @ rank_codes
+            suit_code = suit_of[five_cards] @ suit_codes + (ranks == jack) @ jack_codes
+            for crib in (False, True):
+                result = batch.score_batch(hands, cuts, crib=crib, breakdown=True)
+                assert (result['fifteens'] == rank_expected[0][rank_code]).all()
+                assert (result['pairs'] == rank_expected[1][rank_code]).all()
+                assert (result['runs'] == rank_expected[2][rank_code]).all()
+                assert (result['flush'] * 2 + result['nobs'] == suit_expected[crib][suit_code]).all()
+                assert (result['total'] == result['fifteens'] + result['pairs'] + result['runs'] + result['flush'] + result['nobs']).all()
+            num_rows += len(hands)
+        assert num_rows == 52 * 249900 # every hand of the other 51 cards, for each cut
+
+    def test_batch_matches_hand_score_on_random_hands(self):
+        rng = random.Random(3)
+        deals = [rng.sample(cards.CARDS, 5) for _ in range(300)]
+        scores = batch.score_batch(batch.to_ids(deals), crib=True)
+        for deal, score in zip(deals, scores):
+            assert cards.Hand(deal[:4]).score(deal[4], crib=True) == score
+
+
+class TestScoreRuns:
+    def test_score_runs_counts_duplicate_runs(self):
+        hands = [_ids(['3H', '4S', '5C', '5D', '6H']), _ids(['AS', '2S', '3S', '3H', '3D']), _ids(['TS', 'JS', 'QS', 'KS', '2D']),
+                 _ids(['AS', '3S', '5S', '7S', '9D'])]
+        assert batch.score_runs(hands).tolist() == [8, 9, 4, 0]
+
+    def test_score_runs_matches_hand_scoring(self):
+        rng = random.Random(5)
+        hands = [rng.sample(cards.CARDS, 5) for _ in range(2000)]
+        expected = [cards.Hand._score_all_straights(hand[:4], hand[4]) for hand in hands]
+        assert batch.score_runs(batch.to_ids(hands)).tolist() == expected
+
+    def test_score_runs_handles_other_hand_sizes(self):
+        assert batch.score_runs([_ids(['4S', '5S', '6S', '7S', '8S', '9S'])]).tolist() == [6]
+        assert batch.score_runs([_ids(['4S', '5S'])]).tolist() == [0]
+
+
+class TestCountFifteens:
+    def test_count_fifteens_matches_hand(self):
+        rng = random.Random(6)
+        for num_cards in (2, 5, 6, 8):
+            hands = [rng.sample(cards.CARDS, num_cards) for _ in range(500)]
+            expected = [cards.Hand(hand).count_fifteens() for hand in hands]
+            assert batch.count_fifteens(batch.to_ids(hands)).tolist() == expected
+
+    def test_count_fifteens_known_hands(self):
+        assert batch.count_fifteens([_ids(['5H', '5S', '5C', 'JD', '5D'])]).tolist() == [8]
+        assert batch.count_fifteens([_ids(['AS', '2S', '3S', '4S'])]).tolist() == [0]
+
+
+class TestShuffles:
+    def test_shuffled_decks_are_seeded_permutations(self):
+        decks = batch.shuffled_decks(100, seed=1)
+        assert decks.shape == (100, 52)
+        assert (np.sort(decks, axis=1) == np.arange(52)).all()
+        assert (decks == batch.shuffled_decks(100, seed=1)).all()
+        assert len({tuple(deck) for deck in decks.tolist()}) == 100
+
+    def test_permutation_shuffler_shuffles_decks_in_batches(self):
+        shuffler = batch.PermutationShuffler(seed=2, batch_size=3)
+        deck = cards.Deck()
+        orders = []
+        for _ in range(5): # past the end of the first batch
+            deck.reset()
+            deck.shuffle(shuffler)
+            drawn = list(deck.draw_hand(12))
+            deck.shuffle(shuffler) # just the 40 cards left
+            assert sorted(drawn + list(deck)) == list(cards.CARDS)
+            orders.append(drawn)
+        assert len({tuple(order) for order in orders}) == 5
+
+    def test_permutation_shuffler_games_are_reproducible(self):
+        results = [game.Game(game.RandomPlayer('A'), game.RandomPlayer('B'), verbose=False, rng=batch.PermutationShuffler(seed=4)).play()
+                   for _ in range(2)]
+        assert results[0] == results[1]
@@ -0,0 +1,44 @@
+import benchmark
+
+import pytest
+
+
+class TestBenchmark:
+    def test_run_reports_every_benchmark(self):
+        results = benchmark.run(samples=2)
+        assert list(results) == list(benchmark.BENCHMARKS)
+        for result in results.values():
+            assert result.ops_per_second > 0
+            assert 0 < result.p50_us <= result.p90_us <= result.p99_us
+
+    def test_unknown_benchmark(self):
+        with pytest.raises(ValueError):
+            benchmark.run_benchmark('no_such_benchmark')
+
+    def test_corpora_are_fixed_by_seed(self):
+        assert benchmark._hand_corpus(10, seed=3)[0][1] == benchmark._hand_corpus(10, seed=3)[0][1]
+        for hand in benchmark._pegging_corpus(100, seed=3):
+            assert sum(card.value for card in hand) <= 31
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert benchmark._percentile(values, 0.5) == 50
+        assert benchmark._percentile(values, 0.99) == 99
+        assert benchmark._percentile([7], 0.9) == 7
+
+
+class TestBaseline:
+    def _result(self, name, ops_per_second):
+        return benchmark.BenchmarkResult(name, 100, ops_per_second, 1.0, 2.0, 3.0)
+
+    def test_baseline_round_trip(self, tmp_path):
+        results = {'game': self._result('game', 300.0)}
+        benchmark.save_baseline(results, tmp_path / 'baseline.json')
+        assert benchmark.load_baseline(tmp_path / 'baseline.json') == results
+
+    def test_find_regressions(self):
+        baseline = {'fast': self._result('fast', 1000.0), 'slow': self._result('slow', 1000.0)}
+        results = {'fast': self._result('fast', 950.0), 'slow': self._result('slow', 700.0), 'new': self._result('new', 1.0)}
+        regressions = benchmark.find_regressions(results, baseline, tolerance=0.1)
+        assert [regression.name for regression in regressions] == ['slow']
+        assert regressions[0].change == pytest.approx(-0.3)
@@ -0,0 +1,59 @@
+import itertools
+import random
+
+import canonical
+import cards
+import score_table
+
+
+def _cards(specs):
+    return [cards.Card.from_spec(spec) for spec in specs]
+
+
+def _relabel(card_list, suit_order):
+    # suit_order[i] is the suit index suit i becomes
+    return [cards.CARDS[card.rank_index * len(cards.SUITS) + suit_order[card.suit_index]] for card in card_list]
+
+
+class TestCanonicalKey:
+    def test_same_for_any_suit_permutation_and_card_order(self):
+        rng = random.Random(2)
+        for _ in range(50):
+            six = rng.sample(cards.CARDS, 6)
+            hand_cards, cut_card, dead_card = six[:4], six[4], six[5]
+            key = canonical.canonical_key(hand_cards, cut_card, dead_cards=[dead_card])
+            for suit_order in itertools.permutations(range(4)):
+                relabeled_hand = _relabel(hand_cards, suit_order)
+                rng.shuffle(relabeled_hand)
+                (relabeled_cut,), relabeled_dead = _relabel([cut_card], suit_order), _relabel([dead_card], suit_order)
+                assert canonical.canonical_key(relabeled_hand, relabeled_cut, dead_cards=relabeled_dead) == key
+
+    def test_keeps_flush_nobs_and_crib_apart(self):
+        sut = canonical.canonical_key
+        assert sut(_cards(['5H', '6H', '7H', '8H'])) != sut(_cards(['5H', '6H', '7H', '8S']))
+        assert sut(_cards(['5H', '6H', '7H', '8H']), cards.Card.from_spec('9H')) != sut(_cards(['5H', '6H', '7H', '8H']), cards.Card.from_spec('9S'))
+        assert sut(_cards(['JH', '2S', '3D', '4C']), cards.Card.from_spec('KH')) != sut(_cards(['JH', '2S', '3D', '4C']), cards.Card.from_spec('KS'))
+        assert sut(_cards(['JH', '2S', '3D', '4C']), crib=True) != sut(_cards(['JH', '2S', '3D', '4C']))
+        assert sut(_cards(['2H', '3H']), dead_cards=_cards(['4H'])) != sut(_cards(['2H', '3H']), dead_cards=_cards(['4S']))
+
+    def test_number_of_canonical_forms(self):
+        assert len({canonical.canonical_key(pair) for pair in itertools.combinations(cards.CARDS, 2)}) == 169
+        assert len({canonical.canonical_key(three) for three in itertools.combinations(cards.CARDS, 3)}) == 1755
+
+    def test_representative_has_the_same_key_and_score(self):
+        rng = random.Random(5)
+        for _ in range(200):
+            five = rng.sample(cards.CARDS, 5)
+            crib = rng.random() < 0.5
+            key = canonical.canonical_key(five[:4], five[4], crib)
+            hand_cards, cut_card, rep_crib, dead_cards = canonical.from_key(key)
+            assert canonical.canonical_key(hand_cards, cut_card, rep_crib, dead_cards) == key
+            assert (rep_crib, dead_cards) == (crib, [])
+            assert score_table.score(hand_cards, cut_card, crib) == score_table.score(five[:4], five[4], crib)
+
+    def test_canonicalize(self):
+        hand_cards, cut_card, crib, dead_cards = canonical.canonicalize(_cards(['5C', 'JC', '5D', '2C']), cards.Card.from_spec('KD'))
+        # the diamonds (with the cut) sort first and become spades, and the clubs become hearts
+        assert hand_cards == _cards(['2H', '5S', '5H', 'JH'])
+        assert cut_card == cards.Card.from_spec('KS')
+        assert crib is False and dead_cards == []
@@ -1,6 +1,10 @@
 import cards
 
+import copy
+import pickle
 import random # for shuffle
+
+import pytest
 # These are pytest tests - no imports are needed, so noting this here in case I'd otherwise forget :-)
 
 
@@ -18,6 +22,33 @@ class TestDeck:
         sut = cards.Deck()
         random.shuffle(sut)
 
+    def test_deck_only_shows_cards_not_drawn(self):
+        sut = cards.Deck()
+        sut.draw_hand(12)
+        assert len(sut) == 40
+        assert sut[0] == cards.Card.from_spec('KS')
+        assert sut[-1] == cards.Card.from_spec('KC')
+        assert list(sut[:2]) == cards.Hand.from_specs(['KS', 'AH'])._cards
+        with pytest.raises(IndexError):
+            sut[40]
+
+    def test_deck_shuffle_matches_random_shuffle(self):
+        # Deck.shuffle is quicker than random.shuffle(deck), but has to give the same order, before and after drawing
+        sut, expected = cards.Deck(), cards.Deck()
+        sut_rng, expected_rng = random.Random(7), random.Random(7)
+        for _ in range(2):
+            sut.shuffle(sut_rng)
+            expected_rng.shuffle(expected)
+            assert list(sut) == list(expected)
+            assert list(sut.draw_hand(12)) == list(expected.draw_hand(12))
+
+    def test_deck_reset_puts_cards_back_in_order(self):
+        sut = cards.Deck()
+        sut.shuffle(random.Random(1))
+        sut.draw_hand(13)
+        sut.reset()
+        assert list(sut) == list(cards.Deck())
+
 
 class TestHand:
     def test_can_create_hand_directly(self):
@@ -87,6 +118,36 @@ class TestHand:
         assert sut_hand_combos[1][0] == cards.Card.from_spec('8D')
         assert sut_hand_combos[2] == (cards.Card.from_spec('7H'), cards.Card.from_spec('8D'))
 
+    def test_hand_combinations_of_one_size(self):
+        sut = cards.Hand.from_specs(['2S', '4C', '6D', '8H'])
+        pairs = sut.combinations(cards.Card.from_spec('KH'), size=2)
+        assert len(pairs) == 10 and all(len(combo) == 2 for combo in pairs)
+        assert pairs == tuple(combo for combo in sut.combinations(cards.Card.from_spec('KH')) if len(combo) == 2)
+        assert sut.combinations(size=5) == ()
+
+    def test_hand_combinations_are_reused_until_the_hand_changes(self):
+        sut = cards.Hand.from_specs(['2S', '4C', '6D', '8H'])
+        cut_card = cards.Card.from_spec('KH')
+        assert sut.combinations(cut_card) is sut.combinations(cut_card)
+        assert sut.combinations(cut_card, size=3) is sut.combinations(cut_card, size=3)
+        assert len(sut.combinations()) == 15
+        sut.remove(cards.Card.from_spec('4C'))
+        assert len(sut.combinations()) == 7
+        sut[0] = cards.Card.from_spec('AS')
+        assert (cards.Card.from_spec('AS'),) in sut.combinations()
+
+    def test_hand_iter_combinations_is_lazy_and_matches(self):
+        sut = cards.Hand.from_specs(['2S', '4C', '6D', '8H'])
+        cut_card = cards.Card.from_spec('KH')
+        combos = sut.iter_combinations(cut_card)
+        assert next(combos) == (cards.Card.from_spec('2S'),)
+        assert tuple(sut.iter_combinations(cut_card)) == sut.combinations(cut_card)
+        assert list(sut.iter_combinations(sizes=[4])) == [tuple(sut)]
+
+    def test_card_for_spec(self):
+        assert cards.card_for_spec('5H') is cards.Card.from_spec('5H')
+        assert cards.card_for_spec('5X') is None
+
     def test_hand_can_be_shuffled(self):
         sut = cards.Hand.from_specs(['2S', '4C', '6D', '8H'])
         random.shuffle(sut)
@@ -108,6 +169,32 @@ class TestHand:
     # Note that below so far I'm testing the internal score routines, like _score_15, indirectly via score, by defining hands
     # that _only_ give scores from the specified internal score routine - maybe I should just test the score routines directly 
 
+    def test_score_breakdown_matches_combination_scoring(self, capsys):
+        # compare with scoring each combination, the way Hand.score used to, for hands of different sizes
+        rng = random.Random(4)
+        for _ in range(1000):
+            num_cards = rng.randint(1, 6)
+            hand_cards = rng.sample(list(cards.Deck()), num_cards + 1)
+            sut = cards.Hand(hand_cards[:num_cards])
+            cut_card = hand_cards[-1] if rng.random() < 0.8 else None
+            crib = rng.random() < 0.5
+            with_cut = sut.combinations(cut_card)
+            expected = (cards.Hand._score_with_combinations(cards.Hand._score_15, with_cut),
+                        cards.Hand._score_with_combinations(cards.Hand._score_pair, with_cut),
+                        cards.Hand._score_with_combinations(lambda c: cards.Hand._score_flush(c, cut_card, crib), sut.combinations()),
+                        cards.Hand._score_all_straights(list(sut), cut_card),
+                        cards.Hand._score_nobs(list(sut), cut_card))
+            breakdown = sut.score_breakdown(cut_card, crib)
+            assert breakdown == cards.ScoreBreakdown(*expected, sum(expected))
+        assert capsys.readouterr().out == ''
+
+    def test_score_prints_breakdown(self, capsys):
+        sut = cards.Hand.from_specs(['5H', '5S', '5C', 'JD'])
+        assert sut.score(cards.Card.from_spec('5D')) == 29
+        assert capsys.readouterr().out == '- Fifteens score(s) 16.\n- Pairs score(s) 12.\n- Nobs score(s) 1.\n'
+        assert sut.score(cards.Card.from_spec('5D'), print_output=False) == 29
+        assert capsys.readouterr().out == ''
+
     def test_hand_worth_zero_scores_zero(self):
         sut_nothing = cards.Hand.from_specs(['2S', '4C', '6D', '8H', 'KH'])
         assert sut_nothing.score() == 0
@@ -125,6 +212,11 @@ class TestHand:
         sut_15 = cards.Hand.from_specs(['7H'])
         assert sut_15.score(cards.Card.from_spec('8D')) == 2
 
+    def test_hand_counts_fifteens_like_combinations_for_any_size(self):
+        for specs in (['5H', '5S', '5C', '5D', 'JD', 'QH', 'KS', 'TC'], ['AS', '2S', '3S', '4S', '5S', '6S'], ['7H', '8S']):
+            sut = cards.Hand.from_specs(specs)
+            assert sut.count_fifteens() == sum(1 for combo in sut.combinations() if cards.Hand.get_value_total(combo) == 15)
+
     # flush
     def test_hand_scores_flush_without_matching_cut_card(self):
         sut_flush = cards.Hand.from_specs(['AS', '2S', '6S', 'KS'])
@@ -311,6 +403,12 @@ class TestCard:
     def test_can_compare_cards(self):
         assert cards.Card.from_spec('7H') == cards.Card.from_spec('7H')
 
+    def test_ordering_a_card_with_something_else_is_a_type_error(self):
+        with pytest.raises(TypeError):
+            cards.Card.from_spec('7H') < 7
+        with pytest.raises(TypeError):
+            sorted([cards.Card.from_spec('7H'), None])
+
     def test_can_sort_cards_with_numeric_ranks(self):
         sut_sort = sorted(cards.Hand.from_specs(['7S', '2S']))
         assert sut_sort[0] == cards.Card.from_spec('2S')
@@ -344,3 +442,32 @@ class TestCard:
         assert cards.Card.from_spec('QH').suit_index == 1
         assert cards.Card.from_spec('TD').suit_index == 2
         assert cards.Card.from_spec('JC').suit_index == 3
+
+    def test_cards_are_shared_instances(self):
+        assert cards.Card.from_spec('4H') is cards.Card('4', 'H')
+        assert cards.Deck()[0] is cards.Card.from_spec('AS')
+        assert cards.Hand.from_specs(['KC'])[0] is cards.Card.from_id(51)
+
+    def test_card_ids_are_unique_and_follow_card_order(self):
+        assert [c.id for c in cards.CARDS] == list(range(52))
+        assert sorted(cards.Deck()) == list(cards.CARDS)
+
+    def test_card_is_immutable(self):
+        sut = cards.Card.from_spec('4H')
+        with pytest.raises(AttributeError):
+            sut.rank = '5'
+
+    def test_card_survives_copy_and_pickle(self):
+        sut = cards.Card.from_spec('QD')
+        assert copy.deepcopy(sut) is sut
+        assert pickle.loads(pickle.dumps(sut)) is sut
+
+    def test_cards_can_be_used_as_dict_keys(self):
+        counts = {cards.Card.from_spec('7H'): 1}
+        assert counts[cards.Card('7', 'H')] == 1
+
+    def test_invalid_card_raises(self):
+        with pytest.raises(ValueError):
+            cards.Card('X', 'S')
+        with pytest.raises(ValueError):
+            cards.Card.from_spec('5Z')
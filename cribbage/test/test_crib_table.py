@@ -0,0 +1,44 @@
+import itertools
+import random
+
+import cards
+import crib_table
+import score_table
+
+import pytest
+
+
+class TestCribTable:
+    def test_canonical_pairs_cover_every_form_once(self):
+        keys = [crib_table.pair_key(*pair) for pair in crib_table.canonical_pairs()]
+        assert len(keys) == 169
+        assert len(set(keys)) == 169
+
+    def test_pair_key_ignores_order_and_specific_suits(self):
+        sut = crib_table.pair_key
+        assert sut(cards.Card.from_spec('5H'), cards.Card.from_spec('TH')) == sut(cards.Card.from_spec('TD'), cards.Card.from_spec('5D'))
+        assert sut(cards.Card.from_spec('5H'), cards.Card.from_spec('TS')) == sut(cards.Card.from_spec('5C'), cards.Card.from_spec('TD'))
+        assert sut(cards.Card.from_spec('5H'), cards.Card.from_spec('TH')) != sut(cards.Card.from_spec('5H'), cards.Card.from_spec('TS'))
+
+    def test_shipped_table_matches_rebuilt_table(self):
+        assert crib_table.read_table() == pytest.approx(crib_table.build_table())
+
+    def test_exact_value_matches_scoring_every_crib(self):
+        discards = (cards.Card.from_spec('JH'), cards.Card.from_spec('5H'))
+        remaining = [card for card in cards.CARDS if card not in discards]
+        total, count = 0, 0
+        for opponent_discards in itertools.combinations(remaining, 2):
+            for cut_card in remaining:
+                if cut_card not in opponent_discards:
+                    total += score_table.score([*discards, *opponent_discards], cut_card, crib=True)
+                    count += 1
+        assert crib_table.exact_crib_value(discards) == pytest.approx(total / count)
+
+    def test_table_agrees_with_monte_carlo_hand_score(self):
+        discards = (cards.Card.from_spec('5S'), cards.Card.from_spec('5H'))
+        estimate = crib_table.monte_carlo_crib_value(discards, 4000, random.Random(1))
+        assert crib_table.expected_crib_points(*discards) == pytest.approx(estimate, abs=0.4)
+
+    def test_pair_of_fives_beats_king_nine(self):
+        assert crib_table.expected_crib_points(cards.Card.from_spec('5S'), cards.Card.from_spec('5H')) > \
+               crib_table.expected_crib_points(cards.Card.from_spec('KS'), cards.Card.from_spec('9H'))
@@ -0,0 +1,58 @@
+import collections
+import random
+
+import cards
+import cuts
+
+import pytest
+
+
+def _cards(specs):
+    return [cards.Card.from_spec(spec) for spec in specs]
+
+
+class TestCutDistribution:
+    def test_distribution_matches_hand_score_for_every_cut(self):
+        rng = random.Random(3)
+        for _ in range(30):
+            six = rng.sample(cards.CARDS, 6)
+            hand_cards, dead_cards = six[:4], six[4:]
+            for crib in (False, True):
+                scores = collections.Counter(cards.Hand(list(hand_cards)).score(cut, crib=crib, print_output=False)
+                                             for cut in cards.CARDS if cut not in six)
+                distribution = cuts.cut_distribution(hand_cards, dead_cards, crib=crib)
+                assert distribution.num_cuts == 46
+                assert {points: count for points, count in enumerate(distribution.histogram) if count} == dict(scores)
+                assert distribution.mean == pytest.approx(sum(p * c for p, c in scores.items()) / 46)
+                assert (distribution.min, distribution.max) == (min(scores), max(scores))
+
+    def test_probabilities(self):
+        distribution = cuts.cut_distribution(_cards(['5H', '5S', '5C', 'JD']), _cards(['2C', '3C']))
+        assert distribution.max == 29
+        assert distribution.probability(29) == pytest.approx(1 / 46)
+        assert distribution.probability_at_least(0) == pytest.approx(1.0)
+        assert distribution.probability_at_least(29) == pytest.approx(1 / 46)
+        assert distribution.probability_at_least(30) == 0
+        assert distribution.probability(-1) == 0 and distribution.probability(30) == 0
+        assert distribution.variance > 0
+
+    def test_dead_cards_are_not_cut(self):
+        hand_cards = _cards(['5H', '5S', '5C', 'JD'])
+        without_dead = cuts.cut_distribution(hand_cards)
+        with_dead = cuts.cut_distribution(hand_cards, _cards(['5D']))
+        assert without_dead.num_cuts == 48 and with_dead.num_cuts == 47
+        assert without_dead.max == 29 and with_dead.max < 29
+
+    def test_equivalent_suits_share_a_cache_entry(self):
+        cuts.clear_cache()
+        first = cuts.cut_distribution(_cards(['5H', '6H', '7H', 'JS']), _cards(['2S', 'KD']))
+        # hearts -> clubs, spades -> diamonds, diamonds -> hearts
+        second = cuts.cut_distribution(_cards(['5C', '6C', '7C', 'JD']), _cards(['2D', 'KH']))
+        assert first is second
+        assert cuts.canonical_key(_cards(['5H', '6H', '7H', 'JS'])) != cuts.canonical_key(_cards(['5H', '6H', '7S', 'JS']))
+
+    def test_rejects_bad_hands(self):
+        with pytest.raises(ValueError):
+            cuts.cut_distribution(_cards(['5H', '5S', '5C']))
+        with pytest.raises(ValueError):
+            cuts.cut_distribution(_cards(['5H', '5S', '5C', 'JD']), _cards(['5H']))
@@ -0,0 +1,54 @@
+import cards
+import crib_table
+import discard
+
+import pytest
+
+
+def _brute_force_hand_mean(keep, held):
+    cuts = [card for card in cards.CARDS if card not in held]
+    return sum(cards.Hand(list(keep)).score(cut) for cut in cuts) / len(cuts)
+
+
+class TestDiscard:
+    def test_evaluates_all_fifteen_discards_best_first(self):
+        options = discard.evaluate_discards(cards.Hand.from_specs(['2S', '4C', '6D', '8H', 'TS', 'QC']))
+        assert len(options) == 15
+        assert len({tuple(o.discards) for o in options}) == 15
+        assert [o.mean for o in options] == sorted([o.mean for o in options], reverse=True)
+
+    def test_requires_six_cards(self):
+        with pytest.raises(ValueError):
+            discard.evaluate_discards(cards.Hand.from_specs(['2S', '4C', '6D', '8H']))
+
+    def test_keeps_the_obvious_hand(self):
+        best = discard.best_discard(cards.Hand.from_specs(['5H', '5S', '5C', 'JD', 'KC', '9S']))
+        assert sorted(best.discards) == sorted(cards.Hand.from_specs(['KC', '9S']))
+
+    def test_hand_mean_matches_hand_score_over_all_cuts(self):
+        held = cards.Hand.from_specs(['AS', '2S', '3S', 'JS', '7D', '7H'])
+        for option in discard.evaluate_discards(held, crib=True):
+            assert option.hand_mean == pytest.approx(_brute_force_hand_mean(option.keep, held))
+
+    def test_crib_contribution_sign_depends_on_whose_crib(self):
+        held = cards.Hand.from_specs(['5H', '5S', '8C', '9D', 'KC', 'QS'])
+        own = {tuple(o.discards): o for o in discard.evaluate_discards(held, crib=True)}
+        opponents = {tuple(o.discards): o for o in discard.evaluate_discards(held, crib=False)}
+        for discards, option in own.items():
+            assert option.crib_mean == pytest.approx(-opponents[discards].crib_mean)
+            assert option.hand_mean == pytest.approx(opponents[discards].hand_mean)
+        assert own[tuple(cards.Hand.from_specs(['5H', '5S']))].crib_mean > 2
+
+    def test_crib_contribution_comes_from_crib_table(self):
+        held = cards.Hand.from_specs(['5H', '5S', '8C', '9D', 'KC', 'QS'])
+        option = [o for o in discard.evaluate_discards(held, crib=True) if o.discards == list(held[:2])][0]
+        assert option.crib_mean == pytest.approx(crib_table.expected_crib_points(held[0], held[1]))
+        assert option.mean == pytest.approx(option.hand_mean + option.crib_mean)
+
+    def test_variance_matches_direct_calculation(self):
+        held = cards.Hand.from_specs(['JH', '4H', '6H', '9H', '5C', 'TD'])
+        cuts = [card for card in cards.CARDS if card not in held]
+        for option in discard.evaluate_discards(held):
+            values = [cards.Hand(list(option.keep)).score(cut) for cut in cuts]
+            mean = sum(values) / len(values)
+            assert option.variance == pytest.approx(sum((v - mean) ** 2 for v in values) / len(values))
@@ -2,6 +2,7 @@ import game
 import cards
 
 import pytest
+import random
 
 class TestGame:
     def test_game_has_players(self):
@@ -27,6 +28,13 @@ class TestGame:
         sut.cut_cards()
         assert isinstance(sut.cut_card, cards.Card)
 
+    def test_players_see_the_cut_card(self):
+        sut = game.Game(verbose=False)
+        sut._cut()
+        assert sut.player_one.cut_card == sut.player_two.cut_card == sut.cut_card
+        sut._deal()
+        assert sut.player_one.cut_card is None and sut.player_two.cut_card is None
+
     def test_score_cards_no_crib(self):
         sut = game.Game()
         sut.player_one.hand = cards.Hand.from_specs(['2C','3S','3C','8D'])
@@ -179,6 +187,12 @@ class TestPlayer:
         sut2 = game.Player(score_to_win = 1)
         assert sut2._score_to_win == 1
 
+    def test_game_gives_its_players_its_winning_score(self):
+        sut = game.Game(game.Player(), game.Player(score_to_win=50), score_to_win=30)
+        assert sut.player_one.score_to_win == sut.player_two.score_to_win == 30
+        with pytest.raises(game.WinningScoreException):
+            sut.player_two.score = 30
+
     def test_player_score_doesnt_throw_win_exception_without_winning_score(self):
         sut = game.Player()
         sut.score = 119
@@ -243,3 +257,93 @@ class TestPlayer:
         # is then non-deterministic means that on average it'll pass ~50% of the time even if there's no
         # check for invalid choices... not sure how to get around this (one answer is to test other parts
         # of the call chain, and I am already doing that)
+
+    def test_ui_player_asks_again_after_invalid_card_spec(self):
+        answers = iter(['XS', '2S'])
+        sut = game.UIPlayer(input_func = lambda x: next(answers))
+        sut.hand = cards.Deck().draw_hand(4)
+        sut.reset_eligible_play_cards()
+        play_card = sut.get_play_card([], [])
+        assert play_card == cards.Card.from_spec('2S')
+
+    def test_headless_player_doesnt_format_rejections(self):
+        def describe():
+            raise AssertionError('formatted a message nobody will see')
+        sut = game.Player(verbose=False)
+        sut._reject_choice(describe, 'invalid play cards')
+
+    def test_duplicate_crib_cards_are_rejected(self):
+        sut = game.Player(verbose=False)
+        sut.hand = cards.Hand.from_specs(['5H','5S','5C','JD','KC','9S'])
+        assert not sut._accept_crib_cards([cards.Card.from_spec('5H'), cards.Card.from_spec('5H')])
+        assert len(sut.hand) == 6
+
+    def test_discard_advisor_player_discards_best_two_cards(self):
+        sut = game.DiscardAdvisorPlayer()
+        sut.hand = cards.Hand.from_specs(['5H','5S','5C','JD','KC','9S'])
+        crib_cards = sut.get_crib_cards()
+        assert sorted(crib_cards) == sorted(cards.Hand.from_specs(['KC','9S']))
+        assert len(sut.hand) == 4
+
+
+    def test_expectimax_player_plays_legal_card(self):
+        sut = game.ExpectimaxPlayer()
+        sut.hand = cards.Hand.from_specs(['5H','2C','9D','KC'])
+        sut.reset_eligible_play_cards()
+        play_card = sut.get_play_card(cards.Hand.from_specs(['KS']), [])
+        assert play_card == cards.Card.from_spec('5H')
+        assert len(sut.remaining_cards_for_the_play) == 3
+
+    def test_expectimax_player_leaves_its_discards_out_of_unseen_cards(self):
+        sut = game.ExpectimaxPlayer()
+        sut.hand = cards.Hand.from_specs(['5H','5S','5C','JD','KC','9S'])
+        crib_cards = sut.get_crib_cards()
+        sut.reset_eligible_play_cards()
+        seen = {}
+        def choose(my_cards, curr_play_cards, unseen_cards, opponent_card_count, opponent_said_go):
+            seen['unseen'] = unseen_cards
+            return my_cards[0]
+        sut.pegging_engine.choose = choose
+        sut.get_play_card([], [])
+        assert len(seen['unseen']) == 52 - 6
+        assert not set(crib_cards) & set(seen['unseen'])
+
+    def test_expectimax_player_leaves_the_cut_card_out_of_unseen_cards(self):
+        sut = game.ExpectimaxPlayer()
+        sut.hand = cards.Hand.from_specs(['5H','2C','9D','KC'])
+        sut.cut_card = cards.Card.from_spec('AD')
+        sut.reset_eligible_play_cards()
+        seen = {}
+        def choose(my_cards, curr_play_cards, unseen_cards, opponent_card_count, opponent_said_go):
+            seen['unseen'] = unseen_cards
+            return my_cards[0]
+        sut.pegging_engine.choose = choose
+        sut.get_play_card([], [])
+        assert len(seen['unseen']) == 52 - 5
+        assert sut.cut_card not in seen['unseen']
+
+class TestGameResult:
+    def test_play_returns_result(self, capsys):
+        sut = game.Game(game.RandomPlayer('Alice'), game.RandomPlayer('Bob'), rng=random.Random(1))
+        result = sut.play()
+        assert result.winner in (0, 1)
+        assert result.scores == (sut.player_one.score, sut.player_two.score)
+        assert result.deals >= 1
+        assert 'GAME OVER' in capsys.readouterr().out
+
+    def test_headless_game_prints_nothing(self, capsys):
+        sut = game.Game(game.RandomPlayer('Alice'), game.RandomPlayer('Bob'), verbose=False, rng=random.Random(1))
+        sut.play()
+        assert capsys.readouterr().out == ''
+
+    def test_headless_game_gives_same_result_as_printed_game(self):
+        verbose_result = game.Game(game.RandomPlayer('Alice'), game.RandomPlayer('Bob'), rng=random.Random(2)).play()
+        headless_result = game.Game(game.RandomPlayer('Alice'), game.RandomPlayer('Bob'), verbose=False, rng=random.Random(2)).play()
+        assert verbose_result == headless_result
+
+    def test_update_player_score_records_category(self):
+        sut = game.Game()
+        sut.player_one.hand = cards.Hand.from_specs(['2C','3S','3C','8D'])
+        sut.update_player_score(sut.player_one)
+        assert sut.points[0]['hand'] == 2
+
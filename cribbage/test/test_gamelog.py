@@ -0,0 +1,92 @@
+import types
+
+import cards
+import game
+import gamelog
+import simulation
+
+import pytest
+
+
+def _record_games(n_games, seed=1):
+    recorder = gamelog.GameRecorder()
+    records = []
+    for result in simulation.simulate(n_games, (game.RandomPlayer, game.DiscardAdvisorPlayer), seed=seed, recorder=recorder):
+        records.append(gamelog.GameRecord(recorder.score_to_win, result.winner, result.scores, list(recorder.events)))
+    return records
+
+
+class TestGameRecorder:
+    def test_recorder_captures_every_step_of_a_game(self):
+        recorder = gamelog.GameRecorder()
+        result = game.Game(game.RandomPlayer('A'), game.RandomPlayer('B'), verbose=False, recorder=recorder).play()
+        kinds = {event.kind for event in recorder.events}
+        assert {gamelog.DEAL, gamelog.DISCARD, gamelog.CUT, gamelog.PLAY, gamelog.GO, gamelog.LAST_CARD, gamelog.HAND} <= kinds
+        assert sum(1 for event in recorder.events if event.kind == gamelog.DEAL) == result.deals
+
+    def test_recorded_points_add_up_to_final_scores(self):
+        recorder = gamelog.GameRecorder()
+        result = game.Game(game.RandomPlayer('A'), game.RandomPlayer('B'), verbose=False, recorder=recorder).play()
+        totals = [0, 0]
+        for event in recorder.events:
+            totals[event.player] += event.points
+        assert tuple(totals) == result.scores
+
+    def test_recorder_writes_finished_game(self, tmp_path):
+        path = tmp_path / 'games.log'
+        with gamelog.GameLogWriter(path) as writer:
+            simulation.simulate(2, (game.RandomPlayer, game.RandomPlayer), seed=3, recorder=gamelog.GameRecorder(writer))
+        assert len(list(gamelog.read_games(path))) == 2
+
+
+class TestGameLog:
+    def test_encode_uses_one_byte_per_card(self):
+        record = gamelog.GameRecord(120, 0, (121, 90), [gamelog.Event(gamelog.CUT, 1, (cards.Card.from_spec('5H'),), 0),
+                                                        gamelog.Event(gamelog.PLAY, 0, (cards.Card.from_spec('JD'),), 2)])
+        data = gamelog.encode(record)
+        assert len(data) == 9 + 3 + 4
+        assert gamelog.decode(data) == record
+
+    @pytest.mark.parametrize('compress', [False, True])
+    def test_games_round_trip_through_a_log_file(self, tmp_path, compress):
+        records = _record_games(3)
+        path = tmp_path / 'games.log'
+        with gamelog.GameLogWriter(path, compress=compress) as writer:
+            for record in records:
+                writer.write(record)
+        assert list(gamelog.read_games(path)) == records
+
+    def test_read_games_is_a_stream(self, tmp_path):
+        path = tmp_path / 'games.log'
+        with gamelog.GameLogWriter(path) as writer:
+            for record in _record_games(2):
+                writer.write(record)
+        games = gamelog.read_games(path)
+        assert isinstance(games, types.GeneratorType)
+        assert next(games).score_to_win == game.SCORE_TO_WIN
+
+    def test_read_games_rejects_other_files(self, tmp_path):
+        path = tmp_path / 'not_a.log'
+        path.write_bytes(b'hello there')
+        with pytest.raises(ValueError):
+            list(gamelog.read_games(path))
+
+    def test_read_games_rejects_truncated_log(self, tmp_path):
+        path = tmp_path / 'games.log'
+        with gamelog.GameLogWriter(path, compress=False) as writer:
+            writer.write(_record_games(1)[0])
+        path.write_bytes(path.read_bytes()[:-3])
+        with pytest.raises(ValueError):
+            list(gamelog.read_games(path))
+
+    def test_read_games_rejects_log_cut_off_in_its_header(self, tmp_path):
+        path = tmp_path / 'games.log'
+        path.write_bytes(gamelog.MAGIC)
+        with pytest.raises(ValueError, match='ends before its version'):
+            list(gamelog.read_games(path))
+
+    def test_read_games_of_log_with_no_games(self, tmp_path):
+        path = tmp_path / 'games.log'
+        with gamelog.GameLogWriter(path, compress=False):
+            pass
+        assert list(gamelog.read_games(path)) == []
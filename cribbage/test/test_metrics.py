@@ -0,0 +1,69 @@
+import cards
+import game
+import metrics
+import simulation
+
+
+class TestMetrics:
+    def test_timers_add_up_calls_and_time(self):
+        game_metrics = metrics.Metrics()
+        for _ in range(3):
+            game_metrics.stop('deal', game_metrics.start())
+        timers = game_metrics.snapshot()['timers']
+        assert timers['deal']['calls'] == 3
+        assert timers['deal']['total_s'] >= 0
+
+    def test_counters_and_reset(self):
+        game_metrics = metrics.Metrics()
+        game_metrics.count('goes')
+        game_metrics.count('goes', 2)
+        assert game_metrics.snapshot()['counters'] == {'goes': 3}
+        game_metrics.reset()
+        assert game_metrics.snapshot() == {'timers': {}, 'counters': {}}
+
+    def test_snapshot_is_a_copy(self):
+        game_metrics = metrics.Metrics()
+        game_metrics.count('plays')
+        snapshot = game_metrics.snapshot()
+        game_metrics.count('plays')
+        assert snapshot['counters']['plays'] == 1
+
+
+class TestGameMetrics:
+    def test_game_times_every_phase(self):
+        game_metrics = metrics.Metrics()
+        result = game.Game(game.RandomPlayer('A'), game.RandomPlayer('B'), verbose=False, metrics=game_metrics).play()
+        snapshot = game_metrics.snapshot()
+        assert set(snapshot['timers']) <= set(metrics.PHASES)
+        assert {'deal', 'discard', 'cut', 'pegging'} <= set(snapshot['timers'])
+        assert snapshot['timers']['deal']['calls'] == result.deals
+        assert snapshot['counters']['games'] == 1
+        assert snapshot['counters']['deals'] == result.deals
+
+    def test_metrics_build_up_across_games(self):
+        game_metrics = metrics.Metrics()
+        simulation.simulate(3, (game.RandomPlayer, game.RandomPlayer), seed=2, metrics=game_metrics)
+        counters = game_metrics.snapshot()['counters']
+        assert counters['games'] == 3
+        assert counters['plays'] > 0 and counters['goes'] > 0
+
+    def test_metrics_dont_change_results(self):
+        with_metrics = simulation.simulate(3, (game.RandomPlayer, game.RandomPlayer), seed=2, metrics=metrics.Metrics())
+        without_metrics = simulation.simulate(3, (game.RandomPlayer, game.RandomPlayer), seed=2)
+        assert with_metrics == without_metrics
+
+    def test_invalid_cards_are_counted(self):
+        class StubbornPlayer(game.Player):
+            # tries the king before giving in and playing the two
+            def get_candidate_play_card(self, curr_play_cards, all_play_cards):
+                self.attempts += 1
+                return cards.Card.from_spec('KS') if self.attempts == 1 else cards.Card.from_spec('2C')
+
+        game_metrics = metrics.Metrics()
+        player = StubbornPlayer('A', verbose=False)
+        player.attempts = 0
+        player.metrics = game_metrics
+        player.hand = cards.Hand.from_specs(['KS', '2C'])
+        player.reset_eligible_play_cards()
+        assert player.get_play_card(cards.Hand.from_specs(['TH', 'QD', '5S']), []) == cards.Card.from_spec('2C')
+        assert game_metrics.snapshot()['counters'] == {'invalid play cards': 1}
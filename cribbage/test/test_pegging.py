@@ -0,0 +1,123 @@
+import random
+
+import cards
+import pegging
+
+import pytest
+
+
+def _ranks(specs):
+    return tuple(cards.Card.from_spec(spec).rank_index for spec in specs)
+
+
+def _count(specs):
+    return sum(cards.Card.from_spec(spec).value for spec in specs)
+
+
+class TestPegPoints:
+    def test_peg_points_matches_score_pegging_on_random_sequences(self):
+        rng = random.Random(1)
+        for _ in range(500):
+            deck = list(cards.CARDS)
+            rng.shuffle(deck)
+            sequence, count = [], 0
+            for card in deck:
+                if count + card.value > 31:
+                    break
+                sequence.append(card)
+                count += card.value
+                ranks = tuple(c.rank_index for c in sequence)
+                assert pegging.peg_points(ranks, count) == cards.Hand(list(sequence)).score_pegging(print_output=False)
+
+    def test_peg_points_scores_pairs_runs_and_fifteen(self):
+        assert pegging.peg_points(_ranks(['5H', '5S', '5C']), 15) == 8
+        assert pegging.peg_points(_ranks(['KD', 'JS', 'QH']), 30) == 3
+
+
+class TestPeggingState:
+    @pytest.mark.parametrize('max_rank', ['K', '6'])
+    def test_state_matches_score_pegging_on_random_sequences(self, max_rank):
+        # with only low cards there are many more pairs and runs
+        rng = random.Random(2)
+        deck = [card for card in cards.CARDS if card.rank_index <= cards.RANKS.index(max_rank)]
+        for _ in range(1000):
+            rng.shuffle(deck)
+            state, sequence = pegging.PeggingState(), []
+            for card in deck:
+                if not state.fits(card):
+                    break
+                sequence.append(card)
+                assert state.play(card) == cards.Hand(list(sequence)).score_pegging(print_output=False)
+                assert state.count == sum(c.value for c in sequence)
+
+    def test_state_scores_runs_out_of_order(self):
+        state = pegging.PeggingState(cards.Hand.from_specs(['4S', '2H']))
+        assert state.play(cards.Card.from_spec('3C')) == 3
+        assert state.play(cards.Card.from_spec('AD')) == 4
+        assert state.count == 10
+
+    def test_state_reset(self):
+        state = pegging.PeggingState(cards.Hand.from_specs(['TS', 'JH', 'QC']))
+        assert not state.fits(cards.Card.from_spec('2D'))
+        state.reset()
+        assert state.count == 0
+        assert state.play(cards.Card.from_spec('KD')) == 0
+
+
+class TestPeggingEngine:
+    def _unseen(self, *held):
+        held = [cards.Card.from_spec(spec) for spec in held]
+        return [card for card in cards.CARDS if card not in held]
+
+    def test_engine_takes_fifteen(self):
+        sut = pegging.PeggingEngine()
+        my_cards = cards.Hand.from_specs(['5H', '2C', '9D'])
+        played = cards.Hand.from_specs(['KS'])
+        assert sut.choose(my_cards, played, self._unseen('5H', '2C', '9D', 'KS'), 3) == cards.Card.from_spec('5H')
+
+    def test_engine_takes_thirty_one(self):
+        sut = pegging.PeggingEngine()
+        my_cards = cards.Hand.from_specs(['AH', '3C'])
+        played = cards.Hand.from_specs(['KS', 'QS', '8D'])
+        assert sut.choose(my_cards, played, self._unseen('AH', '3C', 'KS', 'QS', '8D'), 2) == cards.Card.from_spec('3C')
+
+    def test_engine_avoids_leading_a_five(self):
+        # leading a five gives the opponent lots of ways to make fifteen
+        sut = pegging.PeggingEngine()
+        my_cards = cards.Hand.from_specs(['5H', '2C', '3D', '9S'])
+        assert sut.choose(my_cards, [], self._unseen('5H', '2C', '3D', '9S'), 4) != cards.Card.from_spec('5H')
+
+    def test_engine_plays_only_card_that_fits(self):
+        sut = pegging.PeggingEngine()
+        my_cards = cards.Hand.from_specs(['KH', '2C'])
+        played = cards.Hand.from_specs(['KS', 'QS', '8D'])
+        assert sut.choose(my_cards, played, self._unseen('KH', '2C', 'KS', 'QS', '8D'), 2) == cards.Card.from_spec('2C')
+
+    def test_engine_searches_to_end_of_play_when_it_can(self):
+        sut = pegging.PeggingEngine(max_nodes=100000)
+        my_cards = cards.Hand.from_specs(['KH'])
+        played = cards.Hand.from_specs(['4S', '6D'])
+        sut.choose(my_cards, played, self._unseen('KH', '4S', '6D'), 1)
+        assert sut._hit_depth_limit == False
+
+    def test_engine_searches_as_deep_with_a_warm_table(self):
+        # values left in the table by a search cut off by the depth limit mustn't make a later search stop early
+        my_cards = cards.Hand.from_specs(['5H', '2C', '3D'])
+        unseen = self._unseen('5H', '2C', '3D')
+        warm = pegging.PeggingEngine(max_nodes=50)
+        warm.choose(my_cards, [], unseen, 3)
+        warm.max_nodes = 10 ** 9
+        warm_card = warm.choose(my_cards, [], unseen, 3)
+        cold = pegging.PeggingEngine(max_nodes=10 ** 9)
+        cold_card = cold.choose(my_cards, [], unseen, 3)
+        assert warm_card == cold_card
+        assert warm.depth_reached == cold.depth_reached
+        assert warm.value == pytest.approx(cold.value)
+        assert warm._hit_depth_limit == cold._hit_depth_limit == False
+
+    def test_engine_stays_within_node_budget(self):
+        sut = pegging.PeggingEngine(max_nodes=50)
+        my_cards = cards.Hand.from_specs(['5H', '2C', '3D', '9S'])
+        sut.choose(my_cards, [], self._unseen('5H', '2C', '3D', '9S'), 4)
+        assert sut.nodes <= 200
+        assert sut.depth_reached >= 1
@@ -0,0 +1,110 @@
+import cards
+import game
+import gamelog
+import replay
+import simulation
+
+import pytest
+
+
+def _write_log(path, n_games, seed=1):
+    with gamelog.GameLogWriter(path) as writer:
+        simulation.simulate(n_games, (game.RandomPlayer, game.DiscardAdvisorPlayer), seed=seed, recorder=gamelog.GameRecorder(writer))
+
+
+def _change_points(game_record, kind):
+    # a copy of the record with the points for the first event of kind changed, as if the scoring had changed
+    events = list(game_record.events)
+    event_index = next(i for i, event in enumerate(events) if event.kind == kind)
+    events[event_index] = events[event_index]._replace(points=events[event_index].points + 1)
+    return game_record._replace(events=events), event_index
+
+
+class TestReplay:
+    def test_recorded_games_replay_exactly(self, tmp_path):
+        path = tmp_path / 'games.log'
+        _write_log(path, 4)
+        for game_record in gamelog.read_games(path):
+            result = replay.replay(game_record)
+            assert (result.winner, result.scores) == (game_record.winner, game_record.scores)
+
+    def test_game_with_second_player_as_first_crib_replays(self, tmp_path):
+        path = tmp_path / 'games.log'
+        _write_log(path, 2)
+        second_game = list(gamelog.read_games(path))[1]
+        assert second_game.events[0].player == 1
+        assert replay.find_divergence(second_game) is None
+
+    @pytest.mark.parametrize('kind', [gamelog.PLAY, gamelog.HAND, gamelog.CRIB])
+    def test_changed_score_is_found_at_its_event(self, tmp_path, kind):
+        path = tmp_path / 'games.log'
+        _write_log(path, 1)
+        game_record, event_index = _change_points(next(gamelog.read_games(path)), kind)
+        divergence = replay.find_divergence(game_record, game_index=7)
+        assert divergence.game == 7
+        assert divergence.event == event_index
+        assert divergence.expected == game_record.events[event_index]
+        assert divergence.actual.points == game_record.events[event_index].points - 1
+
+    def test_changed_hand_scoring_is_found(self, tmp_path, monkeypatch):
+        path = tmp_path / 'games.log'
+        _write_log(path, 3)
+        assert replay.verify_log(path, processes=0) is None
+        score_breakdown = cards.Hand._score_breakdown
+        monkeypatch.setattr(cards.Hand, '_score_breakdown',
+                            lambda hand, cut_card, crib: score_breakdown(hand, cut_card, crib)._replace(total=score_breakdown(hand, cut_card, crib).total + 1))
+        divergence = replay.verify_log(path, processes=0)
+        assert divergence is not None
+        assert divergence.expected.kind == gamelog.HAND
+        assert divergence.actual.points == divergence.expected.points + 1
+
+    def test_changed_pegging_scoring_is_found(self, tmp_path, monkeypatch):
+        path = tmp_path / 'games.log'
+        _write_log(path, 3)
+        monkeypatch.setattr(cards.Hand, '_score_pegging_parts', lambda hand: (9, 9, 9))
+        divergence = replay.verify_log(path, processes=0)
+        assert divergence is not None
+        assert divergence.expected.kind == gamelog.PLAY
+        assert divergence.actual.points == 27
+
+    def test_changed_result_is_found(self, tmp_path):
+        path = tmp_path / 'games.log'
+        _write_log(path, 1)
+        game_record = next(gamelog.read_games(path))
+        game_record = game_record._replace(scores=(game_record.scores[1], game_record.scores[0]))
+        divergence = replay.find_divergence(game_record)
+        assert divergence.event is None
+
+    def test_truncated_record_diverges(self, tmp_path):
+        path = tmp_path / 'games.log'
+        _write_log(path, 1)
+        game_record = next(gamelog.read_games(path))
+        game_record = game_record._replace(events=game_record.events[:len(game_record.events) // 2])
+        assert replay.find_divergence(game_record) is not None
+
+
+class TestVerifyLog:
+    @pytest.mark.parametrize('processes', [0, 2])
+    def test_matching_log_verifies(self, tmp_path, processes):
+        path = tmp_path / 'games.log'
+        _write_log(path, 6)
+        assert replay.verify_log(path, processes=processes, batch_size=2) is None
+
+    @pytest.mark.parametrize('processes', [0, 2])
+    def test_first_divergence_in_log_is_reported(self, tmp_path, processes):
+        records = list(self._records(tmp_path, 6))
+        records[4], _ = _change_points(records[4], gamelog.HAND)
+        records[2], event_index = _change_points(records[2], gamelog.PLAY)
+        path = tmp_path / 'changed.log'
+        with gamelog.GameLogWriter(path) as writer:
+            for record in records:
+                writer.write(record)
+
+        divergence = replay.verify_log(path, processes=processes, batch_size=1, max_pending_batches=2)
+        assert (divergence.game, divergence.event) == (2, event_index)
+
+    @staticmethod
+    def _records(tmp_path, n_games):
+        path = tmp_path / 'games.log'
+        _write_log(path, n_games)
+        return gamelog.read_games(path)
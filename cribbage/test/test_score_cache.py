@@ -0,0 +1,74 @@
+import random
+
+import cards
+import score_cache
+
+import pytest
+
+
+@pytest.fixture
+def cache():
+    cache = score_cache.ScoreCache(max_size=1000)
+    previous = cards.set_score_cache(cache)
+    yield cache
+    cards.set_score_cache(previous)
+
+
+def _random_hands(num_hands, seed):
+    rng = random.Random(seed)
+    for _ in range(num_hands):
+        five = rng.sample(cards.CARDS, 5)
+        yield five[:4], five[4]
+
+
+class TestScoreCache:
+    def test_scores_are_the_same_with_the_cache(self, cache):
+        for hand_cards, cut_card in _random_hands(300, 1):
+            for crib in (False, True):
+                cached = cards.Hand(list(hand_cards)).score_breakdown(cut_card, crib)
+                assert cached == cards.Hand(list(hand_cards))._score_breakdown(cut_card, crib)
+                assert cards.Hand(list(hand_cards)).score(cut_card, crib, print_output=False) == cached.total
+
+    def test_pegging_scores_are_the_same_with_the_cache(self, cache):
+        rng = random.Random(2)
+        for _ in range(300):
+            played = rng.sample(cards.CARDS, rng.randint(1, 6))
+            hand = cards.Hand(played)
+            assert hand.score_pegging(print_output=False) == sum(hand._score_pegging_parts())
+        assert cards.Hand.from_specs(['4S', '5H', '6D']).score_pegging(print_output=False) == 5 # fifteen, run of 3
+
+    def test_suit_and_order_equivalent_hands_hit(self, cache):
+        cards.Hand.from_specs(['5H', '5S', 'JD', '6D']).score(cards.Card.from_spec('4D'), print_output=False)
+        cards.Hand.from_specs(['JC', '5D', '6C', '5H']).score(cards.Card.from_spec('4C'), print_output=False)
+        assert (cache.hits, cache.misses) == (1, 1)
+        cards.Hand.from_specs(['JC', '5D', '6C', '5H']).score(cards.Card.from_spec('4C'), crib=True, print_output=False)
+        assert (cache.hits, cache.misses) == (1, 2)
+        cards.Hand.from_specs(['5C', '5D', '6C', '5H']).score_pegging(print_output=False)
+        cards.Hand.from_specs(['5S', '5H', '6D', '5C']).score_pegging(print_output=False)
+        assert (cache.hits, cache.misses) == (2, 3)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = score_cache.ScoreCache(max_size=2)
+        first, second, third = (cards.Hand.from_specs(specs) for specs in (['AS', '2S'], ['AS', '3S'], ['AS', '4S']))
+        cache.score_pegging_parts(first)
+        cache.score_pegging_parts(second)
+        cache.score_pegging_parts(first) # now second is the least recently used
+        cache.score_pegging_parts(third)
+        assert cache.evictions == 1 and len(cache) == 2
+        cache.score_pegging_parts(first)
+        assert cache.hits == 2
+        cache.score_pegging_parts(second)
+        assert cache.stats() == score_cache.CacheStats(hits=2, misses=4, evictions=2, size=2, max_size=2, hit_rate=2 / 6)
+
+    def test_printing_still_works(self, cache, capsys):
+        hand = cards.Hand.from_specs(['5H', '5S', '5C', 'JD'])
+        assert hand.score(cards.Card.from_spec('5D')) == 29
+        assert hand.score(cards.Card.from_spec('5D')) == 29
+        assert capsys.readouterr().out.count('Fifteens score(s) 16') == 2
+
+    def test_clear_and_bad_size(self, cache):
+        cards.Hand.from_specs(['5H', '5S']).score()
+        cache.clear()
+        assert cache.stats() == score_cache.CacheStats(0, 0, 0, 0, 1000, 0.0)
+        with pytest.raises(ValueError):
+            score_cache.ScoreCache(max_size=0)
@@ -0,0 +1,81 @@
+import io
+import random
+
+import cards
+import score_hands
+
+import pytest
+
+
+def _line(hand_cards, cut_card=None):
+    return ' '.join(map(repr, hand_cards)) + ('' if cut_card is None else f' / {cut_card!r}')
+
+
+def _random_lines(num_lines, seed):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(num_lines):
+        dealt = rng.sample(cards.CARDS, rng.choice([4, 5, 5, 5, 6, 7]))
+        lines.append(_line(dealt[:-1], dealt[-1]) if rng.random() < 0.9 else _line(dealt))
+    return lines
+
+
+class TestParseLine:
+    def test_parses_hand_and_cut(self):
+        assert score_hands.parse_line('5H 5S 5C JD / 5D') == (cards.Hand.from_specs(['5H', '5S', '5C', 'JD'])._cards, cards.Card.from_spec('5D'))
+        assert score_hands.parse_line('5H 5S 5C JD/5D')[1] == cards.Card.from_spec('5D')
+        assert score_hands.parse_line('2C 3C 4C 5C') == (cards.Hand.from_specs(['2C', '3C', '4C', '5C'])._cards, None)
+
+    @pytest.mark.parametrize('line', ['5H 5S 5C XD / 5D', '5H 5S 5C JD /', '5H 5S 5C JD / 5D 6D', '/ 5D', '5H 5H 5C JD / 5D',
+                                      '5H 5S 5C JD / 5H', '5H 5S 5C JD / XX'])
+    def test_rejects_bad_lines(self, line):
+        with pytest.raises(ValueError):
+            score_hands.parse_line(line)
+
+
+class TestScoreLines:
+    def test_scores_match_hand_score(self):
+        lines = _random_lines(500, 1)
+        for crib in (False, True):
+            scored = list(score_hands.score_lines(lines, crib=crib, batch_size=64))
+            assert [hand.line for hand in scored] == list(range(1, 501))
+            for hand, line in zip(scored, lines):
+                hand_cards, cut_card = score_hands.parse_line(line)
+                assert hand.score == cards.Hand(hand_cards).score(cut_card, crib=crib, print_output=False)
+
+    def test_pool_keeps_input_order(self):
+        lines = _random_lines(300, 2)
+        in_process = list(score_hands.score_lines(lines, batch_size=32))
+        assert list(score_hands.score_lines(lines, processes=2, batch_size=32, max_pending_batches=3)) == in_process
+
+    def test_skips_blank_and_comment_lines(self):
+        scored = list(score_hands.score_lines(['# hands', '', '5H 5S 5C JD / 5D', '   ']))
+        assert [(hand.line, hand.score) for hand in scored] == [(3, 29)]
+
+    def test_bad_line_is_reported_with_its_number(self):
+        with pytest.raises(ValueError, match='Line 3: Invalid card'):
+            list(score_hands.score_lines(['5H 5S 5C JD / 5D', '2C 3C 4C 5C', '5H 5S 1C JD / 5D'], batch_size=2))
+
+
+class TestScoreFile:
+    def test_csv(self):
+        output = io.StringIO()
+        assert score_hands.score_file(io.StringIO('5H 5S 5C JD / 5D\n\n2C 3C 4C 5C\n'), output, processes=0) == 2
+        assert output.getvalue() == 'line,hand,cut,score\n1,5H 5S 5C JD,5D,29\n3,2C 3C 4C 5C,,8\n'
+
+    def test_binary(self, tmp_path):
+        lines = _random_lines(200, 3)
+        path = tmp_path / 'scores.bin'
+        assert score_hands.score_file(lines, path, 'binary', crib=True, processes=0, batch_size=50) == 200
+        assert list(score_hands.read_scores(path)) == [hand.score for hand in score_hands.score_lines(lines, crib=True)]
+
+    def test_binary_holds_scores_too_big_for_a_short(self, tmp_path):
+        lines = [_line(cards.CARDS[:40]), _line(cards.CARDS[:51], cards.CARDS[51])]
+        path = tmp_path / 'scores.bin'
+        assert score_hands.score_file(lines, path, 'binary', processes=0) == 2
+        assert list(score_hands.read_scores(path)) == [hand.score for hand in score_hands.score_lines(lines)]
+        assert max(score_hands.read_scores(path)) == 872562670
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            score_hands.score_file([], io.StringIO(), 'json')
@@ -0,0 +1,34 @@
+import cards
+import score_table
+
+
+class TestScoreTable:
+    def test_rank_key_covers_every_rank_multiset_once(self):
+        keys = [score_table.rank_key(ranks) for ranks in score_table.rank_multisets()]
+        assert len(keys) == len(set(keys))
+        assert min(keys) >= 0
+        assert max(keys) < score_table.TABLE_SIZE
+
+    def test_rank_key_ignores_order(self):
+        assert score_table.rank_key((12, 0, 4, 4, 7)) == score_table.rank_key((0, 4, 4, 7, 12))
+
+    def test_shipped_table_matches_rebuilt_table(self):
+        assert score_table.read_tables() == tuple(bytes(t) for t in score_table.build_tables())
+
+    def test_table_score_matches_hand_score_for_sample_hands(self):
+        assert score_table.check_tables(num_random_hands=500) == []
+
+    def test_table_scores_29_hand(self):
+        hand = cards.Hand.from_specs(['5H', '5S', '5C', 'JD'])
+        assert score_table.score(hand, cards.Card.from_spec('5D')) == 29
+
+    def test_table_scores_flush_only_in_crib_when_cut_matches(self):
+        hand = cards.Hand.from_specs(['AS', '2S', '6S', 'KS'])
+        assert score_table.score(hand, cards.Card.from_spec('QD')) == 4
+        assert score_table.score(hand, cards.Card.from_spec('QD'), crib=True) == 0
+        assert score_table.score(hand, cards.Card.from_spec('QS'), crib=True) == 5
+
+    def test_table_scores_nobs(self):
+        hand = cards.Hand.from_specs(['7D', 'JS', '3H', '4D'])
+        assert score_table.score(hand, cards.Card.from_spec('6S')) == 1
+        assert score_table.score(hand, cards.Card.from_spec('6D')) == 0
@@ -0,0 +1,97 @@
+import asyncio
+import random
+
+import game
+import server
+
+
+def _bot(player_class, name):
+    return server.async_player_class(player_class)(name)
+
+
+async def _start_server(**kwargs):
+    table_server = server.TableServer(seed=1)
+    await table_server.start(**kwargs)
+    return table_server
+
+
+class TestAsyncGame:
+    def test_async_game_plays_the_same_as_game(self):
+        sync_result = game.Game(game.RandomPlayer('A'), game.RandomPlayer('B'), verbose=False, rng=random.Random(3)).play()
+        async_game = server.AsyncGame(_bot(game.RandomPlayer, 'A'), _bot(game.RandomPlayer, 'B'), rng=random.Random(3))
+        assert asyncio.run(async_game.play()) == sync_result
+
+    def test_many_async_games_run_together(self):
+        async def play_all():
+            games = [server.AsyncGame(_bot(game.RandomPlayer, 'A'), _bot(game.DiscardAdvisorPlayer, 'B'), rng=random.Random(seed))
+                     for seed in range(20)]
+            return await asyncio.gather(*(async_game.play() for async_game in games))
+        results = asyncio.run(play_all())
+        assert len(results) == 20
+        assert all(max(result.scores) >= game.SCORE_TO_WIN for result in results)
+
+
+class TestTableServer:
+    def test_clients_play_concurrent_tables_over_tcp(self):
+        async def run():
+            table_server = await _start_server()
+            results = await asyncio.gather(*(server.play_client(port=table_server.port, rng=random.Random(seed)) for seed in range(20)))
+            await table_server.close()
+            return table_server, results
+        table_server, results = asyncio.run(run())
+        assert len(results) == 20
+        assert sorted(results) == sorted(table_server.results)
+        assert table_server.tables_in_progress == 0
+        for won, mine, theirs in results:
+            assert won == (mine > theirs)
+
+    def test_clients_play_over_unix_socket(self, tmp_path):
+        path = str(tmp_path / 'tables.sock')
+        async def run():
+            table_server = await _start_server(path=path)
+            results = await asyncio.gather(*(server.play_client(path=path) for _ in range(3)))
+            await table_server.close()
+            return results
+        assert len(asyncio.run(run())) == 3
+
+    def test_invalid_answer_is_asked_again(self):
+        async def run():
+            table_server = await _start_server()
+            reader, writer = await asyncio.open_connection('127.0.0.1', table_server.port)
+            lines = []
+            deal = (await reader.readline()).decode().split()
+            lines.append((await reader.readline()).decode().strip())
+            writer.write(b'XX, 5Q\n') # not cards
+            lines.append((await reader.readline()).decode().strip())
+            lines.append((await reader.readline()).decode().strip())
+            writer.write(f'{deal[2]}, {deal[3]}\n'.encode())
+            await writer.drain()
+            writer.close() # leave partway through the game
+            await asyncio.sleep(0.1)
+            await table_server.close()
+            return table_server, lines
+        table_server, lines = asyncio.run(run())
+        assert lines[0] == 'CHOOSE DISCARD'
+        assert lines[1].startswith('INVALID')
+        assert lines[2] == 'CHOOSE DISCARD'
+        assert table_server.tables_in_progress == 0
+        assert table_server.results == []
+
+    def test_duplicate_discard_is_asked_again(self):
+        async def run():
+            table_server = await _start_server()
+            reader, writer = await asyncio.open_connection('127.0.0.1', table_server.port)
+            deal = (await reader.readline()).decode().split()
+            assert (await reader.readline()).decode().strip() == 'CHOOSE DISCARD'
+            writer.write(f'{deal[2]}, {deal[2]}\n'.encode()) # the same card twice
+            lines = [(await reader.readline()).decode().strip(), (await reader.readline()).decode().strip()]
+            writer.write(f'{deal[2]}, {deal[3]}\n'.encode())
+            lines.append((await reader.readline()).decode().strip())
+            writer.close()
+            await asyncio.sleep(0.1)
+            await table_server.close()
+            return lines
+        lines = asyncio.run(run())
+        assert lines[0].startswith('INVALID')
+        assert lines[1] == 'CHOOSE DISCARD'
+        assert not lines[2].startswith('INVALID') # the second answer was accepted and the game went on
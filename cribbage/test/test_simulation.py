@@ -0,0 +1,34 @@
+import game
+import simulation
+
+
+class TestSimulation:
+    def test_simulate_plays_requested_number_of_games(self):
+        results = simulation.simulate(5, (game.RandomPlayer, game.RandomPlayer), seed=1)
+        assert len(results) == 5
+        for result in results:
+            assert result.scores[result.winner] >= game.SCORE_TO_WIN
+            assert result.scores[1 - result.winner] < game.SCORE_TO_WIN
+
+    def test_simulate_is_reproducible_with_seed(self):
+        factories = (game.RandomPlayer, game.DiscardAdvisorPlayer)
+        assert simulation.simulate(3, factories, seed=7) == simulation.simulate(3, factories, seed=7)
+
+    def test_simulate_points_by_category_add_up_to_scores(self):
+        for result in simulation.simulate(3, (game.RandomPlayer, game.RandomPlayer), seed=2):
+            assert sum(result.points[0].values()) == result.scores[0]
+            assert sum(result.points[1].values()) == result.scores[1]
+
+    def test_simulate_prints_nothing(self, capsys):
+        simulation.simulate(2, (game.RandomPlayer, game.DiscardAdvisorPlayer), seed=3)
+        assert capsys.readouterr().out == ''
+
+    def test_simulate_respects_score_to_win(self):
+        results = simulation.simulate(2, (game.RandomPlayer, game.RandomPlayer), seed=4, score_to_win=30)
+        assert all(result.scores[result.winner] >= 30 for result in results)
+
+    def test_summarize_counts_wins(self):
+        results = simulation.simulate(4, (game.RandomPlayer, game.RandomPlayer), seed=5)
+        summary = simulation.summarize(results)
+        assert summary['games'] == 4
+        assert sum(summary['wins']) == 4
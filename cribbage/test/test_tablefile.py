@@ -0,0 +1,74 @@
+import array
+
+import tablefile
+
+import pytest
+
+
+def _write(tmp_path, values=None, typecode='H', version=3):
+    path = tmp_path / 'table.bin'
+    tablefile.write(path, values if values is not None else array.array(typecode, range(100)), typecode, version)
+    return path
+
+
+class TestTableFile:
+    def test_round_trip(self, tmp_path):
+        path = _write(tmp_path)
+        values = tablefile.open_table(path, 'H', 3, length=100)
+        assert list(values) == list(range(100))
+        assert values.readonly
+        assert path.stat().st_size == tablefile.HEADER_SIZE + 200
+
+    def test_bytes_and_floats(self, tmp_path):
+        assert bytes(tablefile.open_table(_write(tmp_path, b'\x01\x02\x03', 'B'), 'B', 3)) == b'\x01\x02\x03'
+        floats = tablefile.open_table(_write(tmp_path, array.array('f', [0.5, 1.25]), 'f'), 'f', 3)
+        assert list(floats) == [0.5, 1.25]
+
+    def test_rejects_mismatched_files(self, tmp_path):
+        path = _write(tmp_path)
+        with pytest.raises(tablefile.TableFileError, match='version 3, expected 4'):
+            tablefile.open_table(path, 'H', 4)
+        with pytest.raises(tablefile.TableFileError, match="'H' values"):
+            tablefile.open_table(path, 'f', 3)
+        with pytest.raises(tablefile.TableFileError, match='100 values, expected 99'):
+            tablefile.open_table(path, 'H', 3, length=99)
+
+    def test_rejects_damaged_files(self, tmp_path):
+        path = _write(tmp_path)
+        data = bytearray(path.read_bytes())
+        data[-1] ^= 0xFF
+        path.write_bytes(data)
+        with pytest.raises(tablefile.TableFileError, match='checksum'):
+            tablefile.open_table(path, 'H', 3)
+        assert tablefile.open_table(path, 'H', 3, verify=False)[-1] != 99
+
+        path.write_bytes(data[:-10])
+        with pytest.raises(tablefile.TableFileError, match='truncated'):
+            tablefile.open_table(path, 'H', 3)
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / 'raw.bin'
+        path.write_bytes(bytes(200))
+        with pytest.raises(tablefile.TableFileError, match="isn't a table file; rebuild it with 'python make.py'"):
+            tablefile.open_table(path, 'H', 1, rebuild_command='python make.py')
+        path.write_bytes(b'')
+        with pytest.raises(tablefile.TableFileError, match='empty'):
+            tablefile.open_table(path, 'H', 1)
+
+    def test_writer_streams_chunks(self, tmp_path):
+        path = tmp_path / 'streamed.bin'
+        with tablefile.TableWriter(path, 'H', 2) as writer:
+            for start in range(0, 1000, 100):
+                writer.write(array.array('H', range(start, start + 100)))
+        assert list(tablefile.open_table(path, 'H', 2, length=1000)) == list(range(1000))
+
+    def test_writer_leaves_no_table_after_an_error(self, tmp_path):
+        path = tmp_path / 'failed.bin'
+        try:
+            with tablefile.TableWriter(path, 'H', 2) as writer:
+                writer.write(array.array('H', range(10)))
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        with pytest.raises(tablefile.TableFileError, match="isn't a table file"):
+            tablefile.open_table(path, 'H', 2)
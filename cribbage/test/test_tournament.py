@@ -0,0 +1,40 @@
+import tournament
+
+import pytest
+
+
+class TestTournament:
+    def test_round_robin_pairs_each_strategy_once(self):
+        assert tournament.round_robin(['A', 'B', 'C']) == [('A', 'B'), ('A', 'C'), ('B', 'C')]
+
+    def test_gauntlet_pairs_challenger_with_others(self):
+        assert tournament.gauntlet('B', ['A', 'B', 'C']) == [('B', 'A'), ('B', 'C')]
+
+    def test_run_plays_all_games_in_batches(self):
+        matches = [('RandomPlayer', 'Player')]
+        totals = tournament.run(matches, 7, batch_size=3, seed=1, processes=0)
+        wins, games = totals[('RandomPlayer', 'Player')]
+        assert games == 7
+        assert 0 <= wins <= 7
+
+    def test_run_results_dont_depend_on_worker_count(self):
+        matches = tournament.round_robin(['Player', 'RandomPlayer'])
+        in_process = tournament.run(matches, 6, batch_size=2, seed=5, processes=0)
+        pooled = tournament.run(matches, 6, batch_size=2, seed=5, processes=2)
+        assert in_process == pooled
+
+    def test_run_rejects_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            tournament.run([('Player', 'NoSuchPlayer')], 1, processes=0)
+
+    def test_win_rate_interval_contains_rate(self):
+        rate, low, high = tournament.win_rate_interval(60, 100)
+        assert rate == 0.6
+        assert low < 0.6 < high
+        assert tournament.win_rate_interval(60, 100)[2] - low > tournament.win_rate_interval(600, 1000)[2] - tournament.win_rate_interval(600, 1000)[1]
+
+    def test_win_rate_matrix_shows_both_directions(self):
+        matrix = tournament.win_rate_matrix({('A', 'B'): (75, 100)})
+        assert 'A' in matrix and 'B' in matrix
+        assert '0.750' in matrix
+        assert '0.250' in matrix
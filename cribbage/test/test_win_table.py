@@ -0,0 +1,64 @@
+import win_table
+
+import pytest
+
+
+def _distributions(pegging, pone_hand, dealer_hand_and_crib):
+    return win_table.DealDistributions(pegging, pone_hand, dealer_hand_and_crib)
+
+
+class TestSolve:
+    def test_dealer_always_pegs_out_first(self):
+        # the dealer pegs 10 and the pone nothing, every deal, so whoever deals first wins a race to 10
+        dealer_wins = win_table.solve(_distributions({(0, 10): 1.0}, {0: 1.0}, {0: 1.0}), score_to_win=10)
+        assert all(value == pytest.approx(1.0) for row in dealer_wins for value in row)
+
+    def test_alternating_deals(self):
+        # one point for the dealer each deal: a dealer who needs n more points wins if they get there on their own deals first
+        dealer_wins = win_table.solve(_distributions({(0, 1): 1.0}, {0: 1.0}, {0: 1.0}), score_to_win=3)
+        assert dealer_wins[2][2] == pytest.approx(1.0)
+        assert dealer_wins[1][2] == pytest.approx(0.0) # the pone deals next and gets its last point first
+        assert dealer_wins[0][0] == pytest.approx(1.0) # 1-0, 1-1, 2-1, 2-2, 3
+
+    def test_both_out_during_pegging_is_half_a_win(self):
+        dealer_wins = win_table.solve(_distributions({(5, 5): 1.0}, {0: 1.0}, {0: 1.0}), score_to_win=5)
+        assert dealer_wins[0][0] == pytest.approx(0.5)
+
+    def test_rejects_pegging_without_the_last_card(self):
+        with pytest.raises(ValueError):
+            win_table.solve(_distributions({(0, 0): 1.0}, {0: 1.0}, {0: 1.0}), score_to_win=5)
+
+
+class TestShippedTable:
+    def test_probabilities_are_between_0_and_1(self):
+        for mine in range(0, win_table.SCORE_TO_WIN, 7):
+            for theirs in range(0, win_table.SCORE_TO_WIN, 7):
+                for my_crib in (True, False):
+                    assert 0 <= win_table.win_probability(mine, theirs, my_crib) <= 1
+
+    def test_more_points_are_better(self):
+        for theirs in range(0, win_table.SCORE_TO_WIN, 10):
+            for my_crib in (True, False):
+                values = [win_table.win_probability(mine, theirs, my_crib) for mine in range(win_table.SCORE_TO_WIN)]
+                assert all(lower <= higher + 1e-3 for lower, higher in zip(values, values[1:]))
+
+    def test_crib_is_an_advantage(self):
+        assert win_table.win_probability(0, 0, True) > 0.5
+        assert win_table.win_probability(0, 0, False) == pytest.approx(1 - win_table.win_probability(0, 0, True))
+
+    def test_finished_games(self):
+        assert win_table.win_probability(win_table.SCORE_TO_WIN, 50, False) == 1.0
+        assert win_table.win_probability(50, win_table.SCORE_TO_WIN, True) == 0.0
+
+    def test_read_table_rejects_wrong_size(self, tmp_path):
+        path = tmp_path / 'win_table.bin'
+        path.write_bytes(b'\0' * 10)
+        with pytest.raises(ValueError):
+            win_table.read_table(path)
+
+    def test_write_and_read_round_trip(self, tmp_path):
+        path = tmp_path / 'win_table.bin'
+        dealer_wins = [[(mine + theirs) / 300 for theirs in range(win_table.SCORE_TO_WIN)] for mine in range(win_table.SCORE_TO_WIN)]
+        win_table.write_table(dealer_wins, path)
+        table = win_table.read_table(path)
+        assert table[5 * win_table.SCORE_TO_WIN + 7] / 65535 == pytest.approx(12 / 300, abs=1e-4)
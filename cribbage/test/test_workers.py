@@ -0,0 +1,29 @@
+import workers
+
+import pytest
+
+
+def _total(batch, offset):
+    first_index, items = batch
+    return first_index, sum(items) + offset
+
+
+class TestBatches:
+    def test_batches_number_their_first_item(self):
+        assert list(workers.batches(range(7), 3)) == [(0, [0, 1, 2]), (3, [3, 4, 5]), (6, [6])]
+        assert list(workers.batches(['a', 'b'], 5, first_index=1)) == [(1, ['a', 'b'])]
+        assert list(workers.batches([], 5)) == []
+
+
+class TestRunBatches:
+    @pytest.mark.parametrize('processes', [0, 2])
+    def test_results_come_back_in_order(self, processes):
+        results = list(workers.run_batches(_total, range(100), (1000,), processes, batch_size=7, max_pending_batches=3))
+        assert results == [(first, sum(range(first, min(first + 7, 100))) + 1000) for first in range(0, 100, 7)]
+
+    def test_closing_early_stops_the_pool(self):
+        results = workers.run_batches(_total, range(100), (0,), 2, batch_size=10)
+        assert next(results) == (0, 45)
+        results.close()
+        with pytest.raises(StopIteration):
+            next(results)
@@ -0,0 +1,124 @@
+import argparse
+import itertools
+import math
+import multiprocessing
+import random
+
+import game
+import simulation
+
+# Runs matches between Player strategies across a pool of worker processes, for comparing strategies over far more
+# games than I could ever watch. Each match (a pair of strategies) is split into batches of games; each batch is one
+# task for a worker, which plays its games with simulation.simulate and sends back just the win counts, so there's one
+# small message per batch rather than one per game. Every batch gets its own seed, derived from the tournament seed and
+# the batch's position, so results don't depend on how many workers there are or which worker runs which batch.
+
+STRATEGIES = {
+    'Player': game.Player,
+    'RandomPlayer': game.RandomPlayer,
+    'DiscardAdvisorPlayer': game.DiscardAdvisorPlayer,
+    'ExpectimaxPlayer': game.ExpectimaxPlayer,
+}
+
+
+def round_robin(names):
+    """Every pair of different strategies, once."""
+    return list(itertools.combinations(names, 2))
+
+
+def gauntlet(challenger, names):
+    """The challenger against each of the other strategies."""
+    return [(challenger, name) for name in names if name != challenger]
+
+
+def _play_batch(task):
+    # runs in a worker process: play one batch of a match and return (match index, first strategy's wins, games)
+    match_index, first, second, num_games, seed = task
+    results = simulation.simulate(num_games, (STRATEGIES[first], STRATEGIES[second]), seed=seed)
+    return match_index, sum(1 for result in results if result.winner == 0), num_games
+
+
+def _batch_seed(seed, match_index, batch_index):
+    return random.Random(f'{seed}-{match_index}-{batch_index}').getrandbits(64)
+
+
+def run(matches, games_per_match, batch_size=500, seed=0, processes=None):
+    """
+    Plays games_per_match games for each (strategy name, strategy name) pair in matches, using a pool of processes
+    (defaults to one per CPU; 0 plays everything in this process), and returns a dict mapping each pair to
+    (wins for the first strategy, games played).
+    """
+    tasks = []
+    for match_index, (first, second) in enumerate(matches):
+        for name in (first, second):
+            if name not in STRATEGIES:
+                raise ValueError(f"Unknown strategy '{name}', expected one of {list(STRATEGIES)}")
+        for batch_index, batch_start in enumerate(range(0, games_per_match, batch_size)):
+            num_games = min(batch_size, games_per_match - batch_start)
+            tasks.append((match_index, first, second, num_games, _batch_seed(seed, match_index, batch_index)))
+
+    totals = {match: (0, 0) for match in matches}
+    if processes == 0:
+        batch_results = map(_play_batch, tasks)
+        _add_batch_results(totals, matches, batch_results)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            _add_batch_results(totals, matches, pool.imap_unordered(_play_batch, tasks))
+
+    return totals
+
+
+def _add_batch_results(totals, matches, batch_results):
+    for match_index, wins, num_games in batch_results:
+        match = matches[match_index]
+        match_wins, match_games = totals[match]
+        totals[match] = (match_wins + wins, match_games + num_games)
+
+
+def win_rate_interval(wins, games, z=1.96):
+    """Win rate with a (by default 95%) Wilson score confidence interval, as (rate, low, high)."""
+    if games == 0:
+        return 0.0, 0.0, 1.0
+    rate = wins / games
+    denominator = 1 + z * z / games
+    center = (rate + z * z / (2 * games)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / denominator
+    return rate, center - margin, center + margin
+
+
+def win_rate_matrix(totals):
+    """Turns run's results into a string with a row per strategy: its win rate (and interval) against each column."""
+    names = sorted({name for match in totals for name in match})
+    cells = {}
+    for (first, second), (wins, games) in totals.items():
+        cells[first, second] = win_rate_interval(wins, games)
+        cells[second, first] = win_rate_interval(games - wins, games)
+
+    width = max(len('  0.000 [0.000-0.000]'), *(len(name) for name in names))
+    name_width = max(len(name) for name in names)
+    lines = [' ' * name_width + ''.join(name.rjust(width + 2) for name in names)]
+    for row in names:
+        line = row.ljust(name_width)
+        for column in names:
+            if (row, column) in cells:
+                rate, low, high = cells[row, column]
+                line += f'{rate:.3f} [{low:.3f}-{high:.3f}]'.rjust(width + 2)
+            else:
+                line += '-'.rjust(width + 2)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Play Player strategies against each other and print win rates.')
+    parser.add_argument('--games', type=int, default=10000, help='games per match')
+    parser.add_argument('--batch-size', type=int, default=500, help='games per worker task')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--processes', type=int, default=None, help='worker processes (default: one per CPU)')
+    parser.add_argument('--gauntlet', metavar='STRATEGY', help='play this strategy against each of the others, rather than a round robin')
+    parser.add_argument('strategies', nargs='*', default=list(STRATEGIES), help=f'strategies to include (default: all of {list(STRATEGIES)})')
+    args = parser.parse_args()
+
+    matches = gauntlet(args.gauntlet, args.strategies) if args.gauntlet else round_robin(args.strategies)
+    totals = run(matches, args.games, batch_size=args.batch_size, seed=args.seed, processes=args.processes)
+    print(win_rate_matrix(totals))
@@ -0,0 +1,202 @@
+import array
+import collections
+import random
+import sys
+from pathlib import Path
+
+import game
+import gamelog
+import simulation
+import tablefile
+
+# The probability of winning from every position on the board - each (my score, opponent's score, whose crib it is)
+# at the start of a deal - so a strategy can tell in O(1) how much a point matters right now (near the end, a safe
+# discard that keeps the opponent from pegging out can be worth more than crib points, say).
+#
+# It's built offline in two steps. First, simulated games (DiscardAdvisorPlayer against itself) give the distributions
+# of what a deal is worth: the pegging points for the dealer and pone (together, since they're related), the pone's
+# hand, and the dealer's hand plus crib. Then dynamic programming over the positions, in the order points are counted
+# - pegging, then the pone's hand, then the dealer's hand and crib, with the first to SCORE_TO_WIN winning - gives the
+# chance the dealer wins from each position. Every deal scores at least the point for the last card, so positions are
+# solved from the highest total score down, and each only depends on ones already solved. The pone's chances are the
+# dealer's from the other side of the board, so one table covers both.
+#
+# When both players would reach the winning score during the same pegging, which of them got there first isn't in the
+# distributions, so those (rare) cases count as half a win each.
+#
+# The table is a tablefile of SCORE_TO_WIN x SCORE_TO_WIN unsigned shorts (win probability * 65535), indexed by dealer
+# score then pone score. To rebuild it, run 'python win_table.py'; 'python win_table.py --check' compares some positions
+# with games simulated from them.
+
+TABLE_PATH = Path(__file__).parent / 'tables' / 'win_table.bin'
+SCORE_TO_WIN = game.SCORE_TO_WIN
+TABLE_VERSION = 1
+_SCALE = 65535
+
+DealDistributions = collections.namedtuple('DealDistributions', ['pegging', 'pone_hand', 'dealer_hand_and_crib'])
+DealDistributions.__doc__ = """
+What a deal is worth: pegging maps (pone points, dealer points) to its probability, and pone_hand and
+dealer_hand_and_crib map points to probabilities.
+"""
+
+_table = None
+
+
+class _DealCollector:
+    # stands in for a GameLogWriter, adding up the points in each complete deal of each recorded game
+    def __init__(self):
+        self.pegging = collections.Counter()
+        self.pone_hand = collections.Counter()
+        self.dealer_hand_and_crib = collections.Counter()
+        self.num_deals = 0
+
+    def write(self, game_record):
+        dealer = None
+        for event in game_record.events:
+            if event.kind == gamelog.DEAL:
+                dealer = event.player
+                pegging_points, hand_points = [0, 0], [0, 0]
+            elif event.kind in (gamelog.PLAY, gamelog.LAST_CARD):
+                pegging_points[event.player] += event.points
+            elif event.kind == gamelog.HAND:
+                hand_points[event.player] += event.points
+            elif event.kind == gamelog.CRIB:
+                # the crib's counted last, so the deal's complete (the one a game ends in usually isn't, and is left out)
+                pone = 1 - dealer
+                self.pegging[pegging_points[pone], pegging_points[dealer]] += 1
+                self.pone_hand[hand_points[pone]] += 1
+                self.dealer_hand_and_crib[hand_points[dealer] + event.points] += 1
+                self.num_deals += 1
+
+
+def deal_distributions(num_games=3000, seed=0, player_class=game.DiscardAdvisorPlayer):
+    """Simulates num_games games between two player_class players and returns the DealDistributions of their deals."""
+    collector = _DealCollector()
+    simulation.simulate(num_games, (player_class, player_class), seed=seed, recorder=gamelog.GameRecorder(collector))
+    num_deals = collector.num_deals
+    return DealDistributions({points: count / num_deals for points, count in collector.pegging.items()},
+                             {points: count / num_deals for points, count in collector.pone_hand.items()},
+                             {points: count / num_deals for points, count in collector.dealer_hand_and_crib.items()})
+
+
+def solve(distributions, score_to_win=SCORE_TO_WIN):
+    """
+    Returns dealer_wins, where dealer_wins[dealer score][pone score] is the probability the dealer wins from a deal
+    starting with those scores, for scores below score_to_win.
+    """
+    if any(pone_points + dealer_points == 0 for pone_points, dealer_points in distributions.pegging):
+        raise ValueError("Every deal scores at least a point for the last card, but the pegging distribution has 0")
+    goal = score_to_win
+    pegging = list(distributions.pegging.items())
+    pone_hand = list(distributions.pone_hand.items())
+    dealer_hand_and_crib = list(distributions.dealer_hand_and_crib.items())
+    dealer_wins = [[None] * goal for _ in range(goal)]
+
+    after_pone_hand = {} # (dealer score, pone score) after the pone's hand -> dealer's chance, counting the dealer's hand and crib
+    def dealer_wins_after_pone_hand(dealer_score, pone_score):
+        key = (dealer_score, pone_score)
+        value = after_pone_hand.get(key)
+        if value is None:
+            value = 0.0
+            for points, probability in dealer_hand_and_crib:
+                if dealer_score + points >= goal:
+                    value += probability
+                else:
+                    # next deal, the pone deals
+                    value += probability * (1 - dealer_wins[pone_score][dealer_score + points])
+            after_pone_hand[key] = value
+        return value
+
+    after_pegging = {} # (dealer score, pone score) after pegging -> dealer's chance, counting the hands and crib
+    def dealer_wins_after_pegging(dealer_score, pone_score):
+        key = (dealer_score, pone_score)
+        value = after_pegging.get(key)
+        if value is None:
+            value = 0.0
+            for points, probability in pone_hand:
+                if pone_score + points < goal:
+                    value += probability * dealer_wins_after_pone_hand(dealer_score, pone_score + points)
+            after_pegging[key] = value
+        return value
+
+    for total in range(2 * goal - 2, -1, -1):
+        for dealer_score in range(max(0, total - goal + 1), min(total, goal - 1) + 1):
+            pone_score = total - dealer_score
+            value = 0.0
+            for (pone_points, dealer_points), probability in pegging:
+                pone_out, dealer_out = pone_score + pone_points >= goal, dealer_score + dealer_points >= goal
+                if pone_out and dealer_out:
+                    value += probability / 2
+                elif dealer_out:
+                    value += probability
+                elif not pone_out:
+                    value += probability * dealer_wins_after_pegging(dealer_score + dealer_points, pone_score + pone_points)
+            dealer_wins[dealer_score][pone_score] = value
+
+    return dealer_wins
+
+
+def build_table(num_games=3000, seed=0):
+    return solve(deal_distributions(num_games, seed))
+
+
+def write_table(dealer_wins, path=TABLE_PATH):
+    values = array.array('H', (round(probability * _SCALE) for row in dealer_wins for probability in row))
+    tablefile.write(path, values, 'H', TABLE_VERSION)
+
+
+def read_table(path=TABLE_PATH):
+    return tablefile.open_table(path, 'H', TABLE_VERSION, SCORE_TO_WIN * SCORE_TO_WIN, rebuild_command='python win_table.py')
+
+
+def get_table():
+    """Return the win table (a flat array, dealer score * SCORE_TO_WIN + pone score), reading it the first time it's needed."""
+    global _table
+    if _table is None:
+        _table = read_table()
+    return _table
+
+
+def win_probability(my_score, opponent_score, my_crib):
+    """
+    The chance of winning from the start of a deal with these scores, when the crib is mine (my_crib True) or the
+    opponent's. Scores at or past SCORE_TO_WIN have already won.
+    """
+    if my_score >= SCORE_TO_WIN:
+        return 1.0
+    if opponent_score >= SCORE_TO_WIN:
+        return 0.0
+    table = get_table()
+    if my_crib:
+        return table[my_score * SCORE_TO_WIN + opponent_score] / _SCALE
+    return 1 - table[opponent_score * SCORE_TO_WIN + my_score] / _SCALE
+
+
+def simulated_win_probability(my_score, opponent_score, my_crib, num_games=2000, seed=0, player_class=game.DiscardAdvisorPlayer):
+    """Estimates win_probability by playing num_games games between player_class players, starting from the position."""
+    rng = random.Random(seed)
+    wins = 0
+    for _ in range(num_games):
+        me, opponent = player_class('Me'), player_class('Opponent')
+        me.score, opponent.score = my_score, opponent_score
+        sim_game = game.Game(me, opponent, verbose=False, rng=rng)
+        if not my_crib:
+            sim_game.swap_crib_player()
+        wins += sim_game.play().winner == 0
+    return wins / num_games
+
+
+def check_table(positions=((0, 0), (60, 60), (100, 90), (90, 100), (110, 110), (115, 100), (100, 115)), num_games=2000, seed=0):
+    """Returns (my score, opponent score, my crib, table value, simulated estimate) for each position, with both cribs."""
+    return [(mine, theirs, my_crib, win_probability(mine, theirs, my_crib),
+             simulated_win_probability(mine, theirs, my_crib, num_games, seed))
+            for mine, theirs in positions for my_crib in (True, False)]
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv[1:]:
+        for mine, theirs, my_crib, table_value, estimate in check_table():
+            print(f"{mine:3d}-{theirs:3d} {'my crib' if my_crib else 'their crib':>10}: table {table_value:.3f}, simulated {estimate:.3f}")
+    else:
+        write_table(build_table())
+        print(f'Wrote {TABLE_PATH}')
@@ -0,0 +1,50 @@
+import collections
+import itertools
+import multiprocessing
+
+# Runs a function over a stream of items in batches across a pool of processes, for the tools that get through more
+# than fits in memory (replay's game logs, score_hands' files of hands). Items are read a batch at a time, and at most
+# max_pending_batches batches are in flight, so memory stays the same however many items there are, and the results
+# come back in order.
+#
+#     for result in workers.run_batches(function, items, (extra, args)):
+#         ...
+#
+# function gets (index of the batch's first item, list of items) and the extra args, and has to be picklable (a
+# module level function) unless processes is 0. Stopping early is fine: closing the generator (or just dropping it)
+# terminates the pool, so nothing more is started.
+
+
+def batches(items, batch_size, first_index=0):
+    """Yields (index of the first item, list of up to batch_size items) for the items, numbered from first_index."""
+    items = iter(items)
+    while True:
+        batch = list(itertools.islice(items, batch_size))
+        if not batch:
+            return
+        yield first_index, batch
+        first_index += len(batch)
+
+
+def run_batches(function, items, args=(), processes=None, batch_size=1000, max_pending_batches=None, first_index=0):
+    """
+    Yields function(batch, *args) for each batch of items, in order - in this process if processes is 0, otherwise
+    across a pool of processes (defaults to one per CPU), with at most max_pending_batches (default: two per process)
+    batches in flight.
+    """
+    item_batches = batches(items, batch_size, first_index)
+    if processes == 0:
+        for batch in item_batches:
+            yield function(batch, *args)
+        return
+
+    processes = processes or multiprocessing.cpu_count()
+    max_pending_batches = max_pending_batches or 2 * processes
+    with multiprocessing.Pool(processes) as pool: # leaving the with block, however it happens, terminates the pool
+        pending = collections.deque()
+        for batch in item_batches:
+            pending.append(pool.apply_async(function, (batch, *args)))
+            if len(pending) >= max_pending_batches:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()